@@ -5,19 +5,33 @@ Provides the foundational HemoStatAgent base class that all specialized agents i
 Encapsulates Redis pub/sub communication patterns and shared state management.
 """
 
-import json
 import os
 import signal
+import threading
 import time
-from collections.abc import Callable
+from collections.abc import Callable, Hashable
 from datetime import UTC, datetime
 from typing import Any
 
 import redis
 from dotenv import load_dotenv
+from redis.backoff import ExponentialWithJitterBackoff
+from redis.retry import Retry
 
+from agents.codec import ENCODING_ERRORS, CodecError, decode, encode
+from agents.dispatch import Dispatcher, message_key
+from agents.instrumentation import AgentInstrumentation
+from agents.local_bus import ORIGIN_FIELD, active_bus
 from agents.logger import HemoStatLogger
 from agents.platform_utils import get_platform_display
+from agents.state_cache import InvalidationListener, StateCache
+from agents.tracing import TRACE_FIELD, continue_from, next_trace
+from agents.transport import (
+    LocalTransport,
+    PubSubTransport,
+    StreamTransport,
+    stream_channels_from_env,
+)
 
 # Load environment variables from .env file
 load_dotenv()
@@ -32,6 +46,30 @@ class HemoStatConnectionError(Exception):
     pass
 
 
+def _pool_usage(pool: redis.ConnectionPool) -> dict[str, int]:
+    """
+    Summarize connection usage of a redis-py pool.
+
+    Args:
+        pool: Blocking or regular connection pool
+
+    Returns:
+        Dictionary with max, created, in_use and idle connection counts
+    """
+    if isinstance(pool, redis.BlockingConnectionPool):
+        created = len(pool._connections)
+        idle = sum(1 for connection in list(pool.pool.queue) if connection is not None)
+    else:
+        idle = len(pool._available_connections)
+        created = idle + len(pool._in_use_connections)
+    return {
+        "max": pool.max_connections,
+        "created": created,
+        "in_use": created - idle,
+        "idle": idle,
+    }
+
+
 class HemoStatAgent:
     """
     Base class for all HemoStat agents.
@@ -62,6 +100,7 @@ class HemoStatAgent:
         self.agent_name = agent_name
         self._running = False
         self._subscriptions: dict[str, Callable] = {}
+        self._dispatch_keys: dict[str, Callable[[dict[str, Any]], Hashable]] = {}
 
         # Load Redis config from environment or use defaults
         if redis_host is None:
@@ -76,15 +115,94 @@ class HemoStatAgent:
         # Initialize logger using custom HemoStatLogger
         self.logger = HemoStatLogger.get_logger(agent_name)
 
+        # Connection pool configuration
+        # REDIS_POOL_SIZE: maximum command connections (callers wait up to REDIS_POOL_TIMEOUT
+        # seconds for a free one). Subscriptions and blocking stream reads use their own pool
+        # of REDIS_PUBSUB_POOL_SIZE connections so they never hold a command connection.
+        # REDIS_RECONNECT_MAX_BACKOFF caps the jittered backoff of resubscribe attempts
+        self.pool_size = int(os.getenv("REDIS_POOL_SIZE", 20))
+        self.pool_timeout = float(os.getenv("REDIS_POOL_TIMEOUT", 5))
+        self.pubsub_pool_size = int(os.getenv("REDIS_PUBSUB_POOL_SIZE", 4))
+        self.connect_timeout = float(os.getenv("REDIS_CONNECT_TIMEOUT", 5))
+        self.health_check_interval = int(os.getenv("REDIS_HEALTH_CHECK_INTERVAL", 30))
+        self.reconnect_max_backoff = float(os.getenv("REDIS_RECONNECT_MAX_BACKOFF", 30))
+
+        # Agents hosted by a combined runner share its clients and exchange pub/sub events
+        # in memory (see agents.local_bus)
+        self.bus = active_bus()
+        self.local_transport: LocalTransport | None = None
+
         # Initialize Redis connection with retry logic
-        self.redis = self._connect_redis()
+        if self.bus is not None and self.bus.redis is not None:
+            self.redis = self.bus.redis
+            self.pubsub_redis = self.bus.pubsub_redis
+        else:
+            self.redis = self._connect_redis()
+            pubsub_pool_size = self.bus.pubsub_pool_size if self.bus else self.pubsub_pool_size
+            self.pubsub_redis = redis.Redis(connection_pool=self._build_pool(pubsub_pool_size))
+            if self.bus is not None:
+                self.bus.adopt_clients(self.redis, self.pubsub_redis)
+        if self.bus is not None:
+            self.local_transport = LocalTransport()
 
         # Set up pub/sub
-        self.pubsub = self.redis.pubsub()
-
-        # Register signal handlers for graceful shutdown
-        signal.signal(signal.SIGTERM, self._handle_shutdown_signal)
-        signal.signal(signal.SIGINT, self._handle_shutdown_signal)
+        self.pubsub = self.pubsub_redis.pubsub()
+
+        # Set up transports
+        # HEMOSTAT_STREAM_CHANNELS: channels carried by Redis Streams with consumer groups
+        # instead of pub/sub ('*' = all); HEMOSTAT_STREAM_MAXLEN bounds each stream and
+        # HEMOSTAT_STREAM_CLAIM_IDLE_MS is the idle time after which entries left pending
+        # by a dead replica are reclaimed
+        self.pubsub_transport = PubSubTransport(
+            self.redis, self.pubsub, max_backoff=self.reconnect_max_backoff
+        )
+        self.stream_channels = stream_channels_from_env()
+        self.stream_transport: StreamTransport | None = None
+        if self.stream_channels:
+            self.stream_transport = StreamTransport(
+                self.redis,
+                group=agent_name,
+                maxlen=int(os.getenv("HEMOSTAT_STREAM_MAXLEN", 10000)),
+                block_ms=int(os.getenv("HEMOSTAT_STREAM_BLOCK_MS", 1000)),
+                claim_idle_ms=int(os.getenv("HEMOSTAT_STREAM_CLAIM_IDLE_MS", 60000)),
+                listen_client=self.pubsub_redis,
+                max_backoff=self.reconnect_max_backoff,
+            )
+
+        # Set up callback dispatch
+        # AGENT_DISPATCH_WORKERS: worker threads running message callbacks (0 = run them
+        # inline on the listener thread). Messages for the same container stay in order;
+        # AGENT_DISPATCH_QUEUE_SIZE bounds queued messages and AGENT_DISPATCH_POLICY
+        # (block, drop_oldest, coalesce) decides what happens when the queue is full
+        self.dispatch_workers = int(os.getenv("AGENT_DISPATCH_WORKERS", 0))
+        self.dispatch_queue_size = int(os.getenv("AGENT_DISPATCH_QUEUE_SIZE", 1000))
+        self.dispatch_policy = os.getenv("AGENT_DISPATCH_POLICY", "block").lower()
+        self.dispatcher: Dispatcher | None = None
+
+        # Set up the shared state cache
+        # AGENT_STATE_CACHE_SIZE: keys kept in an in-process cache of shared state (0 = off);
+        # entries are invalidated through Redis client tracking and served for at most
+        # AGENT_STATE_CACHE_TTL seconds
+        self.state_cache: StateCache | None = None
+        self._invalidation_listener: InvalidationListener | None = None
+        cache_size = int(os.getenv("AGENT_STATE_CACHE_SIZE", 0))
+        if cache_size > 0:
+            self.enable_state_cache(cache_size, float(os.getenv("AGENT_STATE_CACHE_TTL", 30)))
+
+        # Set up instrumentation
+        # AGENT_METRICS_PORT: serve per-channel message metrics (receive, decode, queue wait,
+        # callback, publish) in Prometheus format on this port (0 = off; needs
+        # prometheus_client)
+        self.instrumentation = AgentInstrumentation(agent_name)
+        self.agent_metrics_port = int(os.getenv("AGENT_METRICS_PORT", 0))
+        if self.agent_metrics_port > 0:
+            self.instrumentation.enable(self.agent_metrics_port, self.runtime_stats)
+
+        # Register signal handlers for graceful shutdown. Hosted agents are stopped by their
+        # runner, and signal handlers can only be installed from the main thread
+        if self.bus is None and threading.current_thread() is threading.main_thread():
+            signal.signal(signal.SIGTERM, self._handle_shutdown_signal)
+            signal.signal(signal.SIGINT, self._handle_shutdown_signal)
 
         self.logger.info(
             f"Agent '{self.agent_name}' initialized successfully on {get_platform_display()}",
@@ -107,22 +225,9 @@ class HemoStatAgent:
         # Build exponential backoff list
         retry_delays = [initial_delay * (2**i) for i in range(max_retries)]
 
-        redis_password = os.getenv("REDIS_PASSWORD", "").strip()
-
         for attempt in range(max_retries):
             try:
-                redis_kwargs: dict[str, Any] = {
-                    "host": self.redis_host,
-                    "port": self.redis_port,
-                    "db": self.redis_db,
-                    "decode_responses": True,
-                    "socket_connect_timeout": 5,
-                    "socket_keepalive": True,
-                }
-                if redis_password:
-                    redis_kwargs["password"] = redis_password
-
-                client = redis.Redis(**redis_kwargs)  # type: ignore[arg-type]
+                client = redis.Redis(connection_pool=self._build_pool(self.pool_size))
                 # Test connection
                 client.ping()
                 self.logger.info(f"Connected to Redis at {self.redis_host}:{self.redis_port}")
@@ -147,6 +252,73 @@ class HemoStatAgent:
         msg = f"Failed to connect to Redis after {max_retries} attempts"
         raise HemoStatConnectionError(msg)
 
+    def _build_pool(self, max_connections: int) -> redis.BlockingConnectionPool:
+        """
+        Create a blocking connection pool with the agent's Redis settings.
+
+        When all connections are busy, callers wait for one to be released instead of
+        opening unbounded connections. Commands that fail on a dropped connection are
+        retried on a fresh connection with jittered backoff.
+
+        Args:
+            max_connections: Maximum number of connections in the pool
+
+        Returns:
+            Connection pool (connections are opened lazily)
+        """
+        redis_kwargs: dict[str, Any] = {
+            "host": self.redis_host,
+            "port": self.redis_port,
+            "db": self.redis_db,
+            "decode_responses": True,
+            # Lets binary codec frames pass through decoded responses unchanged
+            "encoding_errors": ENCODING_ERRORS,
+            "socket_connect_timeout": self.connect_timeout,
+            "socket_keepalive": True,
+            "health_check_interval": self.health_check_interval,
+            "retry": Retry(ExponentialWithJitterBackoff(cap=1.0, base=0.1), 2),
+        }
+        redis_password = os.getenv("REDIS_PASSWORD", "").strip()
+        if redis_password:
+            redis_kwargs["password"] = redis_password
+
+        return redis.BlockingConnectionPool(
+            max_connections=max(1, max_connections),
+            timeout=self.pool_timeout,
+            **redis_kwargs,
+        )
+
+    def pool_stats(self) -> dict[str, dict[str, int]]:
+        """
+        Report utilization of the command and pub/sub connection pools.
+
+        Returns:
+            Mapping of pool name ('commands', 'pubsub') to max, created, in_use and idle counts
+        """
+        return {
+            "commands": _pool_usage(self.redis.connection_pool),
+            "pubsub": _pool_usage(self.pubsub_redis.connection_pool),
+        }
+
+    def runtime_stats(self) -> dict[str, Any]:
+        """
+        Report runtime statistics of the agent's Redis and message handling machinery.
+
+        Returns:
+            Dictionary with pools (see pool_stats()), dispatch (dispatch pool stats or None),
+            state_cache (cache stats or None) and reconnects (per transport)
+        """
+        dispatcher = self.dispatcher
+        reconnects = {self.pubsub_transport.name: self.pubsub_transport.reconnects}
+        if self.stream_transport is not None:
+            reconnects[self.stream_transport.name] = self.stream_transport.reconnects
+        return {
+            "pools": self.pool_stats(),
+            "dispatch": dispatcher.stats() if dispatcher is not None else None,
+            "state_cache": self.state_cache.stats() if self.state_cache is not None else None,
+            "reconnects": reconnects,
+        }
+
     def publish_event(self, channel: str, event_type: str, data: dict[str, Any]) -> bool:
         """
         Publish a structured event to a Redis channel.
@@ -157,7 +329,8 @@ class HemoStatAgent:
             data: Event payload data
 
         Returns:
-            True if publish succeeded, False otherwise
+            True if publish succeeded, False otherwise (co-located subscribers of a combined
+            runner receive the event even when Redis is unavailable)
         """
         max_retries = int(os.getenv("AGENT_RETRY_MAX", 3))
         initial_delay = float(os.getenv("AGENT_RETRY_DELAY", 1))
@@ -170,20 +343,36 @@ class HemoStatAgent:
             "timestamp": datetime.now(UTC).isoformat(),
             "agent": self.agent_name,
             "data": data,
+            TRACE_FIELD: next_trace(self.agent_name, event_type, channel),
         }
+        if self.bus is not None:
+            event_payload[ORIGIN_FIELD] = self.bus.origin
+
+        transport = self._transport_for(channel)
+        started = time.perf_counter()
+
+        try:
+            encoded_payload = encode(event_payload)
+        except (TypeError, ValueError) as e:
+            self.logger.error(f"Failed to serialize event payload: {e!s}")
+            self.instrumentation.published(channel, time.perf_counter() - started, 0, ok=False)
+            return False
+
+        # Co-located subscribers get the event in memory; Redis still carries it to
+        # other processes
+        if self.bus is not None and transport is self.pubsub_transport:
+            self.bus.deliver(channel, encoded_payload)
 
         for attempt in range(max_retries):
             try:
-                json_payload = json.dumps(event_payload)
-                num_subscribers = self.redis.publish(channel, json_payload)
+                delivery = transport.publish(channel, encoded_payload)
+                self.instrumentation.published(
+                    channel, time.perf_counter() - started, attempt, ok=True
+                )
                 self.logger.info(
-                    f"Published event '{event_type}' to channel '{channel}' "
-                    f"({num_subscribers} subscribers)"
+                    f"Published event '{event_type}' to channel '{channel}' ({delivery})"
                 )
                 return True
-            except (TypeError, ValueError) as e:
-                self.logger.error(f"Failed to serialize event payload: {e!s}")
-                return False
             except redis.RedisError as e:
                 if attempt < max_retries - 1:
                     wait_time = retry_delays[attempt]
@@ -196,13 +385,19 @@ class HemoStatAgent:
                     self.logger.error(
                         f"Failed to publish event after {max_retries} attempts. Last error: {e!s}"
                     )
+                    self.instrumentation.published(
+                        channel, time.perf_counter() - started, attempt, ok=False
+                    )
                     return False
 
         # This should never be reached, but satisfies type checker
         return False
 
     def subscribe_to_channel(
-        self, channel: str, callback: Callable[[dict[str, Any]], None]
+        self,
+        channel: str,
+        callback: Callable[[dict[str, Any]], None],
+        dispatch_key: Callable[[dict[str, Any]], Hashable] | None = None,
     ) -> None:
         """
         Subscribe to a Redis channel and register a message handler.
@@ -211,82 +406,308 @@ class HemoStatAgent:
             channel: Redis channel name to subscribe to
             callback: Callable that will be invoked for each message
                      (receives deserialized message dict)
+            dispatch_key: Optional function mapping a message to its ordering key when
+                callbacks run on the dispatch pool (default: the message's container)
         """
+        transport = self._transport_for(channel)
         try:
-            self.pubsub.subscribe(channel)
+            transport.subscribe(channel)
             self._subscriptions[channel] = callback
-            self.logger.info(f"Subscribed to channel '{channel}'")
+            if dispatch_key is not None:
+                self._dispatch_keys[channel] = dispatch_key
+            if self.bus is not None and transport is self.pubsub_transport:
+                self.bus.register(channel, self.local_transport)
+            self.logger.info(f"Subscribed to channel '{channel}' ({transport.name})")
         except redis.RedisError as e:
             self.logger.error(f"Failed to subscribe to channel '{channel}': {e!s}")
 
     def start_listening(self) -> None:
         """
-        Start the pub/sub message listening loop.
+        Start the message listening loop.
 
         Blocks until stop() is called. Handles messages and exceptions gracefully.
+        When channels use both transports, streams are consumed on a background thread
+        and pub/sub on the calling thread. With AGENT_DISPATCH_WORKERS > 0 the callbacks
+        run on a bounded worker pool, one message at a time per container.
         """
         self._running = True
         self.logger.info("Starting message listening loop")
 
+        if self.dispatch_workers > 0 and self.dispatcher is None:
+            self.dispatcher = Dispatcher(
+                self.agent_name,
+                workers=self.dispatch_workers,
+                queue_size=self.dispatch_queue_size,
+                policy=self.dispatch_policy,
+            )
+            self.logger.info(
+                f"Dispatching callbacks on {self.dispatch_workers} workers "
+                f"(queue {self.dispatch_queue_size}, policy {self.dispatch_policy})"
+            )
+
+        transports = [
+            transport
+            for transport in (self.pubsub_transport, self.stream_transport)
+            if transport is not None
+            and any(self._transport_for(channel) is transport for channel in self._subscriptions)
+        ]
+        if self.local_transport is not None and self.pubsub_transport in transports:
+            transports.insert(0, self.local_transport)
+
+        background = []
+        for transport in transports[:-1]:
+            thread = threading.Thread(
+                target=self._listen_transport,
+                args=(transport,),
+                name=f"{self.agent_name}-{transport.name}-listener",
+                daemon=True,
+            )
+            thread.start()
+            background.append(thread)
+
         try:
-            for message in self.pubsub.listen():
-                if not self._running:
-                    break
+            if transports:
+                self._listen_transport(transports[-1])
+        finally:
+            for thread in background:
+                thread.join(timeout=5)
+            self._shutdown_dispatcher()
+            self.logger.info("Message listening loop stopped")
 
-                if message["type"] == "message":
+    def _listen_transport(
+        self, transport: PubSubTransport | StreamTransport | LocalTransport
+    ) -> None:
+        """
+        Consume one transport until the agent stops.
+
+        Args:
+            transport: Transport to read messages from
+        """
+        try:
+            for channel, data, ack in transport.listen(lambda: self._running):
+                received = time.perf_counter()
+                payload = self._decode_message(channel, data)
+                self.instrumentation.received(channel, time.perf_counter() - received)
+                if payload is None:
+                    ack()
+                    continue
+                if transport is self.pubsub_transport and self.bus and self.bus.is_echo(payload):
+                    # Already delivered in memory by a co-located publisher
+                    continue
+                if self.dispatcher is None:
                     try:
-                        payload = json.loads(message["data"])
-                        self.logger.debug(
-                            f"Received message on channel '{message['channel']}': "
-                            f"{payload.get('event_type', 'unknown')}"
-                        )
-                        # Invoke registered callback if it exists
-                        callback = self._subscriptions.get(message["channel"])
-                        if callback:
-                            callback(payload)
-                    except json.JSONDecodeError as e:
-                        self.logger.error(f"Failed to deserialize message: {e!s}")
-                    except Exception as e:
-                        self.logger.error(f"Error processing message: {e!s}", exc_info=True)
+                        self._handle_message(channel, payload)
+                    finally:
+                        # Handled (or failed) messages are not redelivered; only messages
+                        # of a consumer that died before this point are reclaimed
+                        ack()
+                elif not self.dispatcher.submit(
+                    self._dispatch_key(channel, payload),
+                    self._handle_message,
+                    channel,
+                    payload,
+                    time.perf_counter(),
+                    on_done=ack,
+                ):
+                    # Shutting down: unacknowledged stream entries are reclaimed elsewhere
+                    break
         except Exception as e:
-            self.logger.error(f"Listening loop error: {e!s}", exc_info=True)
-        finally:
-            self.logger.info("Message listening loop stopped")
+            if self._running:
+                self.logger.error(f"Listening loop error ({transport.name}): {e!s}", exc_info=True)
 
-    def get_shared_state(self, key: str) -> dict[str, Any] | None:
+    def _decode_message(self, channel: str, data: str) -> dict[str, Any] | None:
+        """
+        Deserialize a message.
+
+        Args:
+            channel: Channel the message arrived on
+            data: Serialized event
+
+        Returns:
+            Event payload, or None if the message is not a valid event
+        """
+        try:
+            payload = decode(data)
+        except CodecError as e:
+            self.logger.error(f"Failed to deserialize message: {e!s}")
+            return None
+        if not isinstance(payload, dict):
+            self.logger.error(f"Ignoring non-object message on channel '{channel}'")
+            return None
+        self.logger.debug(
+            f"Received message on channel '{channel}': {payload.get('event_type', 'unknown')}"
+        )
+        return payload
+
+    def _handle_message(
+        self, channel: str, payload: dict[str, Any], queued_at: float | None = None
+    ) -> None:
+        """
+        Invoke the callback registered for a channel.
+
+        Args:
+            channel: Channel the message arrived on
+            payload: Deserialized event
+            queued_at: time.perf_counter() when the message was queued for the dispatch
+                pool (None when it runs inline)
+        """
+        started = time.perf_counter()
+        if queued_at is not None:
+            self.instrumentation.queue_wait(channel, started - queued_at)
+        failed = False
+        try:
+            callback = self._subscriptions.get(channel)
+            if callback:
+                # Events the callback publishes continue this message's trace
+                with continue_from(payload):
+                    callback(payload)
+        except Exception as e:
+            failed = True
+            self.logger.error(f"Error processing message: {e!s}", exc_info=True)
+        self.instrumentation.callback(channel, time.perf_counter() - started, failed)
+
+    def _dispatch_key(self, channel: str, payload: dict[str, Any]) -> Hashable:
+        """
+        Determine the ordering key of a message for the dispatch pool.
+
+        Messages about the same container share a key and are handled in arrival order;
+        messages without a container are ordered per channel.
+
+        Args:
+            channel: Channel the message arrived on
+            payload: Deserialized event
+
+        Returns:
+            Ordering key
+        """
+        key_func = self._dispatch_keys.get(channel)
+        if key_func is not None:
+            try:
+                return key_func(payload)
+            except Exception as e:
+                self.logger.warning(f"Dispatch key function failed on '{channel}': {e!s}")
+                return channel
+        return message_key(channel, payload)
+
+    def _shutdown_dispatcher(self) -> None:
+        """Let the dispatch pool finish queued callbacks and stop its workers."""
+        dispatcher, self.dispatcher = self.dispatcher, None
+        if dispatcher is None:
+            return
+        dispatcher.shutdown()
+        self.logger.info(f"Dispatch pool stopped: {dispatcher.stats()}")
+
+    def _transport_for(self, channel: str) -> PubSubTransport | StreamTransport:
+        """
+        Select the transport carrying a channel.
+
+        Args:
+            channel: Channel name
+
+        Returns:
+            The stream transport if the channel is listed in HEMOSTAT_STREAM_CHANNELS,
+            otherwise the pub/sub transport
+        """
+        if self.stream_transport is not None and (
+            "*" in self.stream_channels or channel in self.stream_channels
+        ):
+            return self.stream_transport
+        return self.pubsub_transport
+
+    def get_shared_state(self, key: str, check_ttl: bool = False) -> dict[str, Any] | None:
         """
         Retrieve shared state from Redis.
 
         Args:
             key: State key (will be prefixed with 'hemostat:state:')
+            check_ttl: Also fetch the TTL (same round trip) and warn if the key expires
+                within 5 minutes
 
         Returns:
             Deserialized state dict, or None if key doesn't exist or error occurs
         """
         try:
             full_key = f"hemostat:state:{key}"
-            value = self.redis.get(full_key)
-
+            cache = None if check_ttl else self.state_cache
+            if cache is not None:
+                hit, value = cache.get(full_key)
+                if hit:
+                    return None if value is None else decode(value)
+                token = cache.token()
+
+            if check_ttl:
+                pipe = self.redis.pipeline(transaction=False)
+                pipe.get(full_key)
+                pipe.ttl(full_key)
+                value, ttl = pipe.execute()
+                if ttl > 0 and ttl < 300:  # Less than 5 minutes
+                    self.logger.warning(f"Shared state '{key}' expiring soon (TTL: {ttl}s)")
+            else:
+                value = self.redis.get(full_key)
+
+            if cache is not None:
+                cache.put(full_key, value, token)
             if value is None:
                 return None
-
-            # Check TTL and warn if expiring soon
-            ttl = self.redis.ttl(full_key)
-            if ttl > 0 and ttl < 300:  # Less than 5 minutes
-                self.logger.warning(f"Shared state '{key}' expiring soon (TTL: {ttl}s)")
-
-            return json.loads(value)
+            return decode(value)
         except redis.RedisError as e:
             self.logger.error(f"Failed to get shared state '{key}': {e!s}")
             return None
-        except json.JSONDecodeError as e:
+        except CodecError as e:
             self.logger.error(f"Failed to deserialize shared state '{key}': {e!s}")
             return None
 
+    def get_shared_states(self, keys: list[str]) -> dict[str, dict[str, Any] | None]:
+        """
+        Retrieve several shared states with a single MGET.
+
+        Args:
+            keys: State keys (each will be prefixed with 'hemostat:state:')
+
+        Returns:
+            Mapping of key to deserialized state dict, or None for keys that don't exist
+            or can't be decoded (all None if Redis fails)
+        """
+        states: dict[str, dict[str, Any] | None] = dict.fromkeys(keys)
+        values: dict[str, str | None] = {}
+        missing = []
+        for key in keys:
+            hit, value = (
+                self.state_cache.get(f"hemostat:state:{key}") if self.state_cache else (False, None)
+            )
+            if hit:
+                values[key] = value
+            else:
+                missing.append(key)
+
+        if missing:
+            token = self.state_cache.token() if self.state_cache else 0
+            try:
+                fetched = self.redis.mget([f"hemostat:state:{key}" for key in missing])
+            except redis.RedisError as e:
+                self.logger.error(f"Failed to get {len(missing)} shared states: {e!s}")
+                return states
+            for key, value in zip(missing, fetched, strict=False):
+                values[key] = value
+                if self.state_cache is not None:
+                    self.state_cache.put(f"hemostat:state:{key}", value, token)
+
+        for key, value in values.items():
+            if value is None:
+                continue
+            try:
+                states[key] = decode(value)
+            except CodecError as e:
+                self.logger.error(f"Failed to deserialize shared state '{key}': {e!s}")
+        return states
+
     def set_shared_state(self, key: str, value: dict[str, Any], ttl: int | None = None) -> bool:
         """
         Store shared state in Redis with optional TTL.
 
+        The value and TTL are written with one SET ... EX, so the key never exists
+        without its TTL.
+
         Args:
             key: State key (will be prefixed with 'hemostat:state:')
             value: State data to store
@@ -297,11 +718,11 @@ class HemoStatAgent:
         """
         try:
             full_key = f"hemostat:state:{key}"
-            json_value = json.dumps(value)
-            self.redis.set(full_key, json_value)
-
-            if ttl is not None:
-                self.redis.expire(full_key, ttl)
+            encoded_value = encode(value)
+            self.redis.set(full_key, encoded_value, ex=ttl or None)
+            if self.state_cache is not None:
+                # Read-your-writes before the tracking invalidation arrives
+                self.state_cache.invalidate([full_key])
 
             self.logger.debug(f"Set shared state '{key}'" + (f" with TTL {ttl}s" if ttl else ""))
             return True
@@ -312,6 +733,68 @@ class HemoStatAgent:
             self.logger.error(f"Failed to set shared state '{key}': {e!s}")
             return False
 
+    def set_shared_states(self, states: dict[str, dict[str, Any]], ttl: int | None = None) -> bool:
+        """
+        Store several shared states in one round trip.
+
+        Without a TTL the states are written with a single MSET; with a TTL, as SET ... EX
+        commands in one pipeline. Nothing is written if any state fails to serialize.
+
+        Args:
+            states: Mapping of state key (will be prefixed with 'hemostat:state:') to data
+            ttl: Time-to-live in seconds applied to every key (optional)
+
+        Returns:
+            True if all states were written, False otherwise
+        """
+        if not states:
+            return True
+
+        try:
+            encoded = {f"hemostat:state:{key}": encode(value) for key, value in states.items()}
+        except (TypeError, ValueError) as e:
+            self.logger.error(f"Failed to serialize {len(states)} shared states: {e!s}")
+            return False
+
+        try:
+            if not ttl:
+                self.redis.mset(encoded)
+            else:
+                pipe = self.redis.pipeline(transaction=False)
+                for full_key, encoded_value in encoded.items():
+                    pipe.set(full_key, encoded_value, ex=ttl)
+                pipe.execute()
+        except redis.RedisError as e:
+            self.logger.error(f"Failed to set {len(states)} shared states: {e!s}")
+            return False
+        finally:
+            if self.state_cache is not None:
+                self.state_cache.invalidate(list(encoded))
+
+        self.logger.debug(f"Set {len(states)} shared states" + (f" with TTL {ttl}s" if ttl else ""))
+        return True
+
+    def enable_state_cache(self, max_entries: int = 1024, ttl: float = 30.0) -> None:
+        """
+        Serve repeated shared state reads from an in-process cache.
+
+        The cache stays coherent across agents through Redis client tracking (broadcast
+        mode on the hemostat:state: prefix); it is bypassed while the invalidation
+        connection is down or if the server does not support tracking.
+
+        Args:
+            max_entries: Maximum number of cached keys (LRU eviction)
+            ttl: Maximum seconds an entry is served without re-reading Redis
+        """
+        if self.state_cache is not None:
+            return
+        self.state_cache = StateCache(max_entries=max_entries, ttl=ttl)
+        self._invalidation_listener = InvalidationListener(
+            self.redis.connection_pool, self.state_cache, "hemostat:state:", self.agent_name
+        )
+        self._invalidation_listener.start()
+        self.logger.info(f"Shared state cache configured ({max_entries} keys, TTL {ttl}s)")
+
     def stop(self) -> None:
         """
         Gracefully shut down the agent.
@@ -322,16 +805,34 @@ class HemoStatAgent:
         self._running = False
 
         try:
-            self.pubsub.unsubscribe()
+            self.pubsub_transport.close()
+            if self.stream_transport is not None:
+                self.stream_transport.close()
             self.logger.debug("Unsubscribed from all channels")
         except Exception as e:
             self.logger.error(f"Error unsubscribing: {e!s}")
 
-        try:
-            self.redis.close()
-            self.logger.debug("Closed Redis connection")
-        except Exception as e:
-            self.logger.error(f"Error closing Redis connection: {e!s}")
+        self._shutdown_dispatcher()
+        self.instrumentation.disable()
+
+        if self._invalidation_listener is not None:
+            self._invalidation_listener.stop()
+            self.logger.info(f"Shared state cache stopped: {self.state_cache.stats()}")
+
+        if self.local_transport is not None:
+            self.local_transport.close()
+
+        # Shared clients of a combined runner are closed by the runner after all agents stopped
+        if self.bus is None:
+            try:
+                # Clients built on an explicit pool leave it open on close(). Listener
+                # connections still in use are released by the listener threads themselves
+                self.redis.close()
+                self.redis.connection_pool.disconnect()
+                self.pubsub_redis.connection_pool.disconnect(inuse_connections=False)
+                self.logger.debug("Closed Redis connection")
+            except Exception as e:
+                self.logger.error(f"Error closing Redis connection: {e!s}")
 
         self.logger.info("Agent stopped successfully")
 
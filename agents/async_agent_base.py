@@ -0,0 +1,727 @@
+"""
+HemoStat Async Base Agent Module
+
+Provides AsyncHemoStatAgent, the asyncio counterpart of HemoStatAgent built on
+redis.asyncio. Publishing, shared state and the subscription loop are coroutines, retry
+backoff uses asyncio.sleep, and blocking SDK calls (Docker, LLM clients, HTTP) are run on a
+thread pool through run_blocking(), so one process can keep many analyses or webhook sends
+in flight. Events and shared state use the same channels, envelopes and keys as
+HemoStatAgent, so sync and async agents can be mixed freely.
+"""
+
+import asyncio
+import contextlib
+import contextvars
+import functools
+import os
+import signal
+import time
+from collections.abc import Awaitable, Callable, Hashable
+from concurrent.futures import ThreadPoolExecutor
+from datetime import UTC, datetime
+from typing import Any, TypeVar
+
+import redis
+import redis.asyncio
+
+from agents.agent_base import HemoStatConnectionError
+from agents.codec import ENCODING_ERRORS, CodecError, decode, encode
+from agents.dispatch import message_key
+from agents.instrumentation import AgentInstrumentation
+from agents.logger import HemoStatLogger
+from agents.platform_utils import get_platform_display
+from agents.tracing import TRACE_FIELD, continue_from, next_trace
+from agents.transport import AsyncPubSubTransport, AsyncStreamTransport, stream_channels_from_env
+
+T = TypeVar("T")
+
+# Callbacks may be coroutine functions or plain functions (run on the executor)
+MessageCallback = Callable[[dict[str, Any]], Awaitable[None] | None]
+
+
+class AsyncHemoStatAgent:
+    """
+    Asyncio base class for HemoStat agents.
+
+    Usage:
+        agent = MyAgent("analyzer")
+        asyncio.run(agent.run())
+
+    where MyAgent.run() awaits connect(), registers callbacks with subscribe_to_channel()
+    and then awaits start_listening().
+    """
+
+    def __init__(
+        self,
+        agent_name: str,
+        redis_host: str | None = None,
+        redis_port: int | None = None,
+        redis_db: int = 0,
+    ):
+        """
+        Initialize the agent. No connection is made until connect() is awaited.
+
+        Args:
+            agent_name: Unique identifier for this agent (e.g., 'monitor', 'analyzer')
+            redis_host: Redis server hostname (defaults to env REDIS_HOST or 'redis')
+            redis_port: Redis server port (defaults to env REDIS_PORT or 6379)
+            redis_db: Redis database number (default: 0)
+        """
+        self.agent_name = agent_name
+        self._running = False
+        self._subscriptions: dict[str, MessageCallback] = {}
+        self._dispatch_keys: dict[str, Callable[[dict[str, Any]], Hashable]] = {}
+
+        if redis_host is None:
+            redis_host = os.getenv("REDIS_HOST", "redis")
+        if redis_port is None:
+            redis_port = int(os.getenv("REDIS_PORT", 6379))
+
+        self.redis_host = redis_host
+        self.redis_port = redis_port
+        self.redis_db = redis_db
+
+        self.logger = HemoStatLogger.get_logger(agent_name)
+
+        # Concurrency configuration
+        # AGENT_MAX_IN_FLIGHT: messages handled concurrently (messages for the same
+        # container still run one after another); AGENT_EXECUTOR_WORKERS: threads for
+        # blocking calls made through run_blocking() and for sync callbacks
+        self.max_in_flight = max(1, int(os.getenv("AGENT_MAX_IN_FLIGHT", 100)))
+        self.executor_workers = max(1, int(os.getenv("AGENT_EXECUTOR_WORKERS", 32)))
+        self.executor = ThreadPoolExecutor(
+            max_workers=self.executor_workers, thread_name_prefix=f"{agent_name}-blocking"
+        )
+
+        # REDIS_RECONNECT_MAX_BACKOFF caps the jittered backoff of resubscribe attempts
+        self.reconnect_max_backoff = float(os.getenv("REDIS_RECONNECT_MAX_BACKOFF", 30))
+
+        self.stream_channels = stream_channels_from_env()
+        self.redis: redis.asyncio.Redis | None = None
+        self.pubsub_transport: AsyncPubSubTransport | None = None
+        self.stream_transport: AsyncStreamTransport | None = None
+
+        self._tasks: set[asyncio.Task] = set()
+        self._lanes: dict[Hashable, asyncio.Task] = {}
+
+        # Instrumentation (AGENT_METRICS_PORT, see HemoStatAgent)
+        self.instrumentation = AgentInstrumentation(agent_name)
+        self.agent_metrics_port = int(os.getenv("AGENT_METRICS_PORT", 0))
+        if self.agent_metrics_port > 0:
+            self.instrumentation.enable(self.agent_metrics_port, self.runtime_stats)
+
+    async def connect(self) -> None:
+        """
+        Connect to Redis with exponential backoff and set up the transports.
+
+        Raises:
+            HemoStatConnectionError: If connection fails after configured attempts
+        """
+        max_retries = int(os.getenv("AGENT_RETRY_MAX", 3))
+        initial_delay = float(os.getenv("AGENT_RETRY_DELAY", 1))
+        retry_delays = [initial_delay * (2**i) for i in range(max_retries)]
+
+        redis_kwargs: dict[str, Any] = {
+            "host": self.redis_host,
+            "port": self.redis_port,
+            "db": self.redis_db,
+            "decode_responses": True,
+            "encoding_errors": ENCODING_ERRORS,
+            "socket_connect_timeout": 5,
+            "socket_keepalive": True,
+        }
+        redis_password = os.getenv("REDIS_PASSWORD", "").strip()
+        if redis_password:
+            redis_kwargs["password"] = redis_password
+
+        for attempt in range(max_retries):
+            try:
+                client = redis.asyncio.Redis(**redis_kwargs)
+                await client.ping()
+                self.logger.info(f"Connected to Redis at {self.redis_host}:{self.redis_port}")
+                break
+            except (redis.ConnectionError, redis.TimeoutError) as e:
+                if attempt < max_retries - 1:
+                    wait_time = retry_delays[attempt]
+                    self.logger.warning(
+                        f"Redis connection failed (attempt {attempt + 1}/{max_retries}). "
+                        f"Retrying in {wait_time}s... Error: {e!s}"
+                    )
+                    await asyncio.sleep(wait_time)
+                else:
+                    error_msg = (
+                        f"Failed to connect to Redis after {max_retries} attempts. "
+                        f"Last error: {e!s}"
+                    )
+                    self.logger.error(error_msg)
+                    raise HemoStatConnectionError(error_msg) from e
+        else:
+            msg = f"Failed to connect to Redis after {max_retries} attempts"
+            raise HemoStatConnectionError(msg)
+
+        self.redis = client
+        self.pubsub_transport = AsyncPubSubTransport(
+            client, client.pubsub(), max_backoff=self.reconnect_max_backoff
+        )
+        if self.stream_channels:
+            self.stream_transport = AsyncStreamTransport(
+                client,
+                group=self.agent_name,
+                maxlen=int(os.getenv("HEMOSTAT_STREAM_MAXLEN", 10000)),
+                block_ms=int(os.getenv("HEMOSTAT_STREAM_BLOCK_MS", 1000)),
+                claim_idle_ms=int(os.getenv("HEMOSTAT_STREAM_CLAIM_IDLE_MS", 60000)),
+                max_backoff=self.reconnect_max_backoff,
+            )
+
+        self.logger.info(
+            f"Async agent '{self.agent_name}' initialized successfully on "
+            f"{get_platform_display()}",
+            extra={"agent": self.agent_name},
+        )
+
+    def runtime_stats(self) -> dict[str, Any]:
+        """
+        Report runtime statistics of the message loop.
+
+        Returns:
+            Dictionary with in_flight (messages being handled) and reconnects (per transport)
+        """
+        stats: dict[str, Any] = {"in_flight": len(self._tasks), "reconnects": {}}
+        if self.pubsub_transport is not None:
+            stats["reconnects"][self.pubsub_transport.name] = self.pubsub_transport.reconnects
+        if self.stream_transport is not None:
+            stats["reconnects"][self.stream_transport.name] = self.stream_transport.reconnects
+        return stats
+
+    async def publish_event(self, channel: str, event_type: str, data: dict[str, Any]) -> bool:
+        """
+        Publish a structured event to a Redis channel.
+
+        Args:
+            channel: Redis channel name (e.g., 'hemostat:health_alert')
+            event_type: Type of event (e.g., 'container_unhealthy')
+            data: Event payload data
+
+        Returns:
+            True if publish succeeded, False otherwise
+        """
+        max_retries = int(os.getenv("AGENT_RETRY_MAX", 3))
+        initial_delay = float(os.getenv("AGENT_RETRY_DELAY", 1))
+        retry_delays = [initial_delay * (2**i) for i in range(max_retries)]
+
+        event_payload = {
+            "event_type": event_type,
+            "timestamp": datetime.now(UTC).isoformat(),
+            "agent": self.agent_name,
+            "data": data,
+            TRACE_FIELD: next_trace(self.agent_name, event_type, channel),
+        }
+
+        started = time.perf_counter()
+        try:
+            encoded_payload = encode(event_payload)
+        except (TypeError, ValueError) as e:
+            self.logger.error(f"Failed to serialize event payload: {e!s}")
+            self.instrumentation.published(channel, time.perf_counter() - started, 0, ok=False)
+            return False
+
+        transport = self._transport_for(channel)
+
+        for attempt in range(max_retries):
+            try:
+                delivery = await transport.publish(channel, encoded_payload)
+                self.instrumentation.published(
+                    channel, time.perf_counter() - started, attempt, ok=True
+                )
+                self.logger.info(
+                    f"Published event '{event_type}' to channel '{channel}' ({delivery})"
+                )
+                return True
+            except redis.RedisError as e:
+                if attempt < max_retries - 1:
+                    wait_time = retry_delays[attempt]
+                    self.logger.warning(
+                        f"Failed to publish event (attempt {attempt + 1}/{max_retries}). "
+                        f"Retrying in {wait_time}s... Error: {e!s}"
+                    )
+                    await asyncio.sleep(wait_time)
+                else:
+                    self.logger.error(
+                        f"Failed to publish event after {max_retries} attempts. Last error: {e!s}"
+                    )
+                    self.instrumentation.published(
+                        channel, time.perf_counter() - started, attempt, ok=False
+                    )
+        return False
+
+    async def subscribe_to_channel(
+        self,
+        channel: str,
+        callback: MessageCallback,
+        dispatch_key: Callable[[dict[str, Any]], Hashable] | None = None,
+    ) -> None:
+        """
+        Subscribe to a Redis channel and register a message handler.
+
+        Args:
+            channel: Redis channel name to subscribe to
+            callback: Coroutine function, or plain function run on the executor, invoked
+                with each deserialized message
+            dispatch_key: Optional function mapping a message to its ordering key
+                (default: the message's container)
+        """
+        transport = self._transport_for(channel)
+        try:
+            await transport.subscribe(channel)
+            self._subscriptions[channel] = callback
+            if dispatch_key is not None:
+                self._dispatch_keys[channel] = dispatch_key
+            self.logger.info(f"Subscribed to channel '{channel}' ({transport.name})")
+        except redis.RedisError as e:
+            self.logger.error(f"Failed to subscribe to channel '{channel}': {e!s}")
+
+    async def start_listening(self) -> None:
+        """
+        Run the message loop until stop() is called or SIGTERM/SIGINT is received.
+
+        Every message is handled in its own task. At most AGENT_MAX_IN_FLIGHT messages are
+        handled at once and messages for the same container are handled in arrival order;
+        when the limit is reached the loop stops reading until a handler finishes.
+        """
+        self._running = True
+        self._install_signal_handlers()
+        self.logger.info(f"Starting message listening loop (up to {self.max_in_flight} in flight)")
+
+        transports = [
+            transport
+            for transport in (self.pubsub_transport, self.stream_transport)
+            if transport is not None
+            and any(self._transport_for(channel) is transport for channel in self._subscriptions)
+        ]
+
+        try:
+            await asyncio.gather(*(self._listen_transport(t) for t in transports))
+        finally:
+            if self._tasks:
+                await asyncio.wait(set(self._tasks), timeout=30)
+            self.logger.info("Message listening loop stopped")
+
+    async def run_blocking(self, func: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+        """
+        Run a blocking call (Docker SDK, LLM client, HTTP request) on the agent's executor.
+
+        The call runs in a copy of the caller's context, so events it publishes continue
+        the trace of the message being handled.
+
+        Args:
+            func: Blocking callable
+            *args: Positional arguments for func
+            **kwargs: Keyword arguments for func
+
+        Returns:
+            The callable's return value
+        """
+        loop = asyncio.get_running_loop()
+        context = contextvars.copy_context()
+        return await loop.run_in_executor(
+            self.executor, functools.partial(context.run, func, *args, **kwargs)
+        )
+
+    async def get_shared_state(self, key: str, check_ttl: bool = False) -> dict[str, Any] | None:
+        """
+        Retrieve shared state from Redis.
+
+        Args:
+            key: State key (will be prefixed with 'hemostat:state:')
+            check_ttl: Also fetch the TTL (same round trip) and warn if the key expires
+                within 5 minutes
+
+        Returns:
+            Deserialized state dict, or None if key doesn't exist or error occurs
+        """
+        try:
+            full_key = f"hemostat:state:{key}"
+            if check_ttl:
+                pipe = self.redis.pipeline(transaction=False)
+                pipe.get(full_key)
+                pipe.ttl(full_key)
+                value, ttl = await pipe.execute()
+                if ttl > 0 and ttl < 300:  # Less than 5 minutes
+                    self.logger.warning(f"Shared state '{key}' expiring soon (TTL: {ttl}s)")
+            else:
+                value = await self.redis.get(full_key)
+
+            if value is None:
+                return None
+            return decode(value)
+        except redis.RedisError as e:
+            self.logger.error(f"Failed to get shared state '{key}': {e!s}")
+            return None
+        except CodecError as e:
+            self.logger.error(f"Failed to deserialize shared state '{key}': {e!s}")
+            return None
+
+    async def get_shared_states(self, keys: list[str]) -> dict[str, dict[str, Any] | None]:
+        """
+        Retrieve several shared states with a single MGET.
+
+        Args:
+            keys: State keys (each will be prefixed with 'hemostat:state:')
+
+        Returns:
+            Mapping of key to deserialized state dict, or None for keys that don't exist
+            or can't be decoded (all None if Redis fails)
+        """
+        states: dict[str, dict[str, Any] | None] = dict.fromkeys(keys)
+        if not keys:
+            return states
+
+        try:
+            values = await self.redis.mget([f"hemostat:state:{key}" for key in keys])
+        except redis.RedisError as e:
+            self.logger.error(f"Failed to get {len(keys)} shared states: {e!s}")
+            return states
+
+        for key, value in zip(keys, values, strict=False):
+            if value is None:
+                continue
+            try:
+                states[key] = decode(value)
+            except CodecError as e:
+                self.logger.error(f"Failed to deserialize shared state '{key}': {e!s}")
+        return states
+
+    async def set_shared_state(
+        self, key: str, value: dict[str, Any], ttl: int | None = None
+    ) -> bool:
+        """
+        Store shared state in Redis with optional TTL.
+
+        The value and TTL are written with one SET ... EX, so the key never exists
+        without its TTL.
+
+        Args:
+            key: State key (will be prefixed with 'hemostat:state:')
+            value: State data to store
+            ttl: Time-to-live in seconds (optional)
+
+        Returns:
+            True if successful, False otherwise
+        """
+        try:
+            full_key = f"hemostat:state:{key}"
+            encoded_value = encode(value)
+            await self.redis.set(full_key, encoded_value, ex=ttl or None)
+
+            self.logger.debug(f"Set shared state '{key}'" + (f" with TTL {ttl}s" if ttl else ""))
+            return True
+        except (TypeError, ValueError) as e:
+            self.logger.error(f"Failed to serialize shared state '{key}': {e!s}")
+            return False
+        except redis.RedisError as e:
+            self.logger.error(f"Failed to set shared state '{key}': {e!s}")
+            return False
+
+    async def set_shared_states(
+        self, states: dict[str, dict[str, Any]], ttl: int | None = None
+    ) -> bool:
+        """
+        Store several shared states in one round trip.
+
+        Without a TTL the states are written with a single MSET; with a TTL, as SET ... EX
+        commands in one pipeline. Nothing is written if any state fails to serialize.
+
+        Args:
+            states: Mapping of state key (will be prefixed with 'hemostat:state:') to data
+            ttl: Time-to-live in seconds applied to every key (optional)
+
+        Returns:
+            True if all states were written, False otherwise
+        """
+        if not states:
+            return True
+
+        try:
+            encoded = {f"hemostat:state:{key}": encode(value) for key, value in states.items()}
+        except (TypeError, ValueError) as e:
+            self.logger.error(f"Failed to serialize {len(states)} shared states: {e!s}")
+            return False
+
+        try:
+            if not ttl:
+                await self.redis.mset(encoded)
+            else:
+                pipe = self.redis.pipeline(transaction=False)
+                for full_key, encoded_value in encoded.items():
+                    pipe.set(full_key, encoded_value, ex=ttl)
+                await pipe.execute()
+        except redis.RedisError as e:
+            self.logger.error(f"Failed to set {len(states)} shared states: {e!s}")
+            return False
+
+        self.logger.debug(f"Set {len(states)} shared states" + (f" with TTL {ttl}s" if ttl else ""))
+        return True
+
+    async def stop(self) -> None:
+        """
+        Gracefully shut down the agent.
+
+        Stops the listening loop, lets in-flight handlers finish, unsubscribes and closes
+        connections and the executor.
+        """
+        if self.redis is None:
+            return
+        self.logger.info("Stopping agent")
+        self._running = False
+
+        current = asyncio.current_task()
+        pending = {task for task in self._tasks if task is not current}
+        if pending:
+            await asyncio.wait(pending, timeout=30)
+
+        try:
+            if self.pubsub_transport is not None:
+                await self.pubsub_transport.close()
+            if self.stream_transport is not None:
+                await self.stream_transport.close()
+            self.logger.debug("Unsubscribed from all channels")
+        except Exception as e:
+            self.logger.error(f"Error unsubscribing: {e!s}")
+
+        try:
+            if self.redis is not None:
+                await self.redis.aclose()
+                self.redis = None
+            self.logger.debug("Closed Redis connection")
+        except Exception as e:
+            self.logger.error(f"Error closing Redis connection: {e!s}")
+
+        self.executor.shutdown(wait=False, cancel_futures=True)
+        self.instrumentation.disable()
+        self.logger.info("Agent stopped successfully")
+
+    @property
+    def is_running(self) -> bool:
+        """
+        Check if the agent is currently running.
+
+        Returns:
+            True if the agent is running, False otherwise
+        """
+        return self._running
+
+    async def _listen_transport(
+        self, transport: AsyncPubSubTransport | AsyncStreamTransport
+    ) -> None:
+        """
+        Consume one transport until the agent stops, spawning a task per message.
+
+        Args:
+            transport: Transport to read messages from
+        """
+        try:
+            async for channel, data, ack in transport.listen(lambda: self._running):
+                received = time.perf_counter()
+                payload = self._decode_message(channel, data)
+                self.instrumentation.received(channel, time.perf_counter() - received)
+                if payload is None:
+                    await ack()
+                    continue
+                # Backpressure: stop reading while too many messages are in flight
+                while len(self._tasks) >= self.max_in_flight:
+                    await asyncio.wait(set(self._tasks), return_when=asyncio.FIRST_COMPLETED)
+                self._spawn(self._dispatch_key(channel, payload), channel, payload, ack)
+        except Exception as e:
+            if self._running:
+                self.logger.error(f"Listening loop error ({transport.name}): {e!s}", exc_info=True)
+
+    def _spawn(
+        self,
+        key: Hashable,
+        channel: str,
+        payload: dict[str, Any],
+        ack: Callable[[], Awaitable[None]],
+    ) -> None:
+        """
+        Start a task for one message, chained behind the previous message with the same key.
+
+        Args:
+            key: Ordering key
+            channel: Channel the message arrived on
+            payload: Deserialized event
+            ack: Acknowledgement coroutine function
+        """
+        previous = self._lanes.get(key)
+        task = asyncio.create_task(
+            self._run_message(previous, channel, payload, ack, time.perf_counter())
+        )
+        self._lanes[key] = task
+        self._tasks.add(task)
+
+        def _done(finished: asyncio.Task) -> None:
+            self._tasks.discard(finished)
+            if self._lanes.get(key) is finished:
+                del self._lanes[key]
+
+        task.add_done_callback(_done)
+
+    async def _run_message(
+        self,
+        previous: asyncio.Task | None,
+        channel: str,
+        payload: dict[str, Any],
+        ack: Callable[[], Awaitable[None]],
+        queued_at: float,
+    ) -> None:
+        """
+        Wait for the previous message of the same key, then handle and acknowledge this one.
+
+        Args:
+            previous: Task of the preceding message with the same key, if still running
+            channel: Channel the message arrived on
+            payload: Deserialized event
+            ack: Acknowledgement coroutine function
+            queued_at: time.perf_counter() when the task was spawned
+        """
+        if previous is not None:
+            await asyncio.wait({previous})
+        self.instrumentation.queue_wait(channel, time.perf_counter() - queued_at)
+        try:
+            await self._handle_message(channel, payload)
+        finally:
+            try:
+                await ack()
+            except redis.RedisError as e:
+                self.logger.error(f"Failed to acknowledge message on '{channel}': {e!s}")
+
+    def _decode_message(self, channel: str, data: str) -> dict[str, Any] | None:
+        """
+        Deserialize a message.
+
+        Args:
+            channel: Channel the message arrived on
+            data: Serialized event
+
+        Returns:
+            Event payload, or None if the message is not a valid event
+        """
+        try:
+            payload = decode(data)
+        except CodecError as e:
+            self.logger.error(f"Failed to deserialize message: {e!s}")
+            return None
+        if not isinstance(payload, dict):
+            self.logger.error(f"Ignoring non-object message on channel '{channel}'")
+            return None
+        self.logger.debug(
+            f"Received message on channel '{channel}': {payload.get('event_type', 'unknown')}"
+        )
+        return payload
+
+    async def _handle_message(self, channel: str, payload: dict[str, Any]) -> None:
+        """
+        Invoke the callback registered for a channel.
+
+        Args:
+            channel: Channel the message arrived on
+            payload: Deserialized event
+        """
+        callback = self._subscriptions.get(channel)
+        if callback is None:
+            return
+        started = time.perf_counter()
+        failed = False
+        try:
+            # Events the callback publishes continue this message's trace
+            with continue_from(payload):
+                if asyncio.iscoroutinefunction(callback):
+                    await callback(payload)
+                else:
+                    await self.run_blocking(callback, payload)
+        except Exception as e:
+            failed = True
+            self.logger.error(f"Error processing message: {e!s}", exc_info=True)
+        self.instrumentation.callback(channel, time.perf_counter() - started, failed)
+
+    def _dispatch_key(self, channel: str, payload: dict[str, Any]) -> Hashable:
+        """
+        Determine the ordering key of a message.
+
+        Args:
+            channel: Channel the message arrived on
+            payload: Deserialized event
+
+        Returns:
+            Ordering key
+        """
+        key_func = self._dispatch_keys.get(channel)
+        if key_func is not None:
+            try:
+                return key_func(payload)
+            except Exception as e:
+                self.logger.warning(f"Dispatch key function failed on '{channel}': {e!s}")
+                return channel
+        return message_key(channel, payload)
+
+    def _transport_for(self, channel: str) -> AsyncPubSubTransport | AsyncStreamTransport:
+        """
+        Select the transport carrying a channel.
+
+        Args:
+            channel: Channel name
+
+        Returns:
+            The stream transport if the channel is listed in HEMOSTAT_STREAM_CHANNELS,
+            otherwise the pub/sub transport
+
+        Raises:
+            HemoStatConnectionError: If connect() has not been awaited
+        """
+        if self.pubsub_transport is None:
+            msg = "Agent is not connected; await connect() first"
+            raise HemoStatConnectionError(msg)
+        if self.stream_transport is not None and (
+            "*" in self.stream_channels or channel in self.stream_channels
+        ):
+            return self.stream_transport
+        return self.pubsub_transport
+
+    def _install_signal_handlers(self) -> None:
+        """Stop the agent on SIGTERM/SIGINT (where the event loop supports signal handlers)."""
+        loop = asyncio.get_running_loop()
+        for signum in (signal.SIGTERM, signal.SIGINT):
+            # Windows event loops and non-main threads do not support signal handlers
+            with contextlib.suppress(NotImplementedError, RuntimeError, ValueError):
+                loop.add_signal_handler(signum, self._handle_shutdown_signal, signum)
+
+    def _handle_shutdown_signal(self, signum: int) -> None:
+        """
+        Handle OS shutdown signals (SIGTERM, SIGINT).
+
+        Args:
+            signum: Signal number
+        """
+        self.logger.info(f"Received signal {signum}, initiating graceful shutdown")
+        task = asyncio.get_running_loop().create_task(self.stop())
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    @classmethod
+    def from_env(cls, agent_name: str) -> "AsyncHemoStatAgent":
+        """
+        Create an agent instance from environment variables.
+
+        Reads REDIS_HOST, REDIS_PORT, and REDIS_DB from environment.
+
+        Args:
+            agent_name: Name of the agent
+
+        Returns:
+            AsyncHemoStatAgent instance (not yet connected)
+        """
+        return cls(
+            agent_name=agent_name,
+            redis_host=os.getenv("REDIS_HOST", "redis"),
+            redis_port=int(os.getenv("REDIS_PORT", 6379)),
+            redis_db=int(os.getenv("REDIS_DB", 0)),
+        )
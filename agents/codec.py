@@ -0,0 +1,277 @@
+"""
+HemoStat Serialization Codecs
+
+Encodes event envelopes and shared state for Redis. Three codecs are available:
+
+- json:    stdlib json (default, always available)
+- orjson:  orjson, several times faster; its output is plain JSON
+- msgpack: MessagePack, faster and smaller; binary
+
+JSON output (json and orjson) is written as-is, so agents that predate codecs can read it.
+Binary output is framed with a 3-byte header: FRAME_MARKER, FRAME_VERSION and the codec's
+content-type ID. The marker byte (0xC1) can never start a JSON document, so decode()
+recognizes every format. Readers therefore accept all codecs, and HEMOSTAT_CODEC only
+chooses what a writer produces. Switch it to msgpack only after every agent and the
+dashboard run a codec-aware version.
+
+Redis clients use decode_responses=True, so values arrive as str. Binary frames go through
+str with the 'surrogateescape' error handler, which maps bytes to str and back without loss.
+Clients that read framed values must be created with encoding_errors=ENCODING_ERRORS.
+"""
+
+import json
+import os
+from collections.abc import Callable
+from typing import Any
+
+from agents.logger import HemoStatLogger
+
+logger = HemoStatLogger.get_logger("codec")
+
+# Frame header for binary codecs: marker, frame format version, content-type ID
+FRAME_MARKER = b"\xc1"
+FRAME_VERSION = 1
+FRAME_HEADER_SIZE = 3
+
+# Error handler Redis clients must use so binary frames survive decode_responses=True
+ENCODING_ERRORS = "surrogateescape"
+
+# Marker as it appears in a str decoded with surrogateescape
+_STR_MARKER = FRAME_MARKER.decode("utf-8", ENCODING_ERRORS)
+
+
+class CodecError(ValueError):
+    """Raised when a value cannot be decoded."""
+
+    pass
+
+
+class Codec:
+    """
+    One serialization format.
+
+    Attributes:
+        name: Codec name as used in HEMOSTAT_CODEC
+        content_type: Frame content-type ID (0 = unframed JSON)
+        binary: Whether output is framed binary rather than JSON text
+    """
+
+    def __init__(
+        self,
+        name: str,
+        content_type: int,
+        dumps: Callable[[Any], bytes],
+        loads: Callable[[bytes], Any],
+        binary: bool = False,
+    ):
+        """
+        Initialize the codec.
+
+        Args:
+            name: Codec name
+            content_type: Frame content-type ID
+            dumps: Function serializing an object to bytes
+            loads: Function deserializing bytes
+            binary: Whether the output must be framed
+        """
+        self.name = name
+        self.content_type = content_type
+        self.binary = binary
+        self._dumps = dumps
+        self._loads = loads
+
+    def dumps(self, obj: Any) -> bytes:
+        """
+        Serialize an object, adding the frame header for binary codecs.
+
+        Args:
+            obj: JSON-compatible object
+
+        Returns:
+            Encoded bytes
+
+        Raises:
+            TypeError: If the object contains unsupported types
+            ValueError: If the object cannot be represented
+        """
+        body = self._dumps(obj)
+        if self.binary:
+            return FRAME_MARKER + bytes((FRAME_VERSION, self.content_type)) + body
+        return body
+
+    def loads(self, body: bytes) -> Any:
+        """
+        Deserialize a body without frame header.
+
+        Args:
+            body: Encoded bytes
+
+        Returns:
+            Decoded object
+        """
+        return self._loads(body)
+
+
+def _json_codec() -> Codec:
+    """Stdlib JSON codec."""
+    return Codec(
+        "json",
+        0,
+        lambda obj: json.dumps(obj).encode("utf-8"),
+        json.loads,
+    )
+
+
+def _orjson_codec() -> Codec:
+    """orjson codec (raises ImportError if orjson is not installed)."""
+    import orjson
+
+    return Codec(
+        "orjson",
+        0,
+        lambda obj: orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS),
+        orjson.loads,
+    )
+
+
+def _msgpack_codec() -> Codec:
+    """MessagePack codec (raises ImportError if msgpack is not installed)."""
+    import msgpack
+
+    return Codec(
+        "msgpack",
+        1,
+        lambda obj: msgpack.packb(obj, use_bin_type=True),
+        lambda body: msgpack.unpackb(body, raw=False, strict_map_key=False),
+        binary=True,
+    )
+
+
+_FACTORIES: dict[str, Callable[[], Codec]] = {
+    "json": _json_codec,
+    "orjson": _orjson_codec,
+    "msgpack": _msgpack_codec,
+}
+
+_loaded: dict[str, Codec | None] = {}
+_default: Codec | None = None
+
+
+def available_codecs() -> list[str]:
+    """
+    List codecs whose libraries are installed.
+
+    Returns:
+        Codec names
+    """
+    return [name for name in _FACTORIES if _load(name) is not None]
+
+
+def get_codec(name: str | None = None) -> Codec:
+    """
+    Get a codec by name, falling back to stdlib JSON if its library is not installed.
+
+    Args:
+        name: Codec name (default: env HEMOSTAT_CODEC or 'json')
+
+    Returns:
+        The codec
+    """
+    if name is None:
+        name = os.getenv("HEMOSTAT_CODEC", "json").strip().lower() or "json"
+    codec = _load(name)
+    if codec is None:
+        logger.warning(f"Codec '{name}' is not available, using json")
+        codec = _load("json")
+    return codec  # type: ignore[return-value]
+
+
+def encode(obj: Any, codec: Codec | None = None) -> str:
+    """
+    Encode an object to a string for a decode_responses=True Redis client.
+
+    Args:
+        obj: JSON-compatible object
+        codec: Codec to use (default: the HEMOSTAT_CODEC codec)
+
+    Returns:
+        Encoded value (binary frames are carried with surrogateescape)
+
+    Raises:
+        TypeError: If the object contains unsupported types
+        ValueError: If the object cannot be represented
+    """
+    data = (codec or _default_codec()).dumps(obj)
+    return data.decode("utf-8", ENCODING_ERRORS)
+
+
+def decode(data: str | bytes) -> Any:
+    """
+    Decode a value written by any codec, or by an agent that predates codecs.
+
+    Args:
+        data: Value read from Redis (str from decode_responses clients, or bytes)
+
+    Returns:
+        Decoded object
+
+    Raises:
+        CodecError: If the value is malformed or uses a codec that is not installed
+    """
+    if isinstance(data, str):
+        if not data.startswith(_STR_MARKER):
+            return _loads_json(data)
+        data = data.encode("utf-8", ENCODING_ERRORS)
+    elif not data.startswith(FRAME_MARKER):
+        return _loads_json(data)
+
+    if len(data) < FRAME_HEADER_SIZE or data[1] != FRAME_VERSION:
+        msg = "Unsupported frame header"
+        raise CodecError(msg)
+    codec = _by_content_type(data[2])
+    if codec is None:
+        msg = f"No installed codec for content type {data[2]}"
+        raise CodecError(msg)
+    try:
+        return codec.loads(data[FRAME_HEADER_SIZE:])
+    except Exception as e:
+        msg = f"Failed to decode {codec.name} frame: {e}"
+        raise CodecError(msg) from e
+
+
+def _loads_json(data: str | bytes) -> Any:
+    """Parse JSON text, with orjson when it is installed."""
+    codec = _load("orjson") or _load("json")
+    try:
+        return codec.loads(data)  # type: ignore[union-attr, arg-type]
+    except Exception as e:
+        msg = f"Failed to decode JSON: {e}"
+        raise CodecError(msg) from e
+
+
+def _by_content_type(content_type: int) -> Codec | None:
+    """Find an installed binary codec by its frame content-type ID."""
+    for name in _FACTORIES:
+        codec = _load(name)
+        if codec is not None and codec.binary and codec.content_type == content_type:
+            return codec
+    return None
+
+
+def _load(name: str) -> Codec | None:
+    """Create (once) the codec called name; None if unknown or its library is missing."""
+    if name not in _loaded:
+        factory = _FACTORIES.get(name)
+        try:
+            _loaded[name] = factory() if factory else None
+        except ImportError:
+            _loaded[name] = None
+    return _loaded[name]
+
+
+def _default_codec() -> Codec:
+    """Codec selected by HEMOSTAT_CODEC, resolved on first use."""
+    global _default
+    if _default is None:
+        _default = get_codec()
+    return _default
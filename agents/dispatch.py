@@ -0,0 +1,276 @@
+"""
+HemoStat Message Dispatch
+
+Runs message callbacks on a bounded worker pool instead of the listener thread. Messages
+are grouped into per-key lanes (normally one per container): messages with the same key
+run one at a time in arrival order, while different keys run in parallel. The number of
+queued messages is bounded; when the queue is full the configured policy applies:
+
+- block:       the listener waits for space (backpressure towards Redis)
+- drop_oldest: the oldest queued message of any key is discarded
+- coalesce:    a new message replaces the one still queued for the same key (latest
+               state wins); if the key has nothing queued, the listener waits for space
+"""
+
+import itertools
+import threading
+from collections import deque
+from collections.abc import Callable, Hashable
+from typing import Any
+
+from agents.logger import HemoStatLogger
+
+DISPATCH_POLICIES = ("block", "drop_oldest", "coalesce")
+
+
+def message_key(channel: str, payload: dict[str, Any]) -> Hashable:
+    """
+    Default ordering key of an event: its container, or the channel if it has none.
+
+    Args:
+        channel: Channel the event arrived on
+        payload: Deserialized event envelope
+
+    Returns:
+        data.container_id, data.container or data.container_name (first one present),
+        otherwise the channel name
+    """
+    data = payload.get("data")
+    if isinstance(data, dict):
+        for field in ("container_id", "container", "container_name"):
+            value = data.get(field)
+            if isinstance(value, str) and value:
+                return value
+    return channel
+
+
+class _Task:
+    """A queued callback invocation."""
+
+    __slots__ = ("args", "fn", "key", "on_done", "seq")
+
+    def __init__(
+        self,
+        seq: int,
+        key: Hashable,
+        fn: Callable[..., Any],
+        args: tuple,
+        on_done: Callable[[], None] | None,
+    ):
+        self.seq = seq
+        self.key = key
+        self.fn = fn
+        self.args = args
+        self.on_done = on_done
+
+
+class Dispatcher:
+    """
+    Bounded, key-ordered worker pool for message callbacks.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        workers: int = 4,
+        queue_size: int = 1000,
+        policy: str = "block",
+    ):
+        """
+        Initialize the dispatcher and start its worker threads.
+
+        Args:
+            name: Agent name (used for the logger and thread names)
+            workers: Number of worker threads
+            queue_size: Maximum number of queued (not yet running) messages
+            policy: Behaviour when the queue is full: block, drop_oldest or coalesce
+
+        Raises:
+            ValueError: If the policy is unknown
+        """
+        if policy not in DISPATCH_POLICIES:
+            msg = f"Unknown dispatch policy '{policy}' (expected one of {DISPATCH_POLICIES})"
+            raise ValueError(msg)
+
+        self.logger = HemoStatLogger.get_logger(name)
+        self.name = name
+        self.workers = max(1, workers)
+        self.queue_size = max(1, queue_size)
+        self.policy = policy
+
+        self._cond = threading.Condition()
+        self._lanes: dict[Hashable, deque[_Task]] = {}
+        self._ready: deque[Hashable] = deque()
+        self._active: set[Hashable] = set()
+        self._pending = 0
+        self._closed = False
+        self._seq = itertools.count()
+
+        self.completed = 0
+        self.dropped = 0
+        self.coalesced = 0
+
+        self._threads = [
+            threading.Thread(target=self._worker, name=f"{name}-dispatch-{i}", daemon=True)
+            for i in range(self.workers)
+        ]
+        for thread in self._threads:
+            thread.start()
+
+    def submit(
+        self,
+        key: Hashable,
+        fn: Callable[..., Any],
+        *args: Any,
+        on_done: Callable[[], None] | None = None,
+    ) -> bool:
+        """
+        Queue a callback invocation.
+
+        Args:
+            key: Ordering key; invocations with equal keys never run concurrently
+            fn: Callable to run on a worker thread
+            *args: Arguments for fn
+            on_done: Called after fn ran (or failed), or when the task is dropped or
+                replaced by the queue policy (e.g. to acknowledge a stream entry)
+
+        Returns:
+            True if queued, False if the dispatcher is shut down
+        """
+        discarded: list[_Task] = []
+        task = _Task(next(self._seq), key, fn, args, on_done)
+
+        with self._cond:
+            if self._closed:
+                return False
+
+            replaced = False
+            while self._pending >= self.queue_size and not self._closed:
+                lane = self._lanes.get(key)
+                if self.policy == "drop_oldest":
+                    discarded.append(self._drop_oldest_locked())
+                elif self.policy == "coalesce" and lane:
+                    discarded.append(lane[-1])
+                    lane[-1] = task
+                    self.coalesced += 1
+                    replaced = True
+                    break
+                else:
+                    self._cond.wait()
+            if self._closed:
+                return False
+
+            if not replaced:
+                lane = self._lanes.setdefault(key, deque())
+                lane.append(task)
+                self._pending += 1
+                if len(lane) == 1 and key not in self._active:
+                    self._ready.append(key)
+                self._cond.notify_all()
+
+        for old in discarded:
+            self._finish(old)
+        return True
+
+    def stats(self) -> dict[str, Any]:
+        """
+        Snapshot of queue and worker statistics.
+
+        Returns:
+            Dictionary with queued, running, lanes, completed, dropped and coalesced counts
+        """
+        with self._cond:
+            return {
+                "queued": self._pending,
+                "running": len(self._active),
+                "lanes": len(self._lanes),
+                "completed": self.completed,
+                "dropped": self.dropped,
+                "coalesced": self.coalesced,
+                "workers": self.workers,
+                "policy": self.policy,
+            }
+
+    def in_worker(self) -> bool:
+        """
+        Whether the calling thread is one of this dispatcher's workers.
+
+        A worker must not submit to its own dispatcher under the block policy: with the
+        queue full, every worker could end up waiting for space that only they can free.
+
+        Returns:
+            True when called from a worker thread
+        """
+        return threading.current_thread() in self._threads
+
+    def shutdown(self, timeout: float = 5.0) -> None:
+        """
+        Stop accepting messages and let workers finish what is queued.
+
+        Args:
+            timeout: Maximum seconds to wait for each worker thread
+        """
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+        for thread in self._threads:
+            thread.join(timeout=timeout)
+
+    def _drop_oldest_locked(self) -> _Task:
+        """Remove and return the oldest queued task across all lanes. Caller holds the lock."""
+        key = min(
+            (k for k, lane in self._lanes.items() if lane),
+            key=lambda k: self._lanes[k][0].seq,
+        )
+        lane = self._lanes[key]
+        task = lane.popleft()
+        self._pending -= 1
+        self.dropped += 1
+        if not lane and key not in self._active:
+            # Any stale entry left in the ready queue is skipped by the workers
+            del self._lanes[key]
+        return task
+
+    def _worker(self) -> None:
+        """Take the next ready lane, run one task from it, and requeue the lane if needed."""
+        while True:
+            with self._cond:
+                task = None
+                while task is None:
+                    while not self._ready and not self._closed:
+                        self._cond.wait()
+                    if not self._ready:
+                        return
+                    key = self._ready.popleft()
+                    lane = self._lanes.get(key)
+                    if key in self._active or not lane:
+                        continue
+                    task = lane.popleft()
+                    self._pending -= 1
+                    self._active.add(key)
+                    self._cond.notify_all()
+
+            try:
+                task.fn(*task.args)
+            except Exception as e:
+                self.logger.error(f"Error in dispatched callback: {e!s}", exc_info=True)
+            finally:
+                self._finish(task)
+
+            with self._cond:
+                self.completed += 1
+                self._active.discard(key)
+                if self._lanes.get(key):
+                    self._ready.append(key)
+                else:
+                    self._lanes.pop(key, None)
+                self._cond.notify_all()
+
+    def _finish(self, task: _Task) -> None:
+        """Run a task's completion callback, logging failures."""
+        if task.on_done is None:
+            return
+        try:
+            task.on_done()
+        except Exception as e:
+            self.logger.error(f"Error completing dispatched message: {e!s}")
@@ -7,7 +7,6 @@ and implements event deduplication to prevent notification spam.
 """
 
 import hashlib
-import json
 import os
 import time
 from datetime import UTC, datetime
@@ -18,7 +17,9 @@ import requests
 from requests import exceptions as requests_exceptions
 
 from agents.agent_base import HemoStatAgent
+from agents.codec import encode
 from agents.platform_utils import get_platform_display
+from agents.tracing import TRACE_FIELD, next_trace
 
 
 class AlertNotifier(HemoStatAgent):
@@ -190,7 +191,8 @@ class AlertNotifier(HemoStatAgent):
 
         Stores events in both type-specific lists and a unified timeline list.
         Uses source timestamp if available, otherwise uses current time.
-        Maintains max event count and TTL per list.
+        Maintains max event count and TTL per list. Events of a traced incident keep the
+        trace, extended by a hop for the store, for pipeline latency reports.
 
         Args:
             event_type: Type of event (e.g., 'remediation_complete', 'false_alarm')
@@ -208,16 +210,20 @@ class AlertNotifier(HemoStatAgent):
                 "event_type": event_type,
                 "data": payload,
             }
+            # Called from a message callback, so this continues the source event's trace
+            trace = next_trace(self.agent_name, event_type, f"hemostat:events:{event_type}")
+            if len(trace["hops"]) > 1:
+                event_entry[TRACE_FIELD] = trace
 
-            event_json = json.dumps(event_entry)
+            encoded_event = encode(event_entry)
 
             # Store in type-specific list (newest first)
-            self.redis.lpush(f"hemostat:events:{event_type}", event_json)
+            self.redis.lpush(f"hemostat:events:{event_type}", encoded_event)
             self.redis.ltrim(f"hemostat:events:{event_type}", 0, self.max_events - 1)
             self.redis.expire(f"hemostat:events:{event_type}", self.event_ttl)
 
             # Store in unified timeline
-            self.redis.lpush("hemostat:events:all", event_json)
+            self.redis.lpush("hemostat:events:all", encoded_event)
             self.redis.ltrim("hemostat:events:all", 0, self.max_events - 1)
             self.redis.expire("hemostat:events:all", self.event_ttl)
 
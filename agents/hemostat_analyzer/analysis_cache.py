@@ -0,0 +1,173 @@
+"""
+HemoStat Analyzer Result Cache
+
+Caches AI analysis results by alert fingerprint so repeated alerts (the same container
+raising the same anomalies with near-identical metrics every poll) do not each cost an LLM
+call. The fingerprint normalizes an alert to what drives the verdict: container, anomaly
+types and severities, health status, exit code, metric values rounded down to buckets, and
+the CPU and memory trend classes.
+
+Results are kept in Redis under hemostat:analysis_cache:<fingerprint> with a TTL, shared by
+all analyzer replicas, behind an in-process LRU (StateCache) that saves the round trip.
+"""
+
+import hashlib
+import json
+import math
+from typing import Any
+
+import redis
+
+from agents.codec import CodecError, decode, encode
+from agents.logger import HemoStatLogger
+from agents.state_cache import StateCache
+
+KEY_PREFIX = "hemostat:analysis_cache:"
+
+# Metrics rounded into buckets for the fingerprint
+FINGERPRINT_METRICS = ("cpu_percent", "memory_percent")
+
+
+def alert_fingerprint(
+    alert_data: dict[str, Any], trends: dict[str, str], metric_bucket: float
+) -> str:
+    """
+    Compute the normalized fingerprint of a health alert.
+
+    Args:
+        alert_data: Health alert data from the Monitor
+        trends: Trend class per metric (e.g. {'cpu_percent': 'stable'})
+        metric_bucket: Bucket width for metric values (e.g. 10 percentage points)
+
+    Returns:
+        Hex digest identifying alerts that should get the same verdict
+    """
+    metrics = alert_data.get("metrics") or {}
+    buckets = {}
+    for name in FINGERPRINT_METRICS:
+        value = metrics.get(name)
+        if isinstance(value, int | float) and metric_bucket > 0:
+            buckets[name] = math.floor(value / metric_bucket)
+
+    anomalies = sorted(
+        {
+            (str(anomaly.get("type", "unknown")), str(anomaly.get("severity", "unknown")))
+            for anomaly in alert_data.get("anomalies") or []
+            if isinstance(anomaly, dict)
+        }
+    )
+    normalized = {
+        "container": alert_data.get("container_name", "unknown"),
+        "anomalies": anomalies,
+        "health_status": alert_data.get("health_status"),
+        "exit_code": alert_data.get("exit_code"),
+        "metrics": buckets,
+        "trends": trends,
+    }
+    return hashlib.sha256(json.dumps(normalized, sort_keys=True).encode()).hexdigest()[:32]
+
+
+class AnalysisCache:
+    """
+    Two-tier (in-process LRU, then Redis) cache of AI analysis results.
+    """
+
+    def __init__(
+        self,
+        redis_client: redis.Redis,
+        ttl: int,
+        max_entries: int = 256,
+        agent_name: str = "analyzer",
+    ):
+        """
+        Initialize the cache.
+
+        Args:
+            redis_client: Client for the shared tier
+            ttl: Seconds a result stays valid in both tiers
+            max_entries: Results kept in the in-process tier
+            agent_name: Agent name (used for the logger)
+        """
+        self.logger = HemoStatLogger.get_logger(agent_name)
+        self.redis = redis_client
+        self.ttl = ttl
+        self.local = StateCache(max_entries=max_entries, ttl=ttl)
+        self.local.set_enabled(True)
+
+        self.redis_hits = 0
+        self.misses = 0
+
+    def get(self, fingerprint: str) -> dict[str, Any] | None:
+        """
+        Look up a cached analysis.
+
+        Args:
+            fingerprint: Alert fingerprint
+
+        Returns:
+            Analysis dict (with 'cache' set to 'local' or 'redis'), or None on a miss
+        """
+        key = KEY_PREFIX + fingerprint
+        hit, value = self.local.get(key)
+        if hit and value is not None:
+            return self._decode(value, "local")
+
+        token = self.local.token()
+        try:
+            value = self.redis.get(key)
+        except redis.RedisError as e:
+            self.logger.warning(f"Analysis cache lookup failed: {e}")
+            value = None
+        if value is None:
+            self.misses += 1
+            return None
+
+        self.redis_hits += 1
+        self.local.put(key, value, token)
+        return self._decode(value, "redis")
+
+    def put(self, fingerprint: str, analysis: dict[str, Any]) -> None:
+        """
+        Cache an analysis in both tiers.
+
+        Args:
+            fingerprint: Alert fingerprint
+            analysis: AI analysis result
+        """
+        key = KEY_PREFIX + fingerprint
+        value = encode({k: v for k, v in analysis.items() if k != "cache"})
+        try:
+            self.redis.set(key, value, ex=self.ttl)
+        except redis.RedisError as e:
+            self.logger.warning(f"Analysis cache store failed: {e}")
+        self.local.put(key, value, self.local.token())
+
+    def stats(self) -> dict[str, Any]:
+        """
+        Cache statistics.
+
+        Returns:
+            Dictionary with local_hits, redis_hits, misses, hit_rate and size
+        """
+        local = self.local.stats()
+        lookups = local["hits"] + self.redis_hits + self.misses
+        hits = local["hits"] + self.redis_hits
+        return {
+            "local_hits": local["hits"],
+            "redis_hits": self.redis_hits,
+            "misses": self.misses,
+            "hit_rate": round(hits / lookups, 3) if lookups else 0.0,
+            "size": local["size"],
+        }
+
+    def _decode(self, value: str, tier: str) -> dict[str, Any] | None:
+        """Decode a cached result and tag the tier it came from."""
+        try:
+            analysis = decode(value)
+        except CodecError as e:
+            self.logger.warning(f"Discarding undecodable cached analysis: {e}")
+            return None
+        if not isinstance(analysis, dict):
+            return None
+        analysis["cache"] = tier
+        return analysis
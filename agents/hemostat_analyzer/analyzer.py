@@ -6,13 +6,42 @@ Claude/GPT-4, distinguishes real issues from false alarms, calculates confidence
 and publishes remediation recommendations or false alarm notifications.
 """
 
+import contextvars
+import itertools
 import json
 import os
 import re
-import time
+import threading
+from datetime import UTC, datetime
 from typing import Any
 
+import redis
+
 from agents.agent_base import HemoStatAgent
+from agents.codec import CodecError, decode, encode
+from agents.dispatch import Dispatcher
+from agents.hemostat_analyzer.analysis_cache import AnalysisCache, alert_fingerprint
+from agents.hemostat_analyzer.batcher import AlertBatcher, PendingAlert, estimate_tokens
+from agents.hemostat_analyzer.coalescer import AlertCoalescer
+from agents.hemostat_analyzer.rate_limit import TokenBucketLimiter, provider_for_model
+from agents.tracing import continue_from
+
+# Fields every AI verdict must carry
+AI_RESULT_FIELDS = ("root_cause", "action", "reason", "confidence", "is_false_alarm")
+
+SYSTEM_PROMPT = "You are an expert DevOps engineer analyzing container health issues."
+
+# Response tokens reserved per analyzed alert when charging the rate limiter
+RESPONSE_TOKENS_PER_ALERT = 150
+
+# Alert history: a capped Redis list per container, newest entry first
+HISTORY_KEY_PREFIX = "hemostat:alert_history:"
+
+# Entries read back for pattern detection (_detect_metric_trend looks at the last 5)
+HISTORY_WINDOW = 5
+
+# Metrics kept in history entries
+HISTORY_METRICS = ("cpu_percent", "memory_percent")
 
 
 class HealthAnalyzer(HemoStatAgent):
@@ -46,6 +75,62 @@ class HealthAnalyzer(HemoStatAgent):
         # Initialize LLM (skip if AI is disabled)
         self.llm = None if not self.ai_enabled else self._initialize_llm()
 
+        # AI result cache
+        # ANALYZER_CACHE_TTL: seconds an AI verdict is reused for alerts with the same
+        # fingerprint (0 = off); ANALYZER_CACHE_SIZE: verdicts kept in process in front of
+        # Redis; ANALYZER_CACHE_METRIC_BUCKET: width of the metric buckets in the fingerprint
+        cache_ttl = int(os.getenv("ANALYZER_CACHE_TTL", 300))
+        self.cache_metric_bucket = float(os.getenv("ANALYZER_CACHE_METRIC_BUCKET", 10))
+        self.analysis_cache: AnalysisCache | None = None
+        if self.llm is not None and cache_ttl > 0:
+            self.analysis_cache = AnalysisCache(
+                self.redis,
+                ttl=cache_ttl,
+                max_entries=int(os.getenv("ANALYZER_CACHE_SIZE", 256)),
+                agent_name=self.agent_name,
+            )
+
+        # Alert coalescing
+        # At most one analysis per container runs at a time; alerts arriving meanwhile are
+        # merged into the latest one. ANALYZER_REPEAT_WINDOW: seconds within which a repeat
+        # of a container's last alert is dropped (0 = analyze every repeat)
+        self.coalescer = AlertCoalescer(float(os.getenv("ANALYZER_REPEAT_WINDOW", 60)))
+
+        # Concurrent LLM calls
+        # ANALYZER_LLM_CONCURRENCY: LLM calls in flight at once (0 = call on the thread that
+        # handles the alert); ANALYZER_LLM_QUEUE_SIZE: analyses waiting for a call slot
+        # before alert handling blocks. Calls are paced by the RPM/TPM limits of the
+        # provider (<PROVIDER>_RPM_LIMIT, <PROVIDER>_TPM_LIMIT, see rate_limit.py)
+        self.rate_limiter = TokenBucketLimiter.for_provider(provider_for_model(self.ai_model))
+        self.llm_pool: Dispatcher | None = None
+        llm_concurrency = int(os.getenv("ANALYZER_LLM_CONCURRENCY", 4))
+        if self.llm is not None and llm_concurrency > 0:
+            self.llm_pool = Dispatcher(
+                f"{self.agent_name}-llm",
+                workers=llm_concurrency,
+                queue_size=int(os.getenv("ANALYZER_LLM_QUEUE_SIZE", 100)),
+            )
+        self._batch_seq = itertools.count()
+        # Containers whose completion is being drained on the current thread (see
+        # _analysis_done)
+        self._draining = threading.local()
+
+        # AI batching
+        # ANALYZER_BATCH_WINDOW: seconds an alert waits for others to share one LLM call
+        # (0 = analyze every alert on its own); ANALYZER_BATCH_SIZE: maximum alerts per call;
+        # ANALYZER_BATCH_MAX_TOKENS: estimated prompt token budget of a batch
+        batch_window = float(os.getenv("ANALYZER_BATCH_WINDOW", 0.5))
+        batch_size = int(os.getenv("ANALYZER_BATCH_SIZE", 10))
+        self.batcher: AlertBatcher | None = None
+        if self.llm is not None and batch_window > 0 and batch_size > 1:
+            self.batcher = AlertBatcher(
+                self._analyze_batch,
+                window=batch_window,
+                max_size=batch_size,
+                max_tokens=int(os.getenv("ANALYZER_BATCH_MAX_TOKENS", 4000)),
+                agent_name=self.agent_name,
+            )
+
         # Subscribe to health alerts
         self.subscribe_to_channel("hemostat:health_alert", self._handle_health_alert)
 
@@ -137,6 +222,20 @@ class HealthAnalyzer(HemoStatAgent):
         except Exception as e:
             self.logger.error(f"Error in listening loop: {e}", exc_info=True)
 
+    def stop(self) -> None:
+        """
+        Finish the analyses still queued or waiting for a batch, then shut down the agent.
+        """
+        if self.batcher is not None:
+            self.batcher.close()
+            self.logger.info(f"Alert batcher stopped: {self.batcher.stats()}")
+        if self.llm_pool is not None:
+            self.llm_pool.shutdown(timeout=30.0)
+            self.logger.info(f"LLM call pool stopped: {self.llm_pool.stats()}")
+        self.rate_limiter.close()
+        self.logger.info(f"Alert coalescing stopped: {self.coalescer.stats()}")
+        super().stop()
+
     def _handle_health_alert(self, message: dict[str, Any]) -> None:
         """
         Callback invoked when a health alert is received from Monitor Agent.
@@ -154,13 +253,20 @@ class HealthAnalyzer(HemoStatAgent):
                 extra={"agent": self.agent_name},
             )
 
+            # Skip repeats and alerts for containers already being analyzed
+            if not self.coalescer.admit(container_name, alert_data, message):
+                self.logger.debug(f"Coalesced health alert for {container_name}")
+                return
+
             # Perform analysis
-            self._analyze_health_issue(alert_data)
+            self._analyze_health_issue(alert_data, message.get("timestamp"))
 
         except Exception as e:
             self.logger.error(f"Error handling health alert: {e}", exc_info=True)
 
-    def _analyze_health_issue(self, alert_data: dict[str, Any]) -> None:
+    def _analyze_health_issue(
+        self, alert_data: dict[str, Any], alert_time: str | None = None
+    ) -> None:
         """
         Main analysis orchestration method.
 
@@ -169,78 +275,411 @@ class HealthAnalyzer(HemoStatAgent):
 
         Args:
             alert_data: Health alert data from Monitor Agent
+            alert_time: Timestamp of the alert's event envelope (ISO 8601)
         """
         container_name = alert_data.get("container_name", "unknown")
+        queued = False
 
         try:
             # Retrieve historical context
-            history = self.get_shared_state(f"alert_history:{container_name}")
-            history_list = history.get("alerts", []) if history else []
+            history_list = self._load_alert_history(container_name)
 
-            # Attempt AI analysis if LLM is available
+            # Attempt AI analysis if LLM is available: reuse a cached verdict, or queue the
+            # alert for a batched or single LLM call
             analysis = None
             if self.llm:
-                analysis = self._ai_analyze(alert_data, history_list)
+                fingerprint = self._alert_fingerprint(alert_data, history_list)
+                analysis = self._cached_analysis(fingerprint, container_name)
+                if analysis is None:
+                    self._queue_ai_analysis(alert_data, history_list, fingerprint, alert_time)
+                    queued = True
+                    return
 
-            # Fall back to rule-based if AI failed or not available
-            if analysis is None:
-                analysis = self._rule_based_analyze(alert_data, history_list)
+            self._route_analysis(alert_data, history_list, analysis, alert_time)
 
-            # Update alert history
-            self._update_alert_history(container_name, alert_data)
+        except Exception as e:
+            self.logger.error(
+                f"Error analyzing health issue for {container_name}: {e}", exc_info=True
+            )
+        finally:
+            # Queued AI analyses complete the container when their verdict is published
+            if not queued:
+                self._analysis_done(container_name)
 
-            # Route to appropriate channel based on confidence and action
-            if analysis.get("is_false_alarm"):
-                self._publish_false_alarm(alert_data, analysis)
-            elif analysis.get("confidence", 0) >= self.confidence_threshold:
-                # Guard: only publish remediation if action is actionable (not "none")
-                if analysis.get("action") != "none":
-                    self._publish_remediation_needed(alert_data, analysis)
-                else:
-                    # Action is "none" even with high confidence; treat as false alarm
-                    self._publish_false_alarm(alert_data, analysis)
+    def _analysis_done(self, container_name: str) -> None:
+        """
+        Complete a container's analysis and analyze the latest alert that arrived meanwhile.
+
+        Follow-up analyses that finish on the same thread (inline LLM calls) are completed
+        by the outermost call in a loop rather than by recursion, so a container that keeps
+        alerting does not grow the stack.
+
+        Args:
+            container_name: Container whose analysis finished
+        """
+        pending = getattr(self._draining, "containers", None)
+        if pending is not None:
+            pending.append(container_name)
+            return
+
+        self._draining.containers = pending = [container_name]
+        try:
+            while pending:
+                name = pending.pop()
+                message = self.coalescer.done(name)
+                if message is not None:
+                    self.logger.info(f"Analyzing latest coalesced health alert for {name}")
+                    with continue_from(message):
+                        self._analyze_health_issue(
+                            message.get("data", {}), message.get("timestamp")
+                        )
+        finally:
+            self._draining.containers = None
+
+    def _route_analysis(
+        self,
+        alert_data: dict[str, Any],
+        history: list[dict],
+        analysis: dict[str, Any] | None,
+        alert_time: str | None = None,
+    ) -> None:
+        """
+        Complete the analysis of an alert and publish the verdict.
+
+        Args:
+            alert_data: Health alert data from Monitor Agent
+            history: List of historical alerts for pattern detection
+            analysis: AI analysis result, or None to use rule-based analysis
+            alert_time: Timestamp of the alert's event envelope (ISO 8601)
+        """
+        container_name = alert_data.get("container_name", "unknown")
+
+        # Fall back to rule-based if AI failed or not available
+        if analysis is None:
+            analysis = self._rule_based_analyze(alert_data, history)
+
+        # Update alert history
+        self._update_alert_history(container_name, alert_data, alert_time)
+
+        # Route to appropriate channel based on confidence and action
+        if analysis.get("is_false_alarm"):
+            self._publish_false_alarm(alert_data, analysis)
+        elif analysis.get("confidence", 0) >= self.confidence_threshold:
+            # Guard: only publish remediation if action is actionable (not "none")
+            if analysis.get("action") != "none":
+                self._publish_remediation_needed(alert_data, analysis)
             else:
+                # Action is "none" even with high confidence; treat as false alarm
                 self._publish_false_alarm(alert_data, analysis)
+        else:
+            self._publish_false_alarm(alert_data, analysis)
+
+    def runtime_stats(self) -> dict[str, Any]:
+        """
+        Report runtime statistics, including alert coalescing, the LLM call queue and
+        result cache lookups.
+
+        Returns:
+            Base agent statistics plus queues.coalesce (in_flight, waiting containers),
+            queues.llm (queued, running, rate_limited) and caches.analysis (local_hit,
+            redis_hit, miss counts)
+        """
+        stats = super().runtime_stats()
+        coalescer = self.coalescer.stats()
+        stats["queues"] = {
+            "coalesce": {"in_flight": coalescer["in_flight"], "waiting": coalescer["waiting"]}
+        }
+        if self.llm_pool is not None:
+            pool = self.llm_pool.stats()
+            stats["queues"]["llm"] = {
+                "queued": pool["queued"],
+                "running": pool["running"],
+                "rate_limited": self.rate_limiter.stats()["waiting"],
+            }
+        if self.analysis_cache is not None:
+            cache_stats = self.analysis_cache.stats()
+            stats["caches"] = {
+                "analysis": {
+                    "local_hit": cache_stats["local_hits"],
+                    "redis_hit": cache_stats["redis_hits"],
+                    "miss": cache_stats["misses"],
+                }
+            }
+        return stats
+
+    def _alert_fingerprint(self, alert_data: dict[str, Any], history: list[dict]) -> str | None:
+        """
+        Compute the result cache fingerprint of an alert.
+
+        Args:
+            alert_data: Current health alert data
+            history: List of historical alerts for pattern detection
+
+        Returns:
+            Fingerprint, or None if the result cache is disabled
+        """
+        if self.analysis_cache is None:
+            return None
+        trends = {
+            metric: self._detect_metric_trend(history, metric)
+            for metric in ("cpu_percent", "memory_percent")
+        }
+        return alert_fingerprint(alert_data, trends, self.cache_metric_bucket)
+
+    def _cached_analysis(self, fingerprint: str | None, container_name: str) -> dict | None:
+        """
+        Reuse the AI verdict of an equivalent recent alert.
+
+        Args:
+            fingerprint: Alert fingerprint (None if the cache is disabled)
+            container_name: Name of the container (for logging)
+
+        Returns:
+            Cached analysis dict, or None on a miss
+        """
+        if self.analysis_cache is None or fingerprint is None:
+            return None
+        analysis = self.analysis_cache.get(fingerprint)
+        if analysis is not None:
+            self.logger.info(
+                f"Reusing cached AI analysis for {container_name} ({analysis['cache']}): "
+                f"action={analysis.get('action')}, hit rate "
+                f"{self.analysis_cache.stats()['hit_rate']:.0%}"
+            )
+        return analysis
 
+    def _cache_analysis(self, fingerprint: str | None, analysis: dict[str, Any] | None) -> None:
+        """
+        Store a successful AI verdict in the result cache.
+
+        Args:
+            fingerprint: Alert fingerprint (None if the cache is disabled)
+            analysis: AI analysis result, or None if AI analysis failed
+        """
+        if self.analysis_cache is not None and fingerprint is not None and analysis is not None:
+            self.analysis_cache.put(fingerprint, analysis)
+
+    def _queue_ai_analysis(
+        self,
+        alert_data: dict[str, Any],
+        history: list[dict],
+        fingerprint: str | None,
+        alert_time: str | None = None,
+    ) -> None:
+        """
+        Hand an alert to the batcher or the LLM call pool, or analyze it right away.
+
+        Args:
+            alert_data: Current health alert data
+            history: List of historical alerts for pattern detection
+            fingerprint: Result cache fingerprint (None if the cache is disabled)
+            alert_time: Timestamp of the alert's event envelope (ISO 8601)
+        """
+        if self.batcher is not None:
+            description = self._describe_alert(alert_data, history)
+            pending = PendingAlert(alert_data, history, description, fingerprint, alert_time)
+            if self.batcher.submit(pending):
+                return
+
+        # Follow-up analyses started by a finished one already hold an LLM pool worker;
+        # resubmitting from there could block on the pool's own full queue
+        args = (alert_data, history, fingerprint, None, alert_time)
+        if self.llm_pool is None or self.llm_pool.in_worker():
+            self._complete_ai_analysis(*args)
+            return
+
+        # Analyses run in the context (trace) of the message they answer
+        context = contextvars.copy_context()
+        container_name = alert_data.get("container_name", "unknown")
+        if not self.llm_pool.submit(container_name, context.run, self._complete_ai_analysis, *args):
+            self._complete_ai_analysis(*args)
+
+    def _analyze_batch(self, batch: list[PendingAlert]) -> None:
+        """
+        Queue a batch collected by the batcher for an LLM call.
+
+        Args:
+            batch: Alerts collected by the batcher
+        """
+        if self.llm_pool is None or not self.llm_pool.submit(
+            ("batch", next(self._batch_seq)), self._run_batch, batch
+        ):
+            self._run_batch(batch)
+
+    def _run_batch(self, batch: list[PendingAlert]) -> None:
+        """
+        Analyze a batch of alerts with one LLM call and publish each verdict.
+
+        Alerts without a usable verdict in the batch response are analyzed on their own.
+        Each alert is completed in the context (trace) of the message it came from.
+
+        Args:
+            batch: Alerts collected by the batcher
+        """
+        verdicts = self._ai_analyze_batch(batch) if len(batch) > 1 else {}
+        for index, pending in enumerate(batch):
+            pending.context.run(
+                self._complete_ai_analysis,
+                pending.alert_data,
+                pending.history,
+                pending.fingerprint,
+                verdicts.get(index),
+                pending.alert_time,
+            )
+
+    def _complete_ai_analysis(
+        self,
+        alert_data: dict[str, Any],
+        history: list[dict],
+        fingerprint: str | None,
+        analysis: dict[str, Any] | None = None,
+        alert_time: str | None = None,
+    ) -> None:
+        """
+        Publish the AI verdict of an alert, analyzing it alone if no verdict is given.
+
+        Args:
+            alert_data: Current health alert data
+            history: List of historical alerts for pattern detection
+            fingerprint: Result cache fingerprint (None if the cache is disabled)
+            analysis: Verdict from a batch response, or None
+            alert_time: Timestamp of the alert's event envelope (ISO 8601)
+        """
+        container_name = alert_data.get("container_name", "unknown")
+        try:
+            if analysis is None:
+                analysis = self._ai_analyze(alert_data, history)
+            self._cache_analysis(fingerprint, analysis)
+            self._route_analysis(alert_data, history, analysis, alert_time)
         except Exception as e:
             self.logger.error(
                 f"Error analyzing health issue for {container_name}: {e}", exc_info=True
             )
+        finally:
+            self._analysis_done(container_name)
 
-    def _ai_analyze(self, alert_data: dict[str, Any], history: list[dict]) -> dict[str, Any] | None:
+    def _ai_analyze_batch(self, batch: list[PendingAlert]) -> dict[int, dict[str, Any]]:
         """
-        Perform AI-powered analysis using LangChain.
+        Analyze several alerts with one LLM call.
 
         Args:
-            alert_data: Current health alert data
-            history: List of historical alerts for pattern detection
+            batch: Alerts to analyze
 
         Returns:
-            Analysis dict with keys: action, reason, confidence, is_false_alarm, analysis_method
-            Returns None if AI analysis fails (triggers fallback)
+            Verdicts by position in the batch; alerts whose verdict is missing or invalid
+            are left out (an unparsable response yields an empty dict)
         """
+        sections = "\n\n".join(
+            f"### Alert {index}\n{pending.description}" for index, pending in enumerate(batch)
+        )
+        prompt_text = f"""{SYSTEM_PROMPT}
+Analyze each of the following {len(batch)} alerts independently.
+
+{sections}
+
+Respond with valid JSON only, no code fences or commentary. Provide a JSON array with one object per alert, in this format:
+[
+  {{
+    "id": <alert number>,
+    "root_cause": "Brief description of the root cause",
+    "action": "restart|scale_up|cleanup|none",
+    "reason": "Explanation for the recommended action",
+    "confidence": 0.0-1.0,
+    "is_false_alarm": true|false
+  }}
+]
+
+Be concise and focus on actionable insights."""
+
         try:
-            from langchain_core.messages import HumanMessage, SystemMessage
+            response_text = self._invoke_llm(prompt_text, RESPONSE_TOKENS_PER_ALERT * len(batch))
+            if response_text is None:
+                return {}
+            verdicts = json.loads(self._extract_json(response_text, "[", "]"))
+        except json.JSONDecodeError as e:
+            self.logger.warning(
+                f"Failed to parse AI batch response for {len(batch)} alerts: {e}; "
+                "analyzing them one by one"
+            )
+            return {}
+        except Exception as e:
+            self.logger.error(f"AI batch analysis error: {e}; analyzing alerts one by one")
+            return {}
+
+        results: dict[int, dict[str, Any]] = {}
+        for verdict in verdicts if isinstance(verdicts, list) else []:
+            if not isinstance(verdict, dict):
+                continue
+            index = verdict.pop("id", None)
+            if (
+                isinstance(index, int)
+                and 0 <= index < len(batch)
+                and all(field in verdict for field in AI_RESULT_FIELDS)
+            ):
+                verdict["analysis_method"] = "ai"
+                results[index] = verdict
+
+        missing = len(batch) - len(results)
+        self.logger.info(
+            f"AI batch analysis of {len(batch)} alerts returned {len(results)} verdicts"
+            + (f"; analyzing {missing} alone" if missing else "")
+        )
+        return results
 
-            container_name = alert_data.get("container_name", "unknown")
-            metrics = alert_data.get("metrics", {})
-            anomalies = alert_data.get("anomalies", [])
-            health_status = alert_data.get("health_status", "unknown")
-
-            # Build context for the prompt
-            history_summary = ""
-            if history:
-                history_summary = f"\n\nRecent alert history ({len(history)} alerts):\n"
-                for i, h in enumerate(history[-3:], 1):  # Last 3 alerts
-                    h_metrics = h.get("metrics", {})
-                    h_anomalies = h.get("anomalies", [])
-                    history_summary += f"  Alert {i}: CPU={h_metrics.get('cpu_percent', 'N/A')}%, Memory={h_metrics.get('memory_percent', 'N/A')}%, Anomalies={len(h_anomalies)}\n"
+    def _invoke_llm(self, prompt_text: str, response_tokens: int) -> str | None:
+        """
+        Send a prompt to the LLM once the rate limiter admits it.
 
-            # Build structured prompt
-            prompt_text = f"""You are an expert DevOps engineer analyzing container health issues.
+        Args:
+            prompt_text: User prompt (the system prompt is added)
+            response_tokens: Response tokens to reserve with the prompt's estimated tokens
+
+        Returns:
+            Response text, or None if the LLM is not initialized or the agent is stopping
+        """
+        from langchain_core.messages import HumanMessage, SystemMessage
 
-Container: {container_name}
-Health Status: {health_status}
+        if not self.llm:
+            self.logger.error("LLM not initialized")
+            return None
+
+        if not self.rate_limiter.acquire(estimate_tokens(prompt_text) + response_tokens):
+            self.logger.warning("LLM call not admitted: rate limiter closed")
+            return None
+
+        response = self.llm.invoke(
+            [SystemMessage(content=SYSTEM_PROMPT), HumanMessage(content=prompt_text)]
+        )
+        # Chat models return a message; text completion endpoints (Hugging Face) a string
+        return getattr(response, "content", response)
+
+    def _describe_alert(self, alert_data: dict[str, Any], history: list[dict]) -> str:
+        """
+        Describe an alert and its recent history for an LLM prompt.
+
+        Args:
+            alert_data: Current health alert data
+            history: List of historical alerts for pattern detection
+
+        Returns:
+            Prompt section with container, metrics, anomalies and history summary
+        """
+        metrics = alert_data.get("metrics", {})
+        anomalies = alert_data.get("anomalies", [])
+
+        history_summary = ""
+        if history:
+            history_summary = f"\n\nRecent alert history ({len(history)} alerts):\n"
+            for i, h in enumerate(history[-3:], 1):  # Last 3 alerts
+                h_metrics = h.get("metrics", {})
+                history_summary += (
+                    f"  Alert {i}: CPU={h_metrics.get('cpu_percent', 'N/A')}%, "
+                    f"Memory={h_metrics.get('memory_percent', 'N/A')}%, "
+                    f"Anomalies={h.get('anomaly_count', 0)}\n"
+                )
+
+        return f"""Container: {alert_data.get("container_name", "unknown")}
+Health Status: {alert_data.get("health_status", "unknown")}
 
 Current Metrics:
 - CPU: {metrics.get("cpu_percent", "N/A")}%
@@ -252,7 +691,52 @@ Current Metrics:
 
 Detected Anomalies ({len(anomalies)}):
 {json.dumps(anomalies, indent=2) if anomalies else "None"}
-{history_summary}
+{history_summary}"""
+
+    @staticmethod
+    def _extract_json(response_text: str, opening: str, closing: str) -> str:
+        """
+        Strip code fences and commentary around the JSON value in an LLM response.
+
+        Args:
+            response_text: Raw response text
+            opening: Opening bracket of the expected value ("{" or "[")
+            closing: Matching closing bracket
+
+        Returns:
+            Text of the outermost JSON value, or the stripped response if none is found
+        """
+        json_str = response_text.strip()
+        # Remove markdown code fences if present
+        json_str = re.sub(r"^```(?:json)?\s*", "", json_str)
+        json_str = re.sub(r"\s*```$", "", json_str)
+
+        # Try to extract JSON from response
+        json_start = json_str.find(opening)
+        json_end = json_str.rfind(closing) + 1
+        if json_start >= 0 and json_end > json_start:
+            json_str = json_str[json_start:json_end]
+        return json_str
+
+    def _ai_analyze(self, alert_data: dict[str, Any], history: list[dict]) -> dict[str, Any] | None:
+        """
+        Perform AI-powered analysis using LangChain.
+
+        Args:
+            alert_data: Current health alert data
+            history: List of historical alerts for pattern detection
+
+        Returns:
+            Analysis dict with keys: action, reason, confidence, is_false_alarm, analysis_method
+            Returns None if AI analysis fails (triggers fallback)
+        """
+        try:
+            container_name = alert_data.get("container_name", "unknown")
+
+            # Build structured prompt
+            prompt_text = f"""{SYSTEM_PROMPT}
+
+{self._describe_alert(alert_data, history)}
 
 Respond with valid JSON only, no code fences or commentary. Provide your analysis in this format:
 {{
@@ -265,50 +749,19 @@ Respond with valid JSON only, no code fences or commentary. Provide your analysi
 
 Be concise and focus on actionable insights."""
 
-            # Invoke LLM with retry logic
+            # Invoke LLM with retry logic; retries are paced by the rate limiter
             max_retries = 3
             for attempt in range(max_retries):
                 try:
-                    messages = [
-                        SystemMessage(
-                            content="You are an expert DevOps engineer analyzing container health issues."
-                        ),
-                        HumanMessage(content=prompt_text),
-                    ]
-
-                    if not self.llm:
-                        self.logger.error("LLM not initialized")
+                    response_text = self._invoke_llm(prompt_text, RESPONSE_TOKENS_PER_ALERT)
+                    if response_text is None:
                         return None
 
-                    response = self.llm.invoke(messages)
-                    response_text = response.content
-
                     # Parse JSON response - strip code fences first
-                    json_str = response_text.strip()
-                    # Remove markdown code fences if present
-                    json_str = re.sub(r"^```(?:json)?\s*", "", json_str)
-                    json_str = re.sub(r"\s*```$", "", json_str)
-
-                    # Try to extract JSON from response
-                    json_start = json_str.find("{")
-                    json_end = json_str.rfind("}") + 1
-                    if json_start >= 0 and json_end > json_start:
-                        json_str = json_str[json_start:json_end]
-
-                    # Parse JSON
-                    analysis_result = json.loads(json_str)
+                    analysis_result = json.loads(self._extract_json(response_text, "{", "}"))
 
                     # Validate required fields
-                    if all(
-                        k in analysis_result
-                        for k in [
-                            "root_cause",
-                            "action",
-                            "reason",
-                            "confidence",
-                            "is_false_alarm",
-                        ]
-                    ):
+                    if all(k in analysis_result for k in AI_RESULT_FIELDS):
                         analysis_result["analysis_method"] = "ai"
                         self.logger.info(
                             f"AI analysis successful for {container_name}: "
@@ -324,9 +777,6 @@ Be concise and focus on actionable insights."""
                     self.logger.warning(
                         f"Failed to parse AI response (attempt {attempt + 1}/{max_retries}): {e}"
                     )
-                    if attempt < max_retries - 1:
-                        # Sleep between retries for non-JSON formats
-                        time.sleep(0.5 * (2**attempt))
                     continue
 
             self.logger.warning(
@@ -541,31 +991,67 @@ Be concise and focus on actionable insights."""
             extra={"agent": self.agent_name},
         )
 
-    def _update_alert_history(self, container_name: str, alert_data: dict[str, Any]) -> None:
+    def _load_alert_history(self, container_name: str) -> list[dict]:
         """
-        Update alert history in Redis for pattern detection.
+        Read the recent alert history of a container for pattern detection.
+
+        Only the window used by trend detection is fetched, not the whole history.
 
         Args:
             container_name: Name of the container
-            alert_data: Current alert data to append to history
+
+        Returns:
+            Up to HISTORY_WINDOW compact history entries, oldest first
         """
+        count = min(HISTORY_WINDOW, self.history_size)
         try:
-            # Retrieve existing history
-            history_key = f"alert_history:{container_name}"
-            existing = self.get_shared_state(history_key)
-            alerts = existing.get("alerts", []) if existing else []
+            values = self.redis.lrange(f"{HISTORY_KEY_PREFIX}{container_name}", 0, count - 1)
+        except redis.RedisError as e:
+            self.logger.warning(f"Error reading alert history for {container_name}: {e}")
+            return []
+
+        history = []
+        for value in reversed(values):
+            try:
+                entry = decode(value)
+            except CodecError as e:
+                self.logger.debug(f"Skipping undecodable history entry for {container_name}: {e}")
+                continue
+            if isinstance(entry, dict):
+                history.append(entry)
+        return history
+
+    def _update_alert_history(
+        self, container_name: str, alert_data: dict[str, Any], alert_time: str | None = None
+    ) -> None:
+        """
+        Append an alert to the container's history in Redis for pattern detection.
 
-            # Append current alert
-            alerts.append(alert_data)
+        The history is a list capped at ANALYZER_HISTORY_SIZE compact entries (timestamp,
+        CPU and memory, anomaly count). Push, trim and expiry go out in one round trip;
+        each command is atomic, so concurrent analyzers never lose each other's entries.
 
-            # Keep only last N alerts
-            alerts = alerts[-self.history_size :]
+        Args:
+            container_name: Name of the container
+            alert_data: Current alert data to append to history
+            alert_time: Timestamp of the alert's event envelope (default: now)
+        """
+        metrics = alert_data.get("metrics") or {}
+        entry = {
+            "timestamp": alert_time or datetime.now(UTC).isoformat(),
+            "metrics": {name: metrics[name] for name in HISTORY_METRICS if name in metrics},
+            "anomaly_count": len(alert_data.get("anomalies") or []),
+        }
+        history_key = f"{HISTORY_KEY_PREFIX}{container_name}"
 
-            # Store updated history
-            history_data = {"alerts": alerts, "container": container_name}
-            self.set_shared_state(history_key, history_data, ttl=self.history_ttl)
+        try:
+            pipe = self.redis.pipeline(transaction=False)
+            pipe.lpush(history_key, encode(entry))
+            pipe.ltrim(history_key, 0, self.history_size - 1)
+            pipe.expire(history_key, self.history_ttl)
+            pipe.execute()
 
-            self.logger.debug(f"Updated alert history for {container_name} ({len(alerts)} alerts)")
+            self.logger.debug(f"Updated alert history for {container_name}")
 
         except Exception as e:
             self.logger.error(f"Error updating alert history for {container_name}: {e}")
@@ -0,0 +1,195 @@
+"""
+HemoStat Analyzer Alert Batcher
+
+When a host degrades, many containers alert within the same second. Instead of one LLM
+round trip per alert, alerts that miss the result cache are collected for a short window
+and analyzed with one prompt. A batch is flushed when the window of its oldest alert has
+passed, when it holds the maximum number of alerts, or when adding the next alert would
+exceed the prompt token budget.
+
+Batches are flushed one at a time on a dedicated thread. Each alert carries the context
+(trace) of the message it came from, so events published for it continue that trace.
+"""
+
+import contextvars
+import threading
+import time
+from collections import deque
+from collections.abc import Callable
+from typing import Any
+
+from agents.logger import HemoStatLogger
+
+
+def estimate_tokens(text: str) -> int:
+    """
+    Rough token count of prompt text (about four characters per token).
+
+    Args:
+        text: Prompt text
+
+    Returns:
+        Estimated number of tokens
+    """
+    return len(text) // 4 + 1
+
+
+class PendingAlert:
+    """An alert waiting for batched AI analysis."""
+
+    __slots__ = (
+        "alert_data",
+        "alert_time",
+        "context",
+        "description",
+        "fingerprint",
+        "history",
+        "queued_at",
+    )
+
+    def __init__(
+        self,
+        alert_data: dict[str, Any],
+        history: list[dict],
+        description: str,
+        fingerprint: str | None,
+        alert_time: str | None = None,
+    ):
+        self.alert_data = alert_data
+        self.history = history
+        self.description = description
+        self.fingerprint = fingerprint
+        self.alert_time = alert_time
+        self.context = contextvars.copy_context()
+        self.queued_at = time.monotonic()
+
+
+class AlertBatcher:
+    """
+    Collects alerts into batches bounded by time, count and token budget.
+    """
+
+    def __init__(
+        self,
+        flush: Callable[[list[PendingAlert]], None],
+        window: float,
+        max_size: int,
+        max_tokens: int,
+        agent_name: str = "analyzer",
+    ):
+        """
+        Initialize the batcher and start its flush thread.
+
+        Args:
+            flush: Called on the flush thread with each batch (never empty)
+            window: Seconds an alert waits for others to join its batch
+            max_size: Maximum alerts per batch
+            max_tokens: Prompt token budget of a batch (a single larger alert is still
+                flushed on its own)
+            agent_name: Agent name (used for the logger and thread name)
+        """
+        self.logger = HemoStatLogger.get_logger(agent_name)
+        self.flush = flush
+        self.window = window
+        self.max_size = max(1, max_size)
+        self.max_tokens = max_tokens
+
+        self._cond = threading.Condition()
+        self._pending: deque[tuple[PendingAlert, int]] = deque()
+        self._pending_tokens = 0
+        self._closed = False
+
+        self.batches = 0
+        self.batched_alerts = 0
+
+        self._thread = threading.Thread(target=self._run, name=f"{agent_name}-batcher", daemon=True)
+        self._thread.start()
+
+    def submit(self, alert: PendingAlert) -> bool:
+        """
+        Queue an alert for the next batch.
+
+        Args:
+            alert: Alert with its prompt description
+
+        Returns:
+            True if queued, False if the batcher is closed
+        """
+        tokens = estimate_tokens(alert.description)
+        with self._cond:
+            if self._closed:
+                return False
+            self._pending.append((alert, tokens))
+            self._pending_tokens += tokens
+            self._cond.notify_all()
+        return True
+
+    def stats(self) -> dict[str, Any]:
+        """
+        Batching statistics.
+
+        Returns:
+            Dictionary with pending, batches, batched_alerts and average batch size
+        """
+        with self._cond:
+            return {
+                "pending": len(self._pending),
+                "batches": self.batches,
+                "batched_alerts": self.batched_alerts,
+                "avg_batch_size": (
+                    round(self.batched_alerts / self.batches, 2) if self.batches else 0.0
+                ),
+            }
+
+    def close(self, timeout: float = 30.0) -> None:
+        """
+        Stop accepting alerts and flush what is pending.
+
+        Args:
+            timeout: Maximum seconds to wait for the pending batches
+        """
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+        self._thread.join(timeout=timeout)
+
+    def _full_locked(self) -> bool:
+        """Whether the pending alerts fill a batch. Caller holds the lock."""
+        return len(self._pending) >= self.max_size or self._pending_tokens >= self.max_tokens
+
+    def _take_batch_locked(self) -> list[PendingAlert]:
+        """Remove the next batch from the pending alerts. Caller holds the lock."""
+        batch: list[PendingAlert] = []
+        tokens = 0
+        while self._pending and len(batch) < self.max_size:
+            alert, alert_tokens = self._pending[0]
+            if batch and tokens + alert_tokens > self.max_tokens:
+                break
+            self._pending.popleft()
+            self._pending_tokens -= alert_tokens
+            tokens += alert_tokens
+            batch.append(alert)
+        self.batches += 1
+        self.batched_alerts += len(batch)
+        return batch
+
+    def _run(self) -> None:
+        """Wait for each batch to fill or its window to pass, then flush it."""
+        while True:
+            with self._cond:
+                while not self._pending and not self._closed:
+                    self._cond.wait()
+                if not self._pending:
+                    return
+                deadline = self._pending[0][0].queued_at + self.window
+                while not self._closed and not self._full_locked():
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    self._cond.wait(remaining)
+                batch = self._take_batch_locked()
+
+            try:
+                self.flush(batch)
+            except Exception as e:
+                self.logger.error(f"Error flushing alert batch: {e!s}", exc_info=True)
@@ -0,0 +1,163 @@
+"""
+HemoStat Analyzer Alert Coalescing
+
+The Monitor republishes an alert for a container on every poll while a problem lasts.
+Before analysis, alerts pass through a per-container coalescing stage so analysis work
+follows distinct incidents rather than poll frequency:
+
+- debouncing:  an alert reporting the same incident as the last one seen for its
+               container (ignoring drifting metrics) within the repeat window is dropped
+- coalescing:  at most one analysis per container is in flight; alerts arriving meanwhile
+               replace each other, and only the latest is analyzed once the running
+               analysis completes
+"""
+
+import hashlib
+import json
+import threading
+import time
+from typing import Any
+
+# Containers remembered for debouncing before expired entries are pruned
+MAX_TRACKED_CONTAINERS = 1024
+
+
+def alert_signature(alert_data: dict[str, Any]) -> str:
+    """
+    Identify an alert by the incident it reports.
+
+    Only stable fields count: the container, its anomalies (type and severity), health
+    status, exit code and restart count. Metric values and timestamps drift on every poll
+    while a problem lasts, so they are left out.
+
+    Args:
+        alert_data: Health alert data from the Monitor
+
+    Returns:
+        Hex digest equal for repeats of an alert
+    """
+    anomalies = sorted(
+        {
+            (str(anomaly.get("type")), str(anomaly.get("severity")))
+            for anomaly in alert_data.get("anomalies") or []
+            if isinstance(anomaly, dict)
+        }
+    )
+    content = {
+        "container": alert_data.get("container_name"),
+        "anomalies": anomalies,
+        "health_status": alert_data.get("health_status"),
+        "exit_code": alert_data.get("exit_code"),
+        "restart_count": alert_data.get("restart_count"),
+    }
+    encoded = json.dumps(content, sort_keys=True, default=str).encode()
+    return hashlib.sha256(encoded).hexdigest()
+
+
+class AlertCoalescer:
+    """
+    Tracks in-flight analyses and the latest waiting alert per container.
+    """
+
+    def __init__(self, repeat_window: float):
+        """
+        Initialize the coalescer.
+
+        Args:
+            repeat_window: Seconds within which a repeat of a container's last alert is
+                dropped (0 = never drop)
+        """
+        self.repeat_window = repeat_window
+
+        self._lock = threading.Lock()
+        self._last_seen: dict[str, tuple[str, float]] = {}
+        self._in_flight: set[str] = set()
+        self._waiting: dict[str, dict[str, Any]] = {}
+
+        self.admitted = 0
+        self.repeats = 0
+        self.merged = 0
+
+    def admit(self, container: str, alert_data: dict[str, Any], message: dict[str, Any]) -> bool:
+        """
+        Decide whether an alert is analyzed now.
+
+        Args:
+            container: Container the alert is about
+            alert_data: Health alert data
+            message: Event envelope of the alert, kept while it waits
+
+        Returns:
+            True if the caller should analyze it now; False if it was dropped as a repeat
+            or is waiting for the container's running analysis (call done() afterwards)
+        """
+        now = time.monotonic()
+        signature = alert_signature(alert_data) if self.repeat_window > 0 else ""
+
+        with self._lock:
+            if self.repeat_window > 0:
+                last = self._last_seen.get(container)
+                # The window is not extended by repeats, so a lasting problem is
+                # re-analyzed once per window
+                if last is not None and last[0] == signature and now - last[1] < self.repeat_window:
+                    self.repeats += 1
+                    return False
+                self._last_seen[container] = (signature, now)
+                if len(self._last_seen) > MAX_TRACKED_CONTAINERS:
+                    self._prune_locked(now)
+
+            if container in self._in_flight:
+                if container in self._waiting:
+                    self.merged += 1
+                self._waiting[container] = message
+                return False
+
+            self._in_flight.add(container)
+            self.admitted += 1
+            return True
+
+    def done(self, container: str) -> dict[str, Any] | None:
+        """
+        Mark a container's analysis complete.
+
+        Args:
+            container: Container whose analysis finished
+
+        Returns:
+            Envelope of the latest alert that arrived meanwhile (now in flight; analyze it
+            and call done() again), or None
+        """
+        with self._lock:
+            message = self._waiting.pop(container, None)
+            if message is None:
+                self._in_flight.discard(container)
+            else:
+                self.admitted += 1
+            return message
+
+    def stats(self) -> dict[str, Any]:
+        """
+        Coalescing statistics.
+
+        Returns:
+            Dictionary with in_flight and waiting containers, and admitted, repeats
+            (dropped) and merged (replaced while waiting) alert counts
+        """
+        with self._lock:
+            return {
+                "in_flight": len(self._in_flight),
+                "waiting": len(self._waiting),
+                "admitted": self.admitted,
+                "repeats": self.repeats,
+                "merged": self.merged,
+            }
+
+    def _prune_locked(self, now: float) -> None:
+        """Forget containers whose last alert is outside the window. Caller holds the lock."""
+        expired = [
+            container
+            for container, (_, seen) in self._last_seen.items()
+            if now - seen >= self.repeat_window
+        ]
+        for container in expired:
+            del self._last_seen[container]
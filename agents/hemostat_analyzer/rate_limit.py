@@ -0,0 +1,171 @@
+"""
+HemoStat Analyzer LLM Rate Limiting
+
+Token buckets that keep concurrent LLM calls within the requests-per-minute (RPM) and
+tokens-per-minute (TPM) limits of the configured provider. A call takes one request and
+its estimated tokens; when either bucket is short, the caller waits until enough has
+refilled instead of running into the provider's 429 responses.
+
+Limits come from <PROVIDER>_RPM_LIMIT and <PROVIDER>_TPM_LIMIT (PROVIDER is OPENAI,
+ANTHROPIC or HUGGINGFACE), defaulting to the entry tier of each provider. 0 disables a
+limit.
+"""
+
+import os
+import threading
+import time
+from typing import Any
+
+# Provider -> (requests per minute, tokens per minute)
+PROVIDER_LIMITS: dict[str, tuple[int, int]] = {
+    "openai": (500, 10000),
+    "anthropic": (50, 20000),
+    "huggingface": (60, 0),
+}
+
+
+def provider_for_model(model: str) -> str | None:
+    """
+    Name the provider that serves an AI_MODEL value, as chosen by the analyzer.
+
+    Args:
+        model: AI_MODEL value (e.g. 'gpt-4', 'claude-3-opus', 'org/model')
+
+    Returns:
+        'openai', 'anthropic', 'huggingface', or None for an unknown model
+    """
+    if model.startswith("gpt"):
+        return "openai"
+    if model.startswith("claude"):
+        return "anthropic"
+    if "/" in model:
+        return "huggingface"
+    return None
+
+
+class TokenBucketLimiter:
+    """
+    Request and token buckets refilled continuously over a one-minute period.
+    """
+
+    def __init__(self, rpm: int, tpm: int):
+        """
+        Initialize full buckets.
+
+        Args:
+            rpm: Requests per minute (0 = unlimited)
+            tpm: Tokens per minute (0 = unlimited)
+        """
+        self.rpm = max(0, rpm)
+        self.tpm = max(0, tpm)
+
+        self._cond = threading.Condition()
+        self._requests = float(self.rpm)
+        self._tokens = float(self.tpm)
+        self._updated = time.monotonic()
+        self._closed = False
+
+        self.waiting = 0
+        self.acquired = 0
+        self.wait_seconds = 0.0
+
+    @classmethod
+    def for_provider(cls, provider: str | None) -> "TokenBucketLimiter":
+        """
+        Create a limiter with the configured limits of a provider.
+
+        Args:
+            provider: Provider name from provider_for_model()
+
+        Returns:
+            Limiter (unlimited for an unknown provider)
+        """
+        if provider is None:
+            return cls(0, 0)
+        rpm, tpm = PROVIDER_LIMITS[provider]
+        prefix = provider.upper()
+        return cls(
+            int(os.getenv(f"{prefix}_RPM_LIMIT", rpm)),
+            int(os.getenv(f"{prefix}_TPM_LIMIT", tpm)),
+        )
+
+    def acquire(self, tokens: int, timeout: float | None = None) -> bool:
+        """
+        Wait until one request and the given tokens are available, then take them.
+
+        Args:
+            tokens: Estimated tokens of the call (prompt and response); capped at the TPM
+                limit so an oversized call still runs
+            timeout: Maximum seconds to wait (None = no limit)
+
+        Returns:
+            True if admitted, False on timeout or when the limiter is closed
+        """
+        if self.tpm:
+            tokens = min(tokens, self.tpm)
+        started = time.monotonic()
+        deadline = None if timeout is None else started + timeout
+
+        with self._cond:
+            self.waiting += 1
+            try:
+                while not self._closed:
+                    self._refill_locked()
+                    delay = self._delay_locked(tokens)
+                    if delay <= 0:
+                        if self.rpm:
+                            self._requests -= 1
+                        if self.tpm:
+                            self._tokens -= tokens
+                        self.acquired += 1
+                        self.wait_seconds += time.monotonic() - started
+                        return True
+                    if deadline is not None:
+                        delay = min(delay, deadline - time.monotonic())
+                        if delay <= 0:
+                            return False
+                    self._cond.wait(delay)
+                return False
+            finally:
+                self.waiting -= 1
+
+    def close(self) -> None:
+        """Release all waiting callers; later acquire() calls fail."""
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+
+    def stats(self) -> dict[str, Any]:
+        """
+        Limiter statistics.
+
+        Returns:
+            Dictionary with limits, waiting callers, admitted calls and total wait time
+        """
+        with self._cond:
+            return {
+                "rpm": self.rpm,
+                "tpm": self.tpm,
+                "waiting": self.waiting,
+                "acquired": self.acquired,
+                "wait_seconds": round(self.wait_seconds, 3),
+            }
+
+    def _refill_locked(self) -> None:
+        """Add what the buckets earned since the last refill. Caller holds the lock."""
+        now = time.monotonic()
+        elapsed = now - self._updated
+        self._updated = now
+        if self.rpm:
+            self._requests = min(self.rpm, self._requests + elapsed * self.rpm / 60)
+        if self.tpm:
+            self._tokens = min(self.tpm, self._tokens + elapsed * self.tpm / 60)
+
+    def _delay_locked(self, tokens: int) -> float:
+        """Seconds until a call of this size fits in both buckets. Caller holds the lock."""
+        delay = 0.0
+        if self.rpm and self._requests < 1:
+            delay = (1 - self._requests) * 60 / self.rpm
+        if self.tpm and self._tokens < tokens:
+            delay = max(delay, (tokens - self._tokens) * 60 / self.tpm)
+        return delay
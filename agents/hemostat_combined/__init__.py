@@ -0,0 +1,9 @@
+"""
+HemoStat Combined Runner Package
+
+Provides the CombinedRunner class hosting several agents in one process.
+"""
+
+from agents.hemostat_combined.combined import CombinedRunner
+
+__all__ = ["CombinedRunner"]
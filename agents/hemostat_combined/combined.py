@@ -0,0 +1,142 @@
+"""
+HemoStat Combined Runner
+
+Hosts several agents in one process for small and edge deployments. The agents share one
+Redis command pool and one pub/sub pool, and pub/sub events between co-located agents are
+delivered in memory (see agents.local_bus). Agents running elsewhere keep receiving every
+event through Redis, and events they publish reach the hosted agents the usual way.
+
+Only the selected agents' modules are imported, so hosting Monitor and Responder does not
+load LangChain.
+"""
+
+import importlib
+import os
+import signal
+import threading
+from typing import Any
+
+from agents.agent_base import HemoStatAgent
+from agents.local_bus import LocalBus, install_bus
+from agents.logger import HemoStatLogger
+
+# Agent name -> (module, class)
+AGENTS: dict[str, tuple[str, str]] = {
+    "monitor": ("agents.hemostat_monitor", "ContainerMonitor"),
+    "analyzer": ("agents.hemostat_analyzer", "HealthAnalyzer"),
+    "responder": ("agents.hemostat_responder", "ContainerResponder"),
+    "alert": ("agents.hemostat_alert", "AlertNotifier"),
+    "metrics": ("agents.hemostat_metrics", "MetricsExporter"),
+}
+
+DEFAULT_AGENTS = "monitor,analyzer,responder,alert"
+
+
+class CombinedRunner:
+    """
+    Runs a subset of HemoStat agents in one process, each on its own thread.
+    """
+
+    def __init__(self, agent_names: list[str] | None = None):
+        """
+        Initialize the runner. No agent is created until start().
+
+        Args:
+            agent_names: Agents to host (defaults to env HEMOSTAT_AGENTS or
+                'monitor,analyzer,responder,alert')
+
+        Raises:
+            ValueError: If an agent name is unknown or no agent is selected
+        """
+        self.logger = HemoStatLogger.get_logger("combined")
+
+        # HEMOSTAT_AGENTS: comma-separated agents to host in this process
+        if agent_names is None:
+            agent_names = os.getenv("HEMOSTAT_AGENTS", DEFAULT_AGENTS).split(",")
+        names = [name.strip().lower() for name in agent_names if name.strip()]
+        unknown = [name for name in names if name not in AGENTS]
+        if unknown or not names:
+            msg = f"Unknown or missing agents {unknown} (choose from {', '.join(AGENTS)})"
+            raise ValueError(msg)
+        self.agent_names = list(dict.fromkeys(names))
+
+        # Every hosted agent holds its own subscription connection from the shared pool
+        per_agent = int(os.getenv("REDIS_PUBSUB_POOL_SIZE", 4))
+        self.bus = LocalBus(pubsub_pool_size=per_agent * len(self.agent_names))
+
+        self.agents: dict[str, HemoStatAgent] = {}
+        self._threads: list[threading.Thread] = []
+        self._stop_requested = threading.Event()
+        self._stopped = False
+
+    def start(self) -> None:
+        """
+        Create the agents on the shared bus and start each agent's run loop on a thread.
+
+        Raises:
+            HemoStatConnectionError: If Redis is unreachable
+            ImportError: If a selected agent's dependencies are missing
+        """
+        install_bus(self.bus)
+        try:
+            for name in self.agent_names:
+                module_name, class_name = AGENTS[name]
+                agent_class = getattr(importlib.import_module(module_name), class_name)
+                self.agents[name] = agent_class()
+        finally:
+            install_bus(None)
+
+        # Hosted agents leave signal handling to the runner, which stops all of them
+        if threading.current_thread() is threading.main_thread():
+            signal.signal(signal.SIGTERM, self._handle_shutdown_signal)
+            signal.signal(signal.SIGINT, self._handle_shutdown_signal)
+
+        for name, agent in self.agents.items():
+            thread = threading.Thread(target=agent.run, name=f"combined-{name}", daemon=True)
+            thread.start()
+            self._threads.append(thread)
+
+        self.logger.info(f"Hosting agents: {', '.join(self.agents)}")
+
+    def run(self) -> None:
+        """
+        Start the agents and block until a shutdown signal or until every agent exited.
+        """
+        self.start()
+        try:
+            while not self._stop_requested.wait(timeout=1.0):
+                if not any(thread.is_alive() for thread in self._threads):
+                    self.logger.warning("All hosted agents exited")
+                    break
+        finally:
+            self.stop()
+
+    def stop(self) -> None:
+        """Stop all hosted agents, then close the shared Redis clients."""
+        if self._stopped:
+            return
+        self._stopped = True
+        self._stop_requested.set()
+
+        # Pipeline order: upstream agents stop producing before downstream ones stop
+        for name, agent in self.agents.items():
+            try:
+                agent.stop()
+            except Exception as e:
+                self.logger.error(f"Error stopping {name}: {e!s}")
+        for thread in self._threads:
+            thread.join(timeout=10)
+
+        self.bus.close()
+        self.logger.info(f"Combined runner stopped ({self.bus.delivered} in-memory deliveries)")
+
+    def _handle_shutdown_signal(self, signum: int, frame: Any) -> None:
+        """
+        Handle OS shutdown signals (SIGTERM, SIGINT).
+
+        Args:
+            signum: Signal number
+            frame: Current stack frame
+        """
+        self.logger.info(f"Received signal {signum}, stopping hosted agents")
+        self._stop_requested.set()
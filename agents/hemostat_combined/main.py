@@ -0,0 +1,64 @@
+"""
+HemoStat Combined Runner Entry Point
+
+Runs several agents in one process.
+Usage: python -m agents.hemostat_combined.main [agent ...]
+
+Agents are taken from the command line, or from HEMOSTAT_AGENTS
+(default: monitor,analyzer,responder,alert).
+"""
+
+import sys
+
+from dotenv import load_dotenv
+
+from agents.agent_base import HemoStatConnectionError
+from agents.hemostat_combined import CombinedRunner
+from agents.logger import HemoStatLogger
+
+
+def main() -> None:
+    """
+    Main entry point for the Combined Runner.
+
+    Creates the selected agents on a shared bus and runs them until a shutdown signal.
+    """
+    # Load environment variables
+    load_dotenv()
+
+    # Configure root logger and get logger for this module
+    HemoStatLogger.configure_root_logger()
+    logger = HemoStatLogger.get_logger("combined")
+
+    logger.info("=" * 60)
+    logger.info("HemoStat Combined Runner Starting")
+    logger.info("=" * 60)
+
+    runner = None
+    try:
+        runner = CombinedRunner(sys.argv[1:] or None)
+        runner.run()
+    except KeyboardInterrupt:
+        logger.info("Combined runner interrupted by user (SIGINT)")
+    except ValueError as e:
+        logger.error(str(e))
+        sys.exit(2)
+    except HemoStatConnectionError as e:
+        logger.error(f"Redis connection failed: {e}")
+        sys.exit(1)
+    except ImportError as e:
+        logger.error(f"Missing required dependencies: {e}. Install with: uv sync --extra agents")
+        sys.exit(1)
+    except Exception as e:
+        logger.error(f"Unexpected error: {e}", exc_info=True)
+        sys.exit(1)
+    finally:
+        if runner:
+            runner.stop()
+        logger.info("=" * 60)
+        logger.info("HemoStat Combined Runner Stopped")
+        logger.info("=" * 60)
+
+
+if __name__ == "__main__":
+    main()
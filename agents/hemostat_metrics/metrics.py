@@ -9,11 +9,13 @@ import json
 import os
 import time
 from datetime import UTC, datetime
+from itertools import pairwise
 from typing import Any
 
 from prometheus_client import Counter, Gauge, Histogram, start_http_server
 
 from agents.agent_base import HemoStatAgent
+from agents.tracing import hop_time, pipeline_seconds, trace_of
 
 
 class MetricsExporter(HemoStatAgent):
@@ -161,6 +163,13 @@ class MetricsExporter(HemoStatAgent):
             "Time from detection to remediation completion",
             buckets=[5, 10, 15, 30, 60, 120, 300, 600],
         )
+        self.pipeline_hop_seconds = Histogram(
+            "hemostat_pipeline_hop_seconds",
+            "Per-hop latency of traced incidents (transit: previous event to callback start, "
+            "processing: callback start to publish)",
+            ["event_type", "stage"],
+            buckets=[0.01, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0],
+        )
 
         self.logger.info(f"Metrics Exporter initialized on port {self.metrics_port}")
 
@@ -177,6 +186,8 @@ class MetricsExporter(HemoStatAgent):
             start_http_server(self.metrics_port)
             self.logger.info(f"Prometheus metrics server started on port {self.metrics_port}")
             self.logger.info(f"Metrics endpoint: http://localhost:{self.metrics_port}/metrics")
+            # Agent message path metrics are served from the same (default) registry
+            self.instrumentation.enable(runtime_stats=self.runtime_stats)
         except Exception as e:
             self.logger.error(f"Failed to start metrics server: {e}", exc_info=True)
             return
@@ -186,25 +197,20 @@ class MetricsExporter(HemoStatAgent):
         self.subscribe_to_channel("hemostat:events:analysis", self._handle_analysis_result)
         self.subscribe_to_channel("hemostat:events:remediation", self._handle_remediation_event)
         self.subscribe_to_channel("hemostat:events:alert", self._handle_alert_event)
+        self.subscribe_to_channel(
+            "hemostat:remediation_complete", self._handle_remediation_complete
+        )
 
         self.logger.info("Metrics exporter started, listening for events...")
 
-        # Track agent uptime
+        # Track agent uptime (evaluated on every scrape)
         start_time = time.time()
+        self.agent_uptime_seconds.labels(agent_name="metrics").set_function(
+            lambda: time.time() - start_time
+        )
 
         try:
-            while self._running:
-                # Update uptime metric
-                uptime = time.time() - start_time
-                self.agent_uptime_seconds.labels(agent_name="metrics").set(uptime)
-
-                # Process messages from Redis pub/sub
-                message = self.pubsub.get_message(timeout=1.0)
-                if message and message["type"] == "message":
-                    # Message already handled by registered callback
-                    pass
-
-                time.sleep(0.1)
+            self.start_listening()
         except KeyboardInterrupt:
             self.logger.info("Metrics exporter interrupted by user")
         finally:
@@ -310,6 +316,43 @@ class MetricsExporter(HemoStatAgent):
         except Exception as e:
             self.logger.error(f"Error processing remediation event: {e}", exc_info=False)
 
+    def _handle_remediation_complete(self, message: dict[str, Any]) -> None:
+        """
+        Record pipeline latency of a completed remediation from its event trace.
+
+        Args:
+            message: Remediation complete event from the Responder agent
+        """
+        try:
+            trace = trace_of(message)
+            if trace is None:
+                return
+
+            elapsed = pipeline_seconds(trace)
+            if elapsed is not None:
+                self.time_to_remediation_seconds.observe(elapsed)
+
+            hops = trace.get("hops", [])
+            for previous, hop in pairwise(hops):
+                sent, received, published = (
+                    hop_time(previous),
+                    hop_time(hop, "received_at"),
+                    hop_time(hop),
+                )
+                event_type = hop.get("event_type", "unknown")
+                if sent is not None and received is not None:
+                    self.pipeline_hop_seconds.labels(
+                        event_type=event_type, stage="transit"
+                    ).observe(max(0.0, received - sent))
+                if received is not None and published is not None:
+                    self.pipeline_hop_seconds.labels(
+                        event_type=event_type, stage="processing"
+                    ).observe(max(0.0, published - received))
+
+            self.logger.debug(f"Processed trace {trace['id']}: {elapsed}s to remediation")
+        except Exception as e:
+            self.logger.error(f"Error processing remediation trace: {e}", exc_info=False)
+
     def _handle_alert_event(self, message: dict[str, Any]) -> None:
         """
         Handle alert events from Alert agent.
@@ -0,0 +1,363 @@
+"""
+HemoStat Monitor - Direct cgroup Stats Reader
+
+Reads container resource usage straight from the cgroup filesystem (v1 or v2) and
+/proc/<pid>/net/dev instead of going through the Docker stats API. Each read returns a
+dictionary shaped like the Docker stats API response (cpu_stats, precpu_stats,
+memory_stats, networks, blkio_stats), so the monitor's existing calculations apply
+unchanged. CPU usage is computed against the previous sample held in memory; the first
+read of a container only records that sample.
+
+The filesystem roots are configurable so the reader can run inside a container with the
+host's /sys/fs/cgroup and /proc mounted elsewhere, or against a fake tree in tests.
+"""
+
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Any
+
+from agents.logger import HemoStatLogger
+
+# Placeholder values cgroup v1 uses for "no memory limit" are close to 2^63
+UNLIMITED_MEMORY_THRESHOLD = 2**60
+
+
+class CgroupStatsReader:
+    """
+    Collects per-container stats from cgroup v1/v2 files.
+
+    Container cgroup directories are resolved from /proc/<pid>/cgroup when possible and
+    from the standard Docker layouts (cgroupfs and systemd drivers) otherwise. Resolved
+    paths are cached per container ID. Reads may run on several stats worker threads
+    while the polling loop prunes, so the caches are guarded by a lock.
+    """
+
+    def __init__(self, cgroup_root: str = "/sys/fs/cgroup", proc_root: str = "/proc"):
+        """
+        Initialize the reader.
+
+        Args:
+            cgroup_root: Mount point of the cgroup filesystem
+            proc_root: Mount point of procfs (must be the host's for /proc/<pid> lookups)
+        """
+        self.logger = HemoStatLogger.get_logger("monitor")
+        self.cgroup_root = Path(cgroup_root)
+        self.proc_root = Path(proc_root)
+        self.version = 2 if (self.cgroup_root / "cgroup.controllers").exists() else 1
+        self.online_cpus = os.cpu_count() or 1
+        self.host_memory = self._read_host_memory()
+
+        self._lock = threading.Lock()
+        self._paths: dict[str, dict[str, Path]] = {}
+        self._previous: dict[str, tuple[int, int]] = {}
+
+    @property
+    def available(self) -> bool:
+        """
+        Check whether the cgroup filesystem is mounted at the configured root.
+
+        Returns:
+            True if the root exists and looks like a cgroup hierarchy
+        """
+        if self.version == 2:
+            return True
+        return (self.cgroup_root / "memory").is_dir()
+
+    def read(self, container_id: str, pid: int = 0) -> dict[str, Any] | None:
+        """
+        Read a Docker-compatible stats document for one container.
+
+        Args:
+            container_id: Full container ID
+            pid: Host PID of the container's init process (0 if unknown or not running)
+
+        Returns:
+            Stats dictionary in Docker stats API format, or None if the container's cgroup
+            cannot be found or read, or if this is its first sample and there is no CPU
+            value yet (callers should fall back to the Docker API)
+        """
+        paths = self._resolve_paths(container_id, pid)
+        if paths is None:
+            return None
+
+        try:
+            if self.version == 2:
+                cpu_usage = self._read_v2_cpu(paths["cpu"])
+                memory_stats = self._read_v2_memory(paths["memory"])
+                blkio_stats = self._read_v2_io(paths["io"])
+            else:
+                cpu_usage = self._read_v1_cpu(paths["cpu"])
+                memory_stats = self._read_v1_memory(paths["memory"])
+                blkio_stats = self._read_v1_blkio(paths["blkio"])
+        except (OSError, ValueError) as e:
+            # The container most likely exited between resolution and read
+            self.logger.debug(f"Failed to read cgroup stats for {container_id[:12]}: {e}")
+            with self._lock:
+                self._paths.pop(container_id, None)
+            return None
+
+        # Docker's formula divides by host CPU time; wall time x online CPUs is equivalent
+        with self._lock:
+            system_usage = time.monotonic_ns() * self.online_cpus
+            previous = self._previous.get(container_id)
+            self._previous[container_id] = (cpu_usage, system_usage)
+        if previous is None:
+            # A CPU delta needs two samples; 0% would look like a real reading
+            return None
+        previous_usage, previous_system = previous
+
+        return {
+            "cpu_stats": {
+                "cpu_usage": {"total_usage": cpu_usage},
+                "system_cpu_usage": system_usage,
+                "online_cpus": self.online_cpus,
+            },
+            "precpu_stats": {
+                "cpu_usage": {"total_usage": previous_usage},
+                "system_cpu_usage": previous_system,
+            },
+            "memory_stats": memory_stats,
+            "networks": self._read_networks(pid) if pid else {},
+            "blkio_stats": blkio_stats,
+        }
+
+    def prune(self, active_ids: set[str]) -> None:
+        """
+        Drop cached paths and previous samples for containers no longer monitored.
+
+        Args:
+            active_ids: Full IDs of containers still being monitored
+        """
+        with self._lock:
+            for container_id in list(self._previous):
+                if container_id not in active_ids:
+                    self._previous.pop(container_id, None)
+                    self._paths.pop(container_id, None)
+
+    def _resolve_paths(self, container_id: str, pid: int) -> dict[str, Path] | None:
+        """
+        Find the cgroup directories of a container, per controller.
+
+        Args:
+            container_id: Full container ID
+            pid: Host PID of the container's init process
+
+        Returns:
+            Mapping of controller name ('cpu', 'memory', 'io'/'blkio') to directory, or None
+        """
+        with self._lock:
+            cached = self._paths.get(container_id)
+        if cached is not None and all(p.is_dir() for p in cached.values()):
+            return cached
+
+        relative = self._relative_paths_from_proc(pid) if pid else {}
+        candidates = [
+            f"system.slice/docker-{container_id}.scope",
+            f"docker/{container_id}",
+        ]
+
+        if self.version == 2:
+            options = [relative.get("")] if relative.get("") else []
+            options += candidates
+            for option in options:
+                directory = self.cgroup_root / option.lstrip("/")
+                if (directory / "cpu.stat").exists():
+                    paths = {"cpu": directory, "memory": directory, "io": directory}
+                    with self._lock:
+                        self._paths[container_id] = paths
+                    return paths
+            return None
+
+        paths: dict[str, Path] = {}
+        controllers = {
+            "cpu": ["cpu,cpuacct", "cpuacct", "cpuacct,cpu"],
+            "memory": ["memory"],
+            "blkio": ["blkio"],
+        }
+        for key, mounts in controllers.items():
+            for mount in mounts:
+                options = [relative[mount]] if relative.get(mount) else []
+                options += candidates
+                found = next(
+                    (
+                        self.cgroup_root / mount / option.lstrip("/")
+                        for option in options
+                        if (self.cgroup_root / mount / option.lstrip("/")).is_dir()
+                    ),
+                    None,
+                )
+                if found is not None:
+                    paths[key] = found
+                    break
+            if key not in paths:
+                return None
+
+        with self._lock:
+            self._paths[container_id] = paths
+        return paths
+
+    def _relative_paths_from_proc(self, pid: int) -> dict[str, str]:
+        """
+        Parse /proc/<pid>/cgroup into controller -> relative path.
+
+        Args:
+            pid: Host PID of the container's init process
+
+        Returns:
+            Mapping of controller list (e.g. 'cpu,cpuacct', or '' for the v2 unified
+            hierarchy) to the cgroup path relative to the hierarchy root
+        """
+        try:
+            content = (self.proc_root / str(pid) / "cgroup").read_text()
+        except OSError:
+            return {}
+
+        relative: dict[str, str] = {}
+        for line in content.splitlines():
+            parts = line.split(":", 2)
+            if len(parts) == 3:
+                relative[parts[1]] = parts[2]
+        return relative
+
+    def _read_v2_cpu(self, directory: Path) -> int:
+        """Return cumulative CPU usage in nanoseconds from cpu.stat."""
+        stat = self._read_key_values(directory / "cpu.stat")
+        return stat.get("usage_usec", 0) * 1000
+
+    def _read_v2_memory(self, directory: Path) -> dict[str, Any]:
+        """Return Docker-style memory_stats from memory.current, memory.max and memory.stat."""
+        usage = int((directory / "memory.current").read_text().strip())
+        limit_raw = (directory / "memory.max").read_text().strip()
+        limit = self.host_memory if limit_raw == "max" else int(limit_raw)
+        stat = self._read_key_values(directory / "memory.stat")
+        return {
+            "usage": usage,
+            "limit": limit,
+            "stats": {"inactive_file": stat.get("inactive_file", 0)},
+        }
+
+    def _read_v2_io(self, directory: Path) -> dict[str, Any]:
+        """Return Docker-style blkio_stats from io.stat."""
+        totals = {"rbytes": 0, "wbytes": 0, "rios": 0, "wios": 0}
+        io_stat = directory / "io.stat"
+        if io_stat.exists():
+            for line in io_stat.read_text().splitlines():
+                for field in line.split()[1:]:
+                    key, _, value = field.partition("=")
+                    if key in totals:
+                        totals[key] += int(value)
+
+        return {
+            "io_service_bytes_recursive": [
+                {"op": "read", "value": totals["rbytes"]},
+                {"op": "write", "value": totals["wbytes"]},
+            ],
+            "io_serviced_recursive": [
+                {"op": "read", "value": totals["rios"]},
+                {"op": "write", "value": totals["wios"]},
+            ],
+        }
+
+    def _read_v1_cpu(self, directory: Path) -> int:
+        """Return cumulative CPU usage in nanoseconds from cpuacct.usage."""
+        return int((directory / "cpuacct.usage").read_text().strip())
+
+    def _read_v1_memory(self, directory: Path) -> dict[str, Any]:
+        """Return Docker-style memory_stats from the v1 memory controller."""
+        usage = int((directory / "memory.usage_in_bytes").read_text().strip())
+        limit = int((directory / "memory.limit_in_bytes").read_text().strip())
+        if limit >= UNLIMITED_MEMORY_THRESHOLD:
+            limit = self.host_memory
+        stat = self._read_key_values(directory / "memory.stat")
+        return {
+            "usage": usage,
+            "limit": limit,
+            "stats": {"total_inactive_file": stat.get("total_inactive_file", 0)},
+        }
+
+    def _read_v1_blkio(self, directory: Path) -> dict[str, Any]:
+        """Return Docker-style blkio_stats from the v1 blkio throttle files."""
+        blkio_stats: dict[str, Any] = {}
+        files = {
+            "io_service_bytes_recursive": "blkio.throttle.io_service_bytes_recursive",
+            "io_serviced_recursive": "blkio.throttle.io_serviced_recursive",
+        }
+        for key, filename in files.items():
+            entries = []
+            path = directory / filename
+            if path.exists():
+                for line in path.read_text().splitlines():
+                    parts = line.split()
+                    # Per-device lines look like "8:0 Read 4096"; skip the "Total N" line
+                    if len(parts) == 3:
+                        entries.append({"op": parts[1], "value": int(parts[2])})
+            blkio_stats[key] = entries
+        return blkio_stats
+
+    def _read_networks(self, pid: int) -> dict[str, dict[str, int]]:
+        """
+        Read per-interface counters from /proc/<pid>/net/dev (container network namespace).
+
+        Args:
+            pid: Host PID of the container's init process
+
+        Returns:
+            Docker-style networks mapping, empty if the file cannot be read
+        """
+        try:
+            lines = (self.proc_root / str(pid) / "net" / "dev").read_text().splitlines()
+        except OSError:
+            return {}
+
+        networks: dict[str, dict[str, int]] = {}
+        # The first two lines are column headers
+        for line in lines[2:]:
+            interface, _, counters = line.partition(":")
+            interface = interface.strip()
+            fields = counters.split()
+            if interface == "lo" or len(fields) < 10:
+                continue
+            networks[interface] = {
+                "rx_bytes": int(fields[0]),
+                "rx_packets": int(fields[1]),
+                "tx_bytes": int(fields[8]),
+                "tx_packets": int(fields[9]),
+            }
+        return networks
+
+    def _read_host_memory(self) -> int:
+        """
+        Read total host memory from /proc/meminfo (used when a container has no limit).
+
+        Returns:
+            Host memory in bytes, or 0 if unavailable
+        """
+        try:
+            for line in (self.proc_root / "meminfo").read_text().splitlines():
+                if line.startswith("MemTotal:"):
+                    return int(line.split()[1]) * 1024
+        except (OSError, ValueError, IndexError):
+            pass
+        return 0
+
+    @staticmethod
+    def _read_key_values(path: Path) -> dict[str, int]:
+        """
+        Parse a flat 'key value' cgroup file such as cpu.stat or memory.stat.
+
+        Args:
+            path: File to read
+
+        Returns:
+            Mapping of key to integer value (missing file yields an empty mapping)
+        """
+        if not path.exists():
+            return {}
+        values: dict[str, int] = {}
+        for line in path.read_text().splitlines():
+            parts = line.split()
+            if len(parts) == 2 and parts[1].lstrip("-").isdigit():
+                values[parts[0]] = int(parts[1])
+        return values
@@ -0,0 +1,174 @@
+"""
+HemoStat Monitor - Docker Endpoints
+
+Wraps each Docker daemon the monitor polls. Every endpoint owns its own Docker client (and
+therefore its own HTTP connection pool), connects lazily, and backs off exponentially after
+failures so one unreachable daemon does not slow down polling of the others.
+"""
+
+import time
+from typing import Any
+from urllib.parse import urlparse
+
+import docker
+from docker.errors import DockerException
+
+from agents.logger import HemoStatLogger
+
+# Endpoint name used when the monitor talks to a single daemon from the environment
+DEFAULT_ENDPOINT_NAME = "local"
+
+
+def parse_docker_hosts(value: str) -> list[tuple[str, str]]:
+    """
+    Parse MONITOR_DOCKER_HOSTS into (name, base_url) pairs.
+
+    Entries are comma-separated and either 'name=url' or a bare URL, in which case the
+    URL's host (or socket path) is used as the name.
+
+    Args:
+        value: Raw environment variable value, e.g.
+            "web1=tcp://10.0.0.11:2376,tcp://10.0.0.12:2376,unix:///var/run/docker.sock"
+
+    Returns:
+        List of (name, base_url) tuples in configuration order (empty if value is blank)
+    """
+    hosts: list[tuple[str, str]] = []
+    for entry in value.split(","):
+        entry = entry.strip()
+        if not entry:
+            continue
+        name, separator, url = entry.partition("=")
+        if not separator:
+            url = entry
+            parsed = urlparse(url)
+            name = parsed.hostname or parsed.path or url
+        hosts.append((name.strip(), url.strip()))
+    return hosts
+
+
+class DockerEndpoint:
+    """
+    One Docker daemon with its client, health and reconnect backoff.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        base_url: str | None = None,
+        max_pool_size: int = 10,
+        max_backoff: float = 60.0,
+    ):
+        """
+        Initialize the endpoint without connecting.
+
+        Args:
+            name: Host tag attached to payloads and state keys
+            base_url: Docker daemon URL (None = configure from the environment like docker.from_env)
+            max_pool_size: HTTP connection pool size of this endpoint's client
+            max_backoff: Maximum seconds between reconnect attempts
+        """
+        self.logger = HemoStatLogger.get_logger("monitor")
+        self.name = name
+        self.base_url = base_url
+        self.max_pool_size = max_pool_size
+        self.max_backoff = max_backoff
+
+        self.client: docker.DockerClient | None = None
+        self.failures = 0
+        self.retry_at = 0.0
+        self.last_error: str | None = None
+
+    @property
+    def is_local(self) -> bool:
+        """
+        Whether the daemon runs on this machine (so its cgroups and /proc are readable).
+
+        Returns:
+            True for the environment default and unix sockets
+        """
+        return self.base_url is None or self.base_url.startswith("unix://")
+
+    def ready(self) -> bool:
+        """
+        Check whether the endpoint may be used now (not inside a backoff window).
+
+        Returns:
+            True if no backoff is pending
+        """
+        return time.monotonic() >= self.retry_at
+
+    def get_client(self) -> docker.DockerClient | None:
+        """
+        Return the endpoint's client, connecting first if needed.
+
+        Returns:
+            Docker client, or None if the endpoint is backing off or the connection failed
+        """
+        if not self.ready():
+            return None
+        if self.client is not None:
+            return self.client
+
+        try:
+            if self.base_url is None:
+                self.client = docker.from_env(max_pool_size=self.max_pool_size)
+            else:
+                self.client = docker.DockerClient(
+                    base_url=self.base_url, max_pool_size=self.max_pool_size
+                )
+        except DockerException as e:
+            self.mark_failure(e)
+            return None
+
+        self.logger.info(f"Docker endpoint '{self.name}' connected: {self.base_url or 'env'}")
+        self.mark_success()
+        return self.client
+
+    def mark_success(self) -> None:
+        """Reset the failure count after a successful call."""
+        if self.failures:
+            self.logger.info(f"Docker endpoint '{self.name}' recovered")
+        self.failures = 0
+        self.retry_at = 0.0
+        self.last_error = None
+
+    def mark_failure(self, error: Exception) -> None:
+        """
+        Record a failed call and schedule the next attempt with exponential backoff.
+
+        Args:
+            error: Exception raised by the Docker call
+        """
+        self.failures += 1
+        backoff = min(self.max_backoff, 2.0 ** (self.failures - 1))
+        self.retry_at = time.monotonic() + backoff
+        self.last_error = str(error)
+        self.logger.warning(
+            f"Docker endpoint '{self.name}' failed ({self.failures} in a row): {error}. "
+            f"Retrying in {backoff:.0f}s"
+        )
+
+    def status(self) -> dict[str, Any]:
+        """
+        Summarize endpoint health for cycle reports.
+
+        Returns:
+            Dictionary with state ('up', 'backoff' or 'down'), failures and last_error
+        """
+        if self.failures == 0 and self.client is not None:
+            state = "up"
+        elif self.ready():
+            state = "down"
+        else:
+            state = "backoff"
+        return {"state": state, "failures": self.failures, "last_error": self.last_error}
+
+    def close(self) -> None:
+        """Close the client and its connection pool."""
+        if self.client is not None:
+            try:
+                self.client.close()
+            except Exception as e:
+                self.logger.debug(f"Error closing Docker endpoint '{self.name}': {e}")
+            self.client = None
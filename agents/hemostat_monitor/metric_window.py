@@ -0,0 +1,165 @@
+"""
+HemoStat Monitor - Rolling Metric Windows
+
+Fixed-size, array-backed ring buffer of recent samples per container, with an EWMA
+baseline per metric. The monitor uses it to alert only on sustained threshold breaches
+and on sustained deviations from a container's own baseline (z-score), instead of on
+every instantaneous spike.
+"""
+
+import math
+from array import array
+
+# Metrics recorded per sample, in column order
+WINDOW_METRICS = (
+    "cpu_percent",
+    "memory_percent",
+    "network_bytes_per_sec",
+    "blkio_bytes_per_sec",
+    "blkio_ops_per_sec",
+)
+
+
+class MetricWindow:
+    """
+    Ring buffer of the last `size` samples of one container.
+
+    Samples are stored row-major in a single flat array of doubles, so memory per
+    container is fixed. EWMA baselines are updated incrementally; the z-score of the newest
+    sample is taken against the baseline and the window's standard deviation before that
+    sample, so the sample cannot inflate the spread it is measured against. Samples that
+    deviate by more than `zscore_limit` do not move the baseline, so a sustained deviation
+    keeps being measured against the pre-deviation level until the window itself has
+    absorbed it.
+    """
+
+    def __init__(
+        self,
+        size: int = 30,
+        alpha: float = 0.2,
+        zscore_limit: float = 3.0,
+        min_std: float = 1.0,
+    ):
+        """
+        Initialize an empty window.
+
+        Args:
+            size: Number of samples kept
+            alpha: EWMA smoothing factor (higher = baseline follows new samples faster)
+            zscore_limit: Z-score from which a sample counts as a deviation
+            min_std: Floor for the standard deviation so flat series don't yield huge z-scores
+        """
+        self.size = max(2, size)
+        self.alpha = alpha
+        self.zscore_limit = zscore_limit
+        self.min_std = min_std
+        self.width = len(WINDOW_METRICS)
+
+        self._values = array("d", bytes(8 * self.size * self.width))
+        self._next = 0
+        self.count = 0
+
+        self._baseline: list[float | None] = [None] * self.width
+        self._zscores: list[float] = [0.0] * self.width
+        self._deviation_runs: list[int] = [0] * self.width
+
+    def append(self, sample: dict[str, float]) -> None:
+        """
+        Add a sample, overwriting the oldest one when the window is full.
+
+        Args:
+            sample: Mapping with the WINDOW_METRICS keys (missing keys count as 0)
+        """
+        # Spread of the samples preceding this one (taken before the oldest is overwritten)
+        stds = [self._std(column) for column in range(self.width)]
+
+        offset = self._next * self.width
+        for column, metric in enumerate(WINDOW_METRICS):
+            self._values[offset + column] = float(sample.get(metric, 0.0))
+
+        self._next = (self._next + 1) % self.size
+        self.count = min(self.count + 1, self.size)
+
+        for column in range(self.width):
+            value = self._values[offset + column]
+            baseline = self._baseline[column]
+            if baseline is None:
+                self._baseline[column] = value
+                self._zscores[column] = 0.0
+                continue
+            zscore = (value - baseline) / max(stds[column], self.min_std)
+            self._zscores[column] = zscore
+            if zscore >= self.zscore_limit:
+                self._deviation_runs[column] += 1
+            else:
+                self._deviation_runs[column] = 0
+            if abs(zscore) < self.zscore_limit:
+                self._baseline[column] = baseline + self.alpha * (value - baseline)
+
+    def zscore(self, metric: str) -> float:
+        """
+        Z-score of the newest sample against the baseline that preceded it.
+
+        Args:
+            metric: One of WINDOW_METRICS
+
+        Returns:
+            Signed z-score (0.0 before the second sample)
+        """
+        return self._zscores[WINDOW_METRICS.index(metric)]
+
+    def deviation_run(self, metric: str) -> int:
+        """
+        Count consecutive newest samples whose z-score reached the deviation limit.
+
+        Args:
+            metric: One of WINDOW_METRICS
+
+        Returns:
+            Length of the run of upward deviations ending at the newest sample
+        """
+        return self._deviation_runs[WINDOW_METRICS.index(metric)]
+
+    def baseline(self, metric: str) -> float:
+        """
+        Current EWMA baseline of a metric.
+
+        Args:
+            metric: One of WINDOW_METRICS
+
+        Returns:
+            Baseline value (0.0 if the window is empty)
+        """
+        return self._baseline[WINDOW_METRICS.index(metric)] or 0.0
+
+    def run_above(self, metric: str, limit: float) -> int:
+        """
+        Count consecutive newest samples whose value exceeds a limit.
+
+        Args:
+            metric: One of WINDOW_METRICS
+            limit: Value that samples must exceed
+
+        Returns:
+            Length of the run, 0 if the newest sample does not exceed the limit
+        """
+        column = WINDOW_METRICS.index(metric)
+        run = 0
+        for age in range(self.count):
+            row = (self._next - 1 - age) % self.size
+            if self._values[row * self.width + column] <= limit:
+                break
+            run += 1
+        return run
+
+    def _std(self, column: int) -> float:
+        """Population standard deviation of one column over the samples in the window."""
+        if self.count < 2:
+            return 0.0
+        values = [self._values[row * self.width + column] for row in self._rows()]
+        mean = sum(values) / len(values)
+        return math.sqrt(sum((v - mean) ** 2 for v in values) / len(values))
+
+    def _rows(self) -> range:
+        """Row indices currently holding samples (order is irrelevant)."""
+        return range(self.count)
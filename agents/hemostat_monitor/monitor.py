@@ -6,17 +6,53 @@ Publishes structured health alerts to Redis for consumption by the Analyzer Agen
 """
 
 import fnmatch
+import json
 import os
+import socket
+import threading
 import time
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
 from datetime import datetime, UTC
 from typing import Any
 
-import docker
+import redis
 from docker.errors import APIError, DockerException
 
 from agents.agent_base import HemoStatAgent
+from agents.codec import encode
+from agents.hemostat_monitor.cgroup_stats import CgroupStatsReader
+from agents.hemostat_monitor.endpoints import (
+    DEFAULT_ENDPOINT_NAME,
+    DockerEndpoint,
+    parse_docker_hosts,
+)
+from agents.hemostat_monitor.metric_window import MetricWindow
+from agents.hemostat_monitor.scheduler import AdaptivePollScheduler
+from agents.hemostat_monitor.sharding import ShardCoordinator
+from agents.hemostat_monitor.stats_streams import StatsStreamSupervisor
 from agents.platform_utils import get_docker_host
 
+# Docker container events that can change health, exit or restart state
+MONITORED_EVENTS = {"start", "restart", "die", "oom", "health_status"}
+
+# Memory usage in container state is quantized so idle noise doesn't count as a change
+STATE_MEMORY_QUANTUM = 1024 * 1024
+
+# Cumulative I/O counters turned into per-second rates (counter key -> rate key)
+IO_RATE_COUNTERS = {
+    "network_rx_bytes": "network_rx_bytes_per_sec",
+    "network_tx_bytes": "network_tx_bytes_per_sec",
+    "network_rx_packets": "network_rx_packets_per_sec",
+    "network_tx_packets": "network_tx_packets_per_sec",
+    "blkio_read_bytes": "blkio_read_bytes_per_sec",
+    "blkio_write_bytes": "blkio_write_bytes_per_sec",
+    "blkio_read_ops": "blkio_read_ops_per_sec",
+    "blkio_write_ops": "blkio_write_ops_per_sec",
+}
+
+# Samples closer together than this reuse the previous rates (e.g. the same stream sample)
+MIN_RATE_INTERVAL = 1.0
+
 
 class ContainerMonitor(HemoStatAgent):
     """
@@ -37,24 +73,174 @@ class ContainerMonitor(HemoStatAgent):
         # Initialize base agent
         super().__init__(agent_name="monitor")
 
-        # Initialize Docker client with platform-aware socket detection
-        try:
-            docker_host = os.getenv("DOCKER_HOST") or get_docker_host()
-            self.docker_client = docker.from_env()
-            self.logger.info(f"Docker client initialized successfully: {docker_host}")
+        # Concurrent collection configuration
+        # MONITOR_COLLECTION_WORKERS: number of containers sampled in parallel (1 = serial)
+        # MONITOR_CONTAINER_TIMEOUT: seconds before a single container's sample is abandoned
+        # MONITOR_CYCLE_DEADLINE: seconds after which the rest of a cycle is skipped
+        self.poll_interval = int(os.getenv("AGENT_POLL_INTERVAL", 30))
+        self.collection_workers = max(1, int(os.getenv("MONITOR_COLLECTION_WORKERS", 1)))
+        self.container_timeout = float(os.getenv("MONITOR_CONTAINER_TIMEOUT", 10))
+        self.cycle_deadline = float(os.getenv("MONITOR_CYCLE_DEADLINE", self.poll_interval))
+        self._collection_executor: ThreadPoolExecutor | None = None
+
+        # Event-driven monitoring configuration
+        # MONITOR_EVENTS_ENABLED: track container lifecycle through the Docker events stream;
+        # exits, health flips, restarts and OOM kills are alerted as they happen and polling
+        # only samples CPU/memory of running containers from the in-memory inventory
+        self.events_enabled = os.getenv("MONITOR_EVENTS_ENABLED", "false").lower() == "true"
+        self._inventory: dict[str, Any] = {}
+        self._inventory_lock = threading.Lock()
+        self._synced_endpoints: set[str] = set()
+        self._events_streams: dict[str, Any] = {}
+        self._events_threads: list[threading.Thread] = []
+
+        # Container state publishing: states staged during a cycle are written in one Redis
+        # pipeline; unchanged states only get their TTL refreshed
+        self.state_ttl = int(os.getenv("MONITOR_STATE_TTL", 300))
+        self._pending_states: dict[str, dict[str, Any]] = {}
+        self._state_lock = threading.Lock()
+        self._written_states: dict[str, tuple[str, float]] = {}
+        # Final states of stopped containers in event-driven mode (container_id -> key, state);
+        # they are not sampled, so their states are re-staged each cycle to refresh the TTL
+        self._stopped_states: dict[str, tuple[str, dict[str, Any]]] = {}
+
+        # Adaptive scheduling configuration
+        # MONITOR_ADAPTIVE_SCHEDULING: sample each container on its own cadence instead of
+        # all containers every AGENT_POLL_INTERVAL; containers near thresholds or with recent
+        # anomalies drop to MONITOR_MIN_POLL_INTERVAL, stable ones back off up to
+        # MONITOR_MAX_POLL_INTERVAL, and MONITOR_SAMPLE_BUDGET caps samples/sec (0 = no cap)
+        self.scheduler: AdaptivePollScheduler | None = None
+        self._listed_containers: list | None = None
+        self._listed_at = 0.0
+        if os.getenv("MONITOR_ADAPTIVE_SCHEDULING", "false").lower() == "true":
+            self.scheduler = AdaptivePollScheduler(
+                base_interval=self.poll_interval,
+                min_interval=float(os.getenv("MONITOR_MIN_POLL_INTERVAL", 5)),
+                max_interval=float(os.getenv("MONITOR_MAX_POLL_INTERVAL", 120)),
+                sample_budget=float(os.getenv("MONITOR_SAMPLE_BUDGET", 0)),
+            )
+            # State keys of backed-off containers must outlive their sampling interval
+            self.state_ttl = max(self.state_ttl, int(self.scheduler.max_interval * 2))
+
+        # Replica sharding configuration
+        # MONITOR_SHARDING_ENABLED: split containers across monitor replicas by consistent
+        # hashing of the container ID; replicas heartbeat into Redis every
+        # MONITOR_HEARTBEAT_TTL/3 seconds and are dropped after MONITOR_HEARTBEAT_TTL.
+        # MONITOR_REPLICA_ID must be unique per replica (default: hostname)
+        self.shard: ShardCoordinator | None = None
+        if os.getenv("MONITOR_SHARDING_ENABLED", "false").lower() == "true":
+            self.shard = ShardCoordinator(
+                self.redis,
+                replica_id=os.getenv("MONITOR_REPLICA_ID") or socket.gethostname(),
+                heartbeat_ttl=float(os.getenv("MONITOR_HEARTBEAT_TTL", 15)),
+                virtual_nodes=int(os.getenv("MONITOR_HASH_VNODES", 64)),
+            )
+
+        # Stats source configuration
+        # MONITOR_STATS_SOURCE: 'api' (Docker stats API), 'cgroup' (read cgroup files directly,
+        # falling back to the API per container) or 'stream' (one persistent stats stream per
+        # running container, read from a latest-sample table); the cgroup source needs the
+        # host's /sys/fs/cgroup and /proc, configurable via MONITOR_CGROUP_ROOT / MONITOR_PROC_ROOT
+        self.stats_source = os.getenv("MONITOR_STATS_SOURCE", "api").strip().lower()
+        self.cgroup_reader: CgroupStatsReader | None = None
+        self.stats_streams: StatsStreamSupervisor | None = None
+        self.max_stats_streams = int(os.getenv("MONITOR_MAX_STATS_STREAMS", 200))
+        if self.stats_source == "stream":
+            self.stats_streams = StatsStreamSupervisor(
+                max_streams=self.max_stats_streams,
+                stale_after=float(os.getenv("MONITOR_STREAM_STALE_SECONDS", 15)),
+            )
+            self.logger.info(f"Persistent stats streams enabled (max {self.max_stats_streams})")
+        if self.stats_source == "cgroup":
+            reader = CgroupStatsReader(
+                cgroup_root=os.getenv("MONITOR_CGROUP_ROOT", "/sys/fs/cgroup"),
+                proc_root=os.getenv("MONITOR_PROC_ROOT", "/proc"),
+            )
+            if reader.available:
+                self.cgroup_reader = reader
+                self.logger.info(
+                    f"Direct cgroup v{reader.version} stats enabled at {reader.cgroup_root}"
+                )
+            else:
+                self.logger.warning(
+                    f"cgroup filesystem not found at {reader.cgroup_root}; "
+                    f"using Docker stats API"
+                )
+
+        # Docker endpoints
+        # MONITOR_DOCKER_HOSTS: comma-separated 'name=url' (or bare url) list of Docker daemons
+        # polled concurrently by this process; each gets its own client and connection pool
+        # and backs off up to MONITOR_ENDPOINT_MAX_BACKOFF seconds when unreachable. When unset,
+        # the single daemon from DOCKER_HOST / platform detection is used.
+        # Size each HTTP connection pool so parallel stats calls don't queue on it;
+        # every persistent stats stream holds one connection for its lifetime
+        pool_size = max(10, self.collection_workers)
+        if self.stats_streams is not None:
+            pool_size += self.max_stats_streams
+        max_backoff = float(os.getenv("MONITOR_ENDPOINT_MAX_BACKOFF", 60))
+        docker_hosts = parse_docker_hosts(os.getenv("MONITOR_DOCKER_HOSTS", ""))
+        self._container_hosts: dict[str, str] = {}
+        self._listing_executor: ThreadPoolExecutor | None = None
+
+        if docker_hosts:
+            self.endpoints = [
+                DockerEndpoint(name, url, max_pool_size=pool_size, max_backoff=max_backoff)
+                for name, url in docker_hosts
+            ]
+            for endpoint in self.endpoints:
+                # Unreachable endpoints are retried with backoff during polling
+                endpoint.get_client()
             self.docker_available = True
-        except DockerException as e:
-            self.logger.warning(
-                f"Docker client unavailable (running in Docker without socket mount): {e}. "
-                f"Monitor will continue via Redis events only."
+            self.logger.info(
+                f"Monitoring {len(self.endpoints)} Docker endpoints: "
+                f"{[endpoint.name for endpoint in self.endpoints]}"
             )
-            self.docker_client = None
-            self.docker_available = False
+        else:
+            # Initialize Docker client with platform-aware socket detection
+            docker_host = os.getenv("DOCKER_HOST") or get_docker_host()
+            endpoint = DockerEndpoint(
+                DEFAULT_ENDPOINT_NAME, max_pool_size=pool_size, max_backoff=max_backoff
+            )
+            self.endpoints = [endpoint]
+            self.docker_available = endpoint.get_client() is not None
+            if self.docker_available:
+                self.logger.info(f"Docker client initialized successfully: {docker_host}")
+            else:
+                self.logger.warning(
+                    f"Docker client unavailable (running in Docker without socket mount): "
+                    f"{endpoint.last_error}. Monitor will continue via Redis events only."
+                )
+
+        self._endpoints_by_name = {endpoint.name: endpoint for endpoint in self.endpoints}
+        # Host tags go into state keys only when several daemons could share a short ID
+        self.multi_host = len(self.endpoints) > 1
+        # Collection concurrency scales with the number of endpoints
+        self.pool_workers = self.collection_workers * len(self.endpoints)
 
         # Load configuration from environment
-        self.poll_interval = int(os.getenv("AGENT_POLL_INTERVAL", 30))
         self.threshold_cpu = int(os.getenv("THRESHOLD_CPU_PERCENT", 85))
         self.threshold_memory = int(os.getenv("THRESHOLD_MEMORY_PERCENT", 80))
+        # I/O rate thresholds (0 disables the corresponding anomaly)
+        self.threshold_network_bytes = float(os.getenv("THRESHOLD_NETWORK_BYTES_PER_SEC", 0))
+        self.threshold_disk_bytes = float(os.getenv("THRESHOLD_DISK_BYTES_PER_SEC", 0))
+        self.threshold_disk_ops = float(os.getenv("THRESHOLD_DISK_OPS_PER_SEC", 0))
+        # Previous cumulative I/O counters per container: (monotonic time, counters, rates);
+        # updated by stats workers and pruned by the polling loop, hence the lock
+        self._io_counters: dict[str, tuple[float, dict[str, int], dict[str, float]]] = {}
+        self._io_lock = threading.Lock()
+
+        # Anomaly detection configuration
+        # MONITOR_DETECTION_MODE: 'threshold' (every sample over a threshold alerts) or
+        # 'sustained' (a rolling window per container; CPU/memory alert only after
+        # MONITOR_SUSTAIN_SAMPLES consecutive samples over the threshold, and medium alerts
+        # additionally need a z-score >= MONITOR_ZSCORE_THRESHOLD against the container's
+        # EWMA baseline, smoothed with MONITOR_EWMA_ALPHA over MONITOR_WINDOW_SIZE samples)
+        self.detection_mode = os.getenv("MONITOR_DETECTION_MODE", "threshold").strip().lower()
+        self.window_size = int(os.getenv("MONITOR_WINDOW_SIZE", 30))
+        self.sustain_samples = max(1, int(os.getenv("MONITOR_SUSTAIN_SAMPLES", 3)))
+        self.zscore_threshold = float(os.getenv("MONITOR_ZSCORE_THRESHOLD", 3.0))
+        self.ewma_alpha = float(os.getenv("MONITOR_EWMA_ALPHA", 0.2))
+        self._windows: dict[str, MetricWindow] = {}
 
         # Load container filtering configuration
         # MONITOR_CONTAINER_BLACKLIST: comma-separated list of container name patterns to EXCLUDE
@@ -68,6 +254,27 @@ class ContainerMonitor(HemoStatAgent):
         )
         if self.blacklist:
             self.logger.info(f"Container blacklist enabled: {self.blacklist}")
+        if self.collection_workers > 1:
+            self.logger.info(
+                f"Concurrent collection enabled: workers={self.collection_workers}, "
+                f"container_timeout={self.container_timeout}s, "
+                f"cycle_deadline={self.cycle_deadline}s"
+            )
+        if self.events_enabled:
+            self.logger.info("Event-driven monitoring enabled (Docker events stream)")
+        if self.detection_mode == "sustained":
+            self.logger.info(
+                f"Sustained anomaly detection enabled: window={self.window_size}, "
+                f"sustain={self.sustain_samples} samples, z>={self.zscore_threshold}"
+            )
+        if self.shard is not None:
+            self.logger.info(f"Sharding enabled as replica '{self.shard.replica_id}'")
+        if self.scheduler is not None:
+            self.logger.info(
+                f"Adaptive scheduling enabled: interval "
+                f"{self.scheduler.min_interval}-{self.scheduler.max_interval}s, "
+                f"budget={self.scheduler.sample_budget or 'unlimited'} samples/s"
+            )
 
     def run(self) -> None:
         """
@@ -78,14 +285,30 @@ class ContainerMonitor(HemoStatAgent):
         self._running = True
         self.logger.info("Starting monitor loop")
 
+        if self.events_enabled and self.docker_available:
+            for endpoint in self.endpoints:
+                thread = threading.Thread(
+                    target=self._watch_events,
+                    args=(endpoint,),
+                    name=f"monitor-events-{endpoint.name}",
+                    daemon=True,
+                )
+                thread.start()
+                self._events_threads.append(thread)
+
+        if self.shard is not None:
+            self.shard.start()
+
         try:
             while self._running:
+                cycle_start = time.monotonic()
                 try:
                     self._poll_containers()
                 except Exception as e:
                     self.logger.error(f"Error during container polling: {e}", exc_info=True)
 
-                time.sleep(self.poll_interval)
+                elapsed = time.monotonic() - cycle_start
+                time.sleep(self._seconds_until_next_cycle(elapsed))
         except KeyboardInterrupt:
             self.logger.info("Monitor interrupted by user")
         finally:
@@ -96,36 +319,590 @@ class ContainerMonitor(HemoStatAgent):
         Fetch all containers (running and exited) and check their health status.
 
         Includes both running and exited containers to detect non-zero exit codes.
-        Handles Docker API errors gracefully without breaking the loop.
-        Skips polling if Docker is unavailable.
+        Samples are collected first (serially or through the worker pool), then
+        evaluated for anomalies on the calling thread. Handles Docker API errors
+        gracefully without breaking the loop. Skips polling if Docker is unavailable.
         """
         if not self.docker_available:
             return
 
+        cycle_start = time.monotonic()
+
+        monitored = self._list_monitored_containers()
+        if monitored is None:
+            return
+
+        if self.shard is not None:
+            monitored = [c for c in monitored if self.shard.owns(c.id)]
+
+        if self.stats_streams is not None:
+            self.stats_streams.sync(monitored)
+
+        if self.events_enabled:
+            self._restage_stopped_states()
+
+        # With adaptive scheduling only the containers that are due are sampled this cycle
+        due = monitored
+        if self.scheduler is not None:
+            due = self._select_due_containers(monitored)
+            if not due:
+                # States staged by the events thread must not wait for the next due container
+                self._flush_container_states()
+                return
+
+        samples, skipped = self._collect_samples(due, cycle_start + self.cycle_deadline)
+
+        monitored_ids = {container.id for container in monitored}
+        if self.cgroup_reader is not None:
+            self.cgroup_reader.prune(monitored_ids)
+        for container_id in list(self._windows):
+            if container_id not in monitored_ids:
+                del self._windows[container_id]
+        with self._io_lock:
+            for container_id in list(self._io_counters):
+                if container_id not in monitored_ids:
+                    del self._io_counters[container_id]
+
+        anomalies_by_id: dict[str, list[dict[str, Any]]] = {}
+        for sample in samples:
+            anomalies_by_id[sample["container"].id] = self._check_container_health(
+                sample["container"], sample["stats"], sample["health_info"]
+            )
+
+        if self.scheduler is not None:
+            self._reschedule_containers(due, samples, anomalies_by_id)
+
+        self._flush_container_states()
+
+        self._report_cycle(
+            duration=time.monotonic() - cycle_start,
+            total=len(due),
+            sampled=len(samples),
+            skipped=skipped,
+        )
+
+    def _list_monitored_containers(self) -> list | None:
+        """
+        Return the containers to sample this cycle, after blacklist filtering.
+
+        In event-driven mode the in-memory inventory is used and only running containers
+        are returned (exits and health changes are handled by the events listener).
+        Otherwise all running and exited containers are listed from every Docker endpoint,
+        concurrently when there are several.
+
+        Returns:
+            List of Docker container objects, or None if listing failed on every endpoint
+        """
+        if self.events_enabled and self._synced_endpoints.issuperset(self._endpoints_by_name):
+            with self._inventory_lock:
+                containers = list(self._inventory.values())
+            running = [c for c in containers if c.status == "running"]
+            self.logger.debug(f"Sampling {len(running)} running containers from inventory")
+            return running
+
+        # The adaptive scheduler ticks more often than the poll interval; relisting once per
+        # interval is enough to pick up new and removed containers
+        if (
+            self.scheduler is not None
+            and self._listed_containers is not None
+            and time.monotonic() - self._listed_at < self.poll_interval
+        ):
+            return self._listed_containers
+
+        if self.multi_host:
+            if self._listing_executor is None:
+                self._listing_executor = ThreadPoolExecutor(
+                    max_workers=len(self.endpoints), thread_name_prefix="monitor-list"
+                )
+            results = list(self._listing_executor.map(self._list_endpoint, self.endpoints))
+        else:
+            results = [self._list_endpoint(self.endpoints[0])]
+
+        if all(result is None for result in results):
+            return None
+
+        monitored = [container for result in results if result for container in result]
+        self._listed_containers = monitored
+        self._listed_at = time.monotonic()
+        return monitored
+
+    def _list_endpoint(self, endpoint: DockerEndpoint) -> list | None:
+        """
+        List running and exited containers of one endpoint, after blacklist filtering.
+
+        Args:
+            endpoint: Docker endpoint to list
+
+        Returns:
+            List of Docker container objects, or None if the endpoint is unavailable
+        """
+        client = endpoint.get_client()
+        if client is None:
+            return None
+
         try:
-            containers = self.docker_client.containers.list(
+            containers = client.containers.list(
                 all=True, filters={"status": ["running", "exited"]}
             )
-            self.logger.debug(f"Polling {len(containers)} containers")
+        except APIError as e:
+            self.logger.error(f"Docker API error during container listing on {endpoint.name}: {e}")
+            endpoint.mark_failure(e)
+            return None
+        except DockerException as e:
+            self.logger.error(f"Docker error during polling of {endpoint.name}: {e}")
+            endpoint.mark_failure(e)
+            return None
+
+        endpoint.mark_success()
+        self.logger.debug(f"Polling {len(containers)} containers on {endpoint.name}")
+
+        monitored = []
+        for container in containers:
+            # Skip containers based on whitelist/blacklist
+            if not self._should_monitor_container(container.name):
+                self.logger.debug(f"Skipping filtered container: {container.name}")
+                continue
+            monitored.append(container)
+
+        listed = {container.id for container in monitored}
+        with self._inventory_lock:
+            # Forget removed containers of this endpoint (inventory entries stay mapped)
+            for container_id, host in list(self._container_hosts.items()):
+                if (
+                    host == endpoint.name
+                    and container_id not in listed
+                    and container_id not in self._inventory
+                ):
+                    del self._container_hosts[container_id]
+            for container_id in listed:
+                self._container_hosts[container_id] = endpoint.name
+
+        return monitored
+
+    def _host_of(self, container) -> str:
+        """
+        Return the host tag (endpoint name) of a container.
+
+        Args:
+            container: Docker container object
+
+        Returns:
+            Endpoint name the container was listed from
+        """
+        return self._container_hosts.get(container.id, self.endpoints[0].name)
+
+    def _interleave_by_host(self, containers: list) -> list:
+        """
+        Order containers round-robin across hosts so every endpoint is sampled concurrently.
+
+        Args:
+            containers: Docker container objects from any number of endpoints
+
+        Returns:
+            The same containers, interleaved by host
+        """
+        by_host: dict[str, list] = {}
+        for container in containers:
+            by_host.setdefault(self._host_of(container), []).append(container)
+
+        interleaved = []
+        queues = list(by_host.values())
+        for index in range(max((len(queue) for queue in queues), default=0)):
+            interleaved.extend(queue[index] for queue in queues if index < len(queue))
+        return interleaved
+
+    def _select_due_containers(self, monitored: list) -> list:
+        """
+        Register the current containers with the scheduler and return those due now.
+
+        Args:
+            monitored: All monitored Docker container objects
+
+        Returns:
+            Containers whose next sample is due, limited by the sampling budget
+        """
+        by_id = {container.id: container for container in monitored}
+        self.scheduler.sync(set(by_id))
+        return [by_id[container_id] for container_id in self.scheduler.pop_due()]
+
+    def _reschedule_containers(
+        self,
+        containers: list,
+        samples: list[dict[str, Any]],
+        anomalies_by_id: dict[str, list[dict[str, Any]]],
+    ) -> None:
+        """
+        Feed sampling results back to the scheduler to set each container's next due time.
+
+        Only running containers count as under pressure; exited containers back off even
+        if they carry a non-zero exit anomaly, so their alert is not repeated at the
+        minimum interval.
+
+        Args:
+            containers: Containers that were due this cycle
+            samples: Samples collected for them
+            anomalies_by_id: Anomalies detected per container ID
+        """
+        stats_by_id = {sample["container"].id: sample["stats"] for sample in samples}
+
+        for container in containers:
+            stats = stats_by_id.get(container.id)
+            running = container.status == "running"
+            pressure = None
+            if stats is not None:
+                pressure = self._threshold_pressure(stats) if running else 0.0
+            anomalous = running and bool(anomalies_by_id.get(container.id))
+            interval = self.scheduler.record(container.id, pressure, anomalous)
+            self.logger.debug(f"Next sample of {container.name} in {interval:.1f}s")
+
+    def _threshold_pressure(self, stats: dict[str, Any]) -> float:
+        """
+        Compute how close a sample is to the alert thresholds.
 
-            for container in containers:
+        Args:
+            stats: Container metrics dictionary
+
+        Returns:
+            Highest ratio of metric to threshold (1.0 = at threshold)
+        """
+        cpu = stats.get("cpu_percent", 0) / self.threshold_cpu if self.threshold_cpu else 0.0
+        memory = (
+            stats.get("memory_percent", 0) / self.threshold_memory
+            if self.threshold_memory
+            else 0.0
+        )
+        return max(cpu, memory)
+
+    def _seconds_until_next_cycle(self, elapsed: float) -> float:
+        """
+        Compute how long the main loop sleeps before the next cycle.
+
+        Args:
+            elapsed: Duration of the cycle that just finished
+
+        Returns:
+            Sleep time in seconds
+        """
+        if self.scheduler is None:
+            # Keep a steady cadence: a slow cycle eats into the sleep, not the interval
+            return max(0.0, self.poll_interval - elapsed)
+
+        # Wake for the next due container, but at least once per poll interval so new
+        # containers are picked up
+        return min(self.poll_interval, max(0.05, self.scheduler.seconds_until_due()))
+
+    def _collect_samples(
+        self, containers: list, deadline: float
+    ) -> tuple[list[dict[str, Any]], int]:
+        """
+        Collect stats and health information for a batch of containers.
+
+        With MONITOR_COLLECTION_WORKERS > 1, or several Docker endpoints, the per-container
+        Docker calls are fanned out to a bounded thread pool with
+        MONITOR_COLLECTION_WORKERS threads per endpoint. Containers whose sample takes longer than
+        MONITOR_CONTAINER_TIMEOUT, or that have not finished by the cycle deadline, are
+        skipped for this cycle.
+
+        Args:
+            containers: Docker container objects to sample
+            deadline: time.monotonic() value after which collection stops
+
+        Returns:
+            Tuple of (collected samples, number of skipped containers)
+        """
+        samples: list[dict[str, Any]] = []
+
+        if self.pool_workers <= 1:
+            for index, container in enumerate(containers):
+                if time.monotonic() >= deadline:
+                    skipped = len(containers) - index
+                    self.logger.warning(f"Cycle deadline reached; skipping {skipped} containers")
+                    return samples, skipped
+                sample = self._collect_sample(container)
+                if sample is not None:
+                    samples.append(sample)
+            return samples, 0
+
+        if self.multi_host:
+            containers = self._interleave_by_host(containers)
+
+        executor = self._get_collection_executor()
+        started_at: dict[str, float] = {}
+        futures: dict[Future, Any] = {
+            executor.submit(self._collect_sample, container, started_at): container
+            for container in containers
+        }
+
+        pending = set(futures)
+        skipped = 0
+        while pending:
+            now = time.monotonic()
+            if now >= deadline:
+                break
+
+            done, pending = wait(
+                pending, timeout=min(0.5, deadline - now), return_when=FIRST_COMPLETED
+            )
+            for future in done:
                 try:
-                    # Skip containers based on whitelist/blacklist
-                    if not self._should_monitor_container(container.name):
-                        self.logger.debug(f"Skipping filtered container: {container.name}")
-                        continue
-                    
-                    # Refresh container state to avoid stale status
-                    container.reload()
-                    self._check_container_health(container)
+                    sample = future.result()
                 except Exception as e:
-                    self.logger.error(
-                        f"Error checking container {container.short_id}: {e}", exc_info=False
+                    self.logger.error(f"Error collecting sample: {e}", exc_info=False)
+                    continue
+                if sample is not None:
+                    samples.append(sample)
+
+            # Abandon samples stuck longer than the per-container timeout
+            now = time.monotonic()
+            for future in list(pending):
+                container = futures[future]
+                started = started_at.get(container.id)
+                if started is not None and now - started > self.container_timeout:
+                    pending.discard(future)
+                    skipped += 1
+                    self.logger.warning(
+                        f"Sampling {container.name} exceeded {self.container_timeout}s; skipping"
                     )
-        except APIError as e:
-            self.logger.error(f"Docker API error during container listing: {e}")
+
+        if pending:
+            self.logger.warning(f"Cycle deadline reached; skipping {len(pending)} containers")
+            for future in pending:
+                future.cancel()
+            skipped += len(pending)
+
+        return samples, skipped
+
+    def _collect_sample(
+        self, container, started_at: dict[str, float] | None = None
+    ) -> dict[str, Any] | None:
+        """
+        Refresh a container and gather its stats and health information.
+
+        Safe to run on a worker thread: it only talks to the Docker API.
+
+        Args:
+            container: Docker container object
+            started_at: Optional map updated with the sampling start time (keyed by container ID)
+
+        Returns:
+            Sample dict with container, stats and health_info, or None if stats are unavailable
+        """
+        if started_at is not None:
+            started_at[container.id] = time.monotonic()
+
+        try:
+            # Refresh container state to avoid stale status
+            # (inventory entries are already kept fresh by the events listener)
+            if self._host_of(container) not in self._synced_endpoints:
+                container.reload()
+
+            stats = self._get_container_stats(container)
+            if stats is None:
+                return None
+
+            return {
+                "container": container,
+                "stats": stats,
+                "health_info": self._check_health_status(container),
+            }
+        except Exception as e:
+            self.logger.error(
+                f"Error checking container {container.short_id}: {e}", exc_info=False
+            )
+            return None
+
+    def _get_collection_executor(self) -> ThreadPoolExecutor:
+        """
+        Lazily create the worker pool used for concurrent collection.
+
+        Returns:
+            Shared ThreadPoolExecutor sized by MONITOR_COLLECTION_WORKERS per endpoint
+        """
+        if self._collection_executor is None:
+            self._collection_executor = ThreadPoolExecutor(
+                max_workers=self.pool_workers, thread_name_prefix="monitor-collect"
+            )
+        return self._collection_executor
+
+    def _report_cycle(self, duration: float, total: int, sampled: int, skipped: int) -> None:
+        """
+        Log and publish timing information for a completed poll cycle.
+
+        Args:
+            duration: Wall-clock cycle duration in seconds
+            total: Number of monitored containers in the cycle
+            sampled: Number of containers successfully sampled
+            skipped: Number of containers skipped due to timeouts or the cycle deadline
+        """
+        cycle_info = {
+            "duration_seconds": round(duration, 3),
+            "containers_total": total,
+            "containers_sampled": sampled,
+            "containers_skipped": skipped,
+            "containers_failed": total - sampled - skipped,
+            "endpoints": {endpoint.name: endpoint.status() for endpoint in self.endpoints},
+            "redis_pools": self.pool_stats(),
+            "timestamp": datetime.now(UTC).isoformat(),
+        }
+
+        # Adaptive scheduling runs many small cycles; only slow ones are worth an info line
+        if skipped:
+            log = self.logger.warning
+        elif self.scheduler is not None:
+            log = self.logger.debug
+        else:
+            log = self.logger.info
+        log(
+            f"Poll cycle completed in {duration:.2f}s: "
+            f"{sampled}/{total} sampled, {skipped} skipped"
+        )
+
+        # Each replica reports its own shard; a single monitor keeps the unsharded key
+        key = "monitor:cycle"
+        if self.shard is not None:
+            key = f"monitor:shard:{self.shard.replica_id}"
+            cycle_info["replica_id"] = self.shard.replica_id
+            cycle_info["replicas"] = len(self.shard.members)
+        self.set_shared_state(key, cycle_info, ttl=max(300, self.poll_interval * 3))
+
+    def _watch_events(self, endpoint: DockerEndpoint) -> None:
+        """
+        Consume one endpoint's Docker events stream and keep the container inventory current.
+
+        Runs on a background thread per endpoint. The stream is opened before the
+        inventory is (re)synchronized so no event is lost in between; on stream errors the
+        listener reconnects with exponential backoff and resynchronizes.
+
+        Args:
+            endpoint: Docker endpoint to watch
+        """
+        backoff = 1.0
+
+        while self._running:
+            try:
+                client = endpoint.get_client()
+                if client is not None:
+                    self._events_streams[endpoint.name] = client.events(
+                        decode=True, filters={"type": "container"}
+                    )
+                    self._sync_inventory(endpoint)
+                    backoff = 1.0
+
+                    for event in self._events_streams[endpoint.name]:
+                        if not self._running:
+                            break
+                        try:
+                            self._handle_docker_event(event, endpoint)
+                        except Exception as e:
+                            self.logger.error(
+                                f"Error handling Docker event: {e}", exc_info=False
+                            )
+            except Exception as e:
+                if not self._running:
+                    break
+                self.logger.warning(
+                    f"Docker events stream of {endpoint.name} interrupted: {e}. "
+                    f"Reconnecting in {backoff}s..."
+                )
+            finally:
+                self._synced_endpoints.discard(endpoint.name)
+
+            if self._running:
+                time.sleep(backoff)
+                backoff = min(backoff * 2, 30.0)
+
+        self.logger.info(f"Docker events listener for {endpoint.name} stopped")
+
+    def _sync_inventory(self, endpoint: DockerEndpoint) -> None:
+        """
+        Rebuild one endpoint's part of the container inventory from a full listing.
+
+        Args:
+            endpoint: Docker endpoint to list
+        """
+        containers = endpoint.client.containers.list(all=True)
+        inventory = {c.id: c for c in containers if self._should_monitor_container(c.name)}
+
+        with self._inventory_lock:
+            for container_id in list(self._inventory):
+                if self._container_hosts.get(container_id) == endpoint.name:
+                    self._inventory.pop(container_id, None)
+            for container_id in inventory:
+                self._container_hosts[container_id] = endpoint.name
+            self._inventory.update(inventory)
+        self._synced_endpoints.add(endpoint.name)
+
+        self.logger.info(
+            f"Container inventory of {endpoint.name} synchronized: {len(inventory)} containers"
+        )
+
+    def _handle_docker_event(self, event: dict[str, Any], endpoint: DockerEndpoint) -> None:
+        """
+        Apply a single Docker container event to the inventory and alert on state changes.
+
+        Args:
+            event: Decoded Docker event (Type, Action, Actor, time)
+            endpoint: Docker endpoint the event came from
+        """
+        action = event.get("Action") or event.get("status") or ""
+        actor = event.get("Actor") or {}
+        container_id = actor.get("ID") or event.get("id")
+        container_name = (actor.get("Attributes") or {}).get("name", "")
+
+        if not container_id:
+            return
+        if container_name and not self._should_monitor_container(container_name):
+            return
+
+        # health_status events carry the new status after a colon
+        base_action = action.split(":", 1)[0].strip()
+
+        if base_action == "destroy":
+            with self._inventory_lock:
+                self._inventory.pop(container_id, None)
+                self._container_hosts.pop(container_id, None)
+            with self._state_lock:
+                self._stopped_states.pop(container_id, None)
+            return
+
+        if base_action not in MONITORED_EVENTS:
+            return
+
+        try:
+            container = endpoint.client.containers.get(container_id)
         except DockerException as e:
-            self.logger.error(f"Docker error during polling: {e}")
+            self.logger.debug(f"Container {container_id[:12]} vanished before inspection: {e}")
+            with self._inventory_lock:
+                self._inventory.pop(container_id, None)
+            return
+
+        with self._inventory_lock:
+            self._container_hosts[container_id] = endpoint.name
+            self._inventory[container_id] = container
+
+        # Every replica keeps the full inventory; only the owner alerts
+        if self.shard is not None and not self.shard.owns(container_id):
+            return
+
+        self.logger.debug(f"Docker event '{action}' for {container.name}")
+
+        health_info = self._check_health_status(container)
+        anomalies = self._detect_state_anomalies(container, health_info)
+        if base_action == "oom":
+            anomalies.append({"type": "oom_killed", "severity": "critical"})
+
+        if anomalies:
+            self._publish_health_alert(container, {}, anomalies, health_info)
+
+        # Stopped containers are no longer sampled; record their final state now and keep
+        # it alive until the container starts again or is destroyed
+        if container.status != "running":
+            key, state = self._stage_container_state(container, {}, health_info, anomalies)
+            with self._state_lock:
+                self._stopped_states[container_id] = (key, state)
+        else:
+            with self._state_lock:
+                self._stopped_states.pop(container_id, None)
 
     def _should_monitor_container(self, container_name: str) -> bool:
         """
@@ -150,115 +927,372 @@ class ContainerMonitor(HemoStatAgent):
         
         return True
 
-    def _check_container_health(self, container) -> None:
+    def _check_container_health(
+        self, container, stats: dict[str, Any], health_info: dict[str, Any]
+    ) -> list[dict[str, Any]]:
         """
-        Check the health status of a single container.
+        Evaluate a collected sample for a single container.
 
-        Collects metrics, detects anomalies, and publishes alerts if needed.
+        Detects anomalies, stages container state for the end-of-cycle flush, and
+        publishes alerts if needed.
 
         Args:
             container: Docker container object
+            stats: Container metrics from _get_container_stats
+            health_info: Health status information from _check_health_status
+
+        Returns:
+            Detected anomalies (empty if healthy or evaluation failed)
         """
         container_name = container.name
 
         try:
-            # Collect container metadata
-            stats = self._get_container_stats(container)
-            if stats is None:
-                return
-
-            # Get health status
-            health_info = self._check_health_status(container)
+            if self.detection_mode == "sustained":
+                self._record_window(container, stats)
 
             # Detect anomalies
             anomalies = self._detect_anomalies(container, stats, health_info)
 
-            # Store container state to Redis (for dashboard health grid)
+            # Stage container state for the dashboard health grid
             # This stores data for ALL containers, not just unhealthy ones
-            container_id = container.short_id
-            container_state = {
-                "container_id": container_id,
-                "container_name": container_name,
-                "status": container.status,
-                "cpu_percent": stats.get("cpu_percent", 0),
-                "memory_percent": stats.get("memory_percent", 0),
-                "memory_usage": stats.get("memory_usage", 0),
-                "memory_limit": stats.get("memory_limit", 0),
-                "health_status": health_info["health_status"],
-                "timestamp": datetime.now(UTC).isoformat(),
-            }
-            self.set_shared_state(f"container:{container_id}", container_state, ttl=300)
+            self._stage_container_state(container, stats, health_info, anomalies)
 
             # Publish alert if anomalies detected
             if anomalies:
                 self._publish_health_alert(container, stats, anomalies, health_info)
             else:
                 self.logger.debug(f"Container {container_name} is healthy")
+            return anomalies
         except Exception as e:
             self.logger.error(f"Error checking health of {container_name}: {e}", exc_info=False)
+            return []
+
+    def _record_window(self, container, stats: dict[str, Any]) -> None:
+        """
+        Append a sample to the container's rolling metric window.
+
+        Args:
+            container: Docker container object
+            stats: Container metrics from _get_container_stats
+        """
+        window = self._windows.get(container.id)
+        if window is None:
+            window = MetricWindow(
+                size=self.window_size,
+                alpha=self.ewma_alpha,
+                zscore_limit=self.zscore_threshold,
+            )
+            self._windows[container.id] = window
+
+        window.append(
+            {
+                "cpu_percent": stats["cpu_percent"],
+                "memory_percent": stats["memory_percent"],
+                "network_bytes_per_sec": self._network_rate(stats),
+                "blkio_bytes_per_sec": self._disk_byte_rate(stats),
+                "blkio_ops_per_sec": self._disk_ops_rate(stats),
+            }
+        )
+
+    def _stage_container_state(
+        self,
+        container,
+        stats: dict[str, Any],
+        health_info: dict[str, Any],
+        anomalies: list[dict[str, Any]],
+    ) -> tuple[str, dict[str, Any]]:
+        """
+        Build the container state document and queue it for the next flush.
+
+        This is the only schema written to hemostat:state:container:{id} (or
+        hemostat:state:container:{host}:{id} with several Docker endpoints). Percentages are
+        rounded to one decimal and memory usage quantized to 1 MiB so that idle containers
+        produce identical states between cycles.
+
+        Args:
+            container: Docker container object
+            stats: Container metrics (may be empty for event-driven updates)
+            health_info: Health status information
+            anomalies: Anomalies detected for this sample
+
+        Returns:
+            Tuple of (state key without the hemostat:state: prefix, state document)
+        """
+        container_id = container.short_id
+        docker_host = self._host_of(container)
+        memory_usage = stats.get("memory_usage", 0)
+        container_state = {
+            "container_id": container_id,
+            "container_name": container.name,
+            "docker_host": docker_host,
+            "status": container.status,
+            "cpu_percent": round(stats.get("cpu_percent", 0), 1),
+            "memory_percent": round(stats.get("memory_percent", 0), 1),
+            "memory_usage": memory_usage - memory_usage % STATE_MEMORY_QUANTUM,
+            "memory_limit": stats.get("memory_limit", 0),
+            "health_status": health_info["health_status"],
+            "anomalies": sorted({a["type"] for a in anomalies}),
+            "timestamp": datetime.now(UTC).isoformat(),
+        }
+
+        if self.multi_host:
+            key = f"container:{docker_host}:{container_id}"
+        else:
+            key = f"container:{container_id}"
+        with self._state_lock:
+            self._pending_states[key] = container_state
+        return key, container_state
+
+    def _restage_stopped_states(self) -> None:
+        """
+        Queue the final states of stopped inventory containers for the next flush.
+
+        Stopped containers are not sampled in event-driven mode. Their recorded states are
+        unchanged, so the flush only refreshes the TTL; containers that were already stopped
+        when the inventory was synchronized get a state built from their inspect data once.
+        A fresher state staged for the same key in this cycle takes precedence.
+        """
+        with self._inventory_lock:
+            stopped = {
+                container_id: container
+                for container_id, container in self._inventory.items()
+                if container.status != "running"
+                and (self.shard is None or self.shard.owns(container_id))
+            }
+        with self._state_lock:
+            for container_id in list(self._stopped_states):
+                if container_id not in stopped:
+                    del self._stopped_states[container_id]
+            for key, state in self._stopped_states.values():
+                self._pending_states.setdefault(key, state)
+            unrecorded = [c for c_id, c in stopped.items() if c_id not in self._stopped_states]
+
+        for container in unrecorded:
+            health_info = self._check_health_status(container)
+            anomalies = self._detect_state_anomalies(container, health_info)
+            key, state = self._stage_container_state(container, {}, health_info, anomalies)
+            with self._state_lock:
+                self._stopped_states[container.id] = (key, state)
+
+    def _flush_container_states(self) -> None:
+        """
+        Write all staged container states in a single Redis pipeline.
+
+        Changed states are written with SET ... EX (one command, no TTL gap); states equal
+        to the last written value (ignoring the timestamp, which therefore marks the last
+        change) only get an EXPIRE to refresh their TTL. A failed or missed refresh forces
+        a full write on the next cycle.
+        """
+        with self._state_lock:
+            pending, self._pending_states = self._pending_states, {}
+
+        if not pending:
+            return
+
+        now = time.monotonic()
+        operations = []
+        pipe = self.redis.pipeline(transaction=False)
+
+        for key, state in pending.items():
+            full_key = f"hemostat:state:{key}"
+            comparable = json.dumps(
+                {k: v for k, v in state.items() if k != "timestamp"}, sort_keys=True
+            )
+            written = self._written_states.get(key)
+            if written is not None and written[0] == comparable:
+                pipe.expire(full_key, self.state_ttl)
+            else:
+                pipe.set(full_key, encode(state), ex=self.state_ttl)
+            operations.append((key, comparable))
+
+        try:
+            results = pipe.execute(raise_on_error=False)
+        except redis.RedisError as e:
+            self.logger.error(f"Failed to flush container states: {e}")
+            self._written_states.clear()
+            return
+
+        changed = 0
+        for (key, comparable), result in zip(operations, results, strict=False):
+            previous = self._written_states.get(key)
+            if isinstance(result, Exception) or not result:
+                # EXPIRE on a missing key returns 0: rewrite it next cycle
+                self._written_states.pop(key, None)
+                continue
+            if previous is None or previous[0] != comparable:
+                changed += 1
+            self._written_states[key] = (comparable, now)
+
+        # Forget containers whose state has expired in Redis anyway
+        self._written_states = {
+            key: value
+            for key, value in self._written_states.items()
+            if now - value[1] < self.state_ttl
+        }
+
+        self.logger.debug(
+            f"Flushed {len(pending)} container states ({changed} changed, "
+            f"{len(pending) - changed} TTL refreshes)"
+        )
 
     def _get_container_stats(self, container) -> dict[str, Any] | None:
         """
-        Fetch container metrics using non-streaming stats call.
+        Fetch container metrics for a single container.
 
-        Uses precpu_stats and cpu_stats for CPU calculation without maintaining open streams.
-        This method retrieves a single snapshot of container statistics and calculates
-        CPU percentage using Docker's official formula with precpu_stats to avoid
-        connection leaks from streaming calls.
+        Uses the latest sample from the persistent stream table when
+        MONITOR_STATS_SOURCE=stream, or the direct cgroup reader when
+        MONITOR_STATS_SOURCE=cgroup. Falls back to a non-streaming Docker stats call
+        (precpu_stats and cpu_stats in one snapshot) when neither has data.
 
         Args:
             container: Docker container object to fetch stats for
 
         Returns:
-            Dictionary with keys: cpu_percent, memory_percent, memory_usage, memory_limit,
-            network_rx_bytes, network_tx_bytes, blkio_read_bytes, blkio_write_bytes.
-            Returns None if stats retrieval fails.
+            Dictionary with the keys of _parse_stats plus per-second I/O rates
+            (see _compute_io_rates). Returns None if stats retrieval fails.
         """
         try:
-            # Use non-streaming call to get stats with precpu_stats for CPU calculation
-            stats = container.stats(stream=False)
-
-            # Calculate CPU percentage using Docker's formula with precpu_stats
-            cpu_percent = self._calculate_cpu_percent(stats)
-
-            # Calculate memory percentage
-            memory_stats = stats.get("memory_stats", {})
-            memory_percent = self._calculate_memory_percent(memory_stats)
-
-            # Extract network I/O stats
-            networks = stats.get("networks") or {}
-            network_rx_bytes = 0
-            network_tx_bytes = 0
-            for net_data in networks.values() if networks else []:
-                network_rx_bytes += net_data.get("rx_bytes", 0)
-                network_tx_bytes += net_data.get("tx_bytes", 0)
-
-            # Extract block I/O stats
-            blkio_stats = stats.get("blkio_stats") or {}
-            blkio_read_bytes = 0
-            blkio_write_bytes = 0
-            for stat in (blkio_stats.get("io_service_bytes_recursive") or []):
-                if stat.get("op") == "Read":
-                    blkio_read_bytes += stat.get("value", 0)
-                elif stat.get("op") == "Write":
-                    blkio_write_bytes += stat.get("value", 0)
-
-            metrics = {
-                "cpu_percent": cpu_percent,
-                "memory_percent": memory_percent,
-                "memory_usage": memory_stats.get("usage", 0),
-                "memory_limit": memory_stats.get("limit", 0),
-                "network_rx_bytes": network_rx_bytes,
-                "network_tx_bytes": network_tx_bytes,
-                "blkio_read_bytes": blkio_read_bytes,
-                "blkio_write_bytes": blkio_write_bytes,
-            }
+            stats = None
+            if self.stats_streams is not None:
+                stats = self.stats_streams.latest(container.id, max_age=self.poll_interval)
+            elif self.cgroup_reader is not None and self._is_local(container):
+                pid = (container.attrs.get("State") or {}).get("Pid", 0)
+                stats = self.cgroup_reader.read(container.id, pid)
+                if stats is None:
+                    self.logger.debug(
+                        f"cgroup stats unavailable for {container.name}; using Docker API"
+                    )
+
+            if stats is None:
+                # Use non-streaming call to get stats with precpu_stats for CPU calculation
+                stats = container.stats(stream=False)
 
+            metrics = self._parse_stats(stats)
+            metrics.update(self._compute_io_rates(container.id, metrics))
             return metrics
         except Exception as e:
             self.logger.error(f"Error getting stats for {container.name}: {e}")
             return None
 
+    def _compute_io_rates(self, container_id: str, metrics: dict[str, Any]) -> dict[str, float]:
+        """
+        Turn cumulative network and block I/O counters into per-second rates.
+
+        Keeps only the previous counters per container (O(1) per sample). A counter that
+        went backwards was reset (container restart); its rate is computed as if it
+        restarted from zero. The first sample of a container has zero rates.
+
+        Args:
+            container_id: Full container ID
+            metrics: Parsed metrics with cumulative counters (see IO_RATE_COUNTERS)
+
+        Returns:
+            Dictionary of rate keys (e.g. network_rx_bytes_per_sec) to values
+        """
+        counters = {key: metrics.get(key, 0) for key in IO_RATE_COUNTERS}
+
+        with self._io_lock:
+            now = time.monotonic()
+            previous = self._io_counters.get(container_id)
+
+            if previous is None:
+                rates = dict.fromkeys(IO_RATE_COUNTERS.values(), 0.0)
+            else:
+                previous_time, previous_counters, previous_rates = previous
+                elapsed = now - previous_time
+                if elapsed < MIN_RATE_INTERVAL:
+                    return previous_rates
+
+                rates = {}
+                for key, rate_key in IO_RATE_COUNTERS.items():
+                    delta = counters[key] - previous_counters[key]
+                    if delta < 0:
+                        delta = counters[key]
+                    rates[rate_key] = round(delta / elapsed, 1)
+
+            self._io_counters[container_id] = (now, counters, rates)
+        return rates
+
+    def _is_local(self, container) -> bool:
+        """
+        Check whether a container runs on this machine (cgroup files are only valid there).
+
+        Args:
+            container: Docker container object
+
+        Returns:
+            True if the container's endpoint is local
+        """
+        endpoint = self._endpoints_by_name.get(self._host_of(container))
+        return endpoint is not None and endpoint.is_local
+
+    def _parse_stats(self, stats: dict[str, Any]) -> dict[str, Any]:
+        """
+        Convert a Docker stats API document into the monitor's metrics dictionary.
+
+        Args:
+            stats: Stats document from the Docker API or the cgroup reader
+
+        Returns:
+            Dictionary with keys: cpu_percent, memory_percent, memory_usage, memory_limit,
+            network_rx_bytes, network_tx_bytes, network_rx_packets, network_tx_packets,
+            blkio_read_bytes, blkio_write_bytes, blkio_read_ops, blkio_write_ops
+            (network and block I/O values are cumulative counters)
+        """
+        # Calculate CPU percentage using Docker's formula with precpu_stats
+        cpu_percent = self._calculate_cpu_percent(stats)
+
+        # Calculate memory percentage
+        memory_stats = stats.get("memory_stats", {})
+        memory_percent = self._calculate_memory_percent(memory_stats)
+
+        # Extract network I/O stats
+        networks = stats.get("networks") or {}
+        network_rx_bytes = 0
+        network_tx_bytes = 0
+        network_rx_packets = 0
+        network_tx_packets = 0
+        for net_data in networks.values() if networks else []:
+            network_rx_bytes += net_data.get("rx_bytes", 0)
+            network_tx_bytes += net_data.get("tx_bytes", 0)
+            network_rx_packets += net_data.get("rx_packets", 0)
+            network_tx_packets += net_data.get("tx_packets", 0)
+
+        # Extract block I/O stats (cgroup v1 reports "Read"/"Write", v2 "read"/"write")
+        blkio_stats = stats.get("blkio_stats") or {}
+        blkio_read_bytes = 0
+        blkio_write_bytes = 0
+        for stat in (blkio_stats.get("io_service_bytes_recursive") or []):
+            op = (stat.get("op") or "").lower()
+            if op == "read":
+                blkio_read_bytes += stat.get("value", 0)
+            elif op == "write":
+                blkio_write_bytes += stat.get("value", 0)
+
+        blkio_read_ops = 0
+        blkio_write_ops = 0
+        for stat in (blkio_stats.get("io_serviced_recursive") or []):
+            op = (stat.get("op") or "").lower()
+            if op == "read":
+                blkio_read_ops += stat.get("value", 0)
+            elif op == "write":
+                blkio_write_ops += stat.get("value", 0)
+
+        return {
+            "cpu_percent": cpu_percent,
+            "memory_percent": memory_percent,
+            "memory_usage": memory_stats.get("usage", 0),
+            "memory_limit": memory_stats.get("limit", 0),
+            "network_rx_bytes": network_rx_bytes,
+            "network_tx_bytes": network_tx_bytes,
+            "network_rx_packets": network_rx_packets,
+            "network_tx_packets": network_tx_packets,
+            "blkio_read_bytes": blkio_read_bytes,
+            "blkio_write_bytes": blkio_write_bytes,
+            "blkio_read_ops": blkio_read_ops,
+            "blkio_write_ops": blkio_write_ops,
+        }
+
     def _check_health_status(self, container) -> dict[str, Any]:
         """
         Extract health status, exit code, and restart count from container.
@@ -304,11 +1338,34 @@ class ContainerMonitor(HemoStatAgent):
         - high: metric > threshold
         - medium: metric > 80% of threshold
 
+        In 'sustained' detection mode CPU/memory anomalies come from the rolling window
+        instead (see _detect_sustained_anomalies).
+
         Args:
             container: Docker container object
             stats: Container metrics dictionary
             health_info: Health status information
 
+        Returns:
+            List of detected anomalies with type, severity, and details
+        """
+        if self.detection_mode == "sustained":
+            anomalies = self._detect_sustained_anomalies(container, stats)
+        else:
+            anomalies = self._detect_threshold_anomalies(stats)
+            anomalies.extend(self._detect_io_anomalies(stats))
+
+        anomalies.extend(self._detect_state_anomalies(container, health_info))
+
+        return anomalies
+
+    def _detect_threshold_anomalies(self, stats: dict[str, Any]) -> list[dict[str, Any]]:
+        """
+        Compare a single sample's CPU and memory against the static thresholds.
+
+        Args:
+            stats: Container metrics dictionary
+
         Returns:
             List of detected anomalies with type, severity, and details
         """
@@ -358,6 +1415,191 @@ class ContainerMonitor(HemoStatAgent):
                 }
             )
 
+        return anomalies
+
+    def _io_checks(self, stats: dict[str, Any]) -> list[tuple[str, str, float, float]]:
+        """
+        List the enabled I/O rate checks for a sample.
+
+        Args:
+            stats: Container metrics dictionary with per-second rates
+
+        Returns:
+            Tuples of (anomaly type, window metric, current rate, threshold)
+        """
+        checks = []
+        if self.threshold_network_bytes > 0:
+            checks.append(
+                (
+                    "high_network_io",
+                    "network_bytes_per_sec",
+                    self._network_rate(stats),
+                    self.threshold_network_bytes,
+                )
+            )
+        if self.threshold_disk_bytes > 0:
+            checks.append(
+                (
+                    "high_disk_io",
+                    "blkio_bytes_per_sec",
+                    self._disk_byte_rate(stats),
+                    self.threshold_disk_bytes,
+                )
+            )
+        if self.threshold_disk_ops > 0:
+            checks.append(
+                (
+                    "high_disk_io",
+                    "blkio_ops_per_sec",
+                    self._disk_ops_rate(stats),
+                    self.threshold_disk_ops,
+                )
+            )
+        return checks
+
+    def _detect_io_anomalies(self, stats: dict[str, Any]) -> list[dict[str, Any]]:
+        """
+        Compare a single sample's network and block I/O rates against their thresholds.
+
+        Severity: critical above 2x the threshold, high above it, medium above 80% of it.
+        Disk bytes and ops share the high_disk_io type; only the more severe is reported.
+
+        Args:
+            stats: Container metrics dictionary with per-second rates
+
+        Returns:
+            List of detected anomalies with type, severity, and details
+        """
+        found: dict[str, dict[str, Any]] = {}
+        for anomaly_type, metric, value, threshold in self._io_checks(stats):
+            if value > 2 * threshold:
+                severity = "critical"
+            elif value > threshold:
+                severity = "high"
+            elif value > 0.8 * threshold:
+                severity = "medium"
+            else:
+                continue
+            self._keep_most_severe(
+                found,
+                {
+                    "type": anomaly_type,
+                    "severity": severity,
+                    "metric": metric,
+                    "threshold": threshold,
+                    "actual": value,
+                },
+            )
+        return list(found.values())
+
+    @staticmethod
+    def _keep_most_severe(found: dict[str, dict[str, Any]], anomaly: dict[str, Any]) -> None:
+        """Record an anomaly unless one of the same type with higher severity exists."""
+        rank = {"medium": 0, "high": 1, "critical": 2}
+        existing = found.get(anomaly["type"])
+        if existing is None or rank[anomaly["severity"]] > rank[existing["severity"]]:
+            found[anomaly["type"]] = anomaly
+
+    @staticmethod
+    def _network_rate(stats: dict[str, Any]) -> float:
+        """Total network throughput (rx + tx) in bytes per second."""
+        return stats.get("network_rx_bytes_per_sec", 0.0) + stats.get(
+            "network_tx_bytes_per_sec", 0.0
+        )
+
+    @staticmethod
+    def _disk_byte_rate(stats: dict[str, Any]) -> float:
+        """Total block I/O throughput (read + write) in bytes per second."""
+        return stats.get("blkio_read_bytes_per_sec", 0.0) + stats.get(
+            "blkio_write_bytes_per_sec", 0.0
+        )
+
+    @staticmethod
+    def _disk_ops_rate(stats: dict[str, Any]) -> float:
+        """Total block I/O operations (read + write) per second."""
+        return stats.get("blkio_read_ops_per_sec", 0.0) + stats.get(
+            "blkio_write_ops_per_sec", 0.0
+        )
+
+    def _detect_sustained_anomalies(
+        self, container, stats: dict[str, Any]
+    ) -> list[dict[str, Any]]:
+        """
+        Detect CPU, memory and I/O rate anomalies that persist across the rolling window.
+
+        - critical/high: the last MONITOR_SUSTAIN_SAMPLES samples all exceed the threshold
+          (critical if the current value is above 95%, or 2x the threshold for I/O rates)
+        - medium: the last MONITOR_SUSTAIN_SAMPLES samples all exceed 80% of the threshold
+          and deviate from the container's EWMA baseline by z >= MONITOR_ZSCORE_THRESHOLD
+
+        A single spike therefore never alerts, and a container that normally runs close
+        to its threshold doesn't produce medium alerts for its usual level.
+
+        Args:
+            container: Docker container object
+            stats: Container metrics dictionary
+
+        Returns:
+            List of detected anomalies with type, severity, and details
+        """
+        window = self._windows.get(container.id)
+        if window is None:
+            return []
+
+        # (type, window metric, current value, threshold, critical level)
+        checks = [
+            ("high_cpu", "cpu_percent", stats["cpu_percent"], self.threshold_cpu, 95),
+            ("high_memory", "memory_percent", stats["memory_percent"], self.threshold_memory, 95),
+        ]
+        checks += [
+            (anomaly_type, metric, value, threshold, 2 * threshold)
+            for anomaly_type, metric, value, threshold in self._io_checks(stats)
+        ]
+
+        found: dict[str, dict[str, Any]] = {}
+        for anomaly_type, metric, value, threshold, critical in checks:
+            if window.run_above(metric, threshold) >= self.sustain_samples:
+                severity = "critical" if value > critical else "high"
+            elif (
+                window.run_above(metric, 0.8 * threshold) >= self.sustain_samples
+                and window.deviation_run(metric) >= self.sustain_samples
+            ):
+                severity = "medium"
+            else:
+                continue
+
+            self._keep_most_severe(
+                found,
+                {
+                    "type": anomaly_type,
+                    "severity": severity,
+                    "threshold": threshold,
+                    "actual": round(value, 2),
+                    "baseline": round(window.baseline(metric), 2),
+                    "zscore": round(window.zscore(metric), 2),
+                    "sustained_samples": self.sustain_samples,
+                },
+            )
+
+        return list(found.values())
+
+    def _detect_state_anomalies(
+        self, container, health_info: dict[str, Any]
+    ) -> list[dict[str, Any]]:
+        """
+        Detect anomalies in container lifecycle state (health, exit code, restarts).
+
+        Used both by the polling path and by the Docker events listener.
+
+        Args:
+            container: Docker container object
+            health_info: Health status information
+
+        Returns:
+            List of detected anomalies with type, severity, and details
+        """
+        anomalies = []
+
         # Health status anomaly
         if health_info["health_status"] not in ["healthy", "unknown"]:
             anomalies.append(
@@ -414,6 +1656,7 @@ class ContainerMonitor(HemoStatAgent):
             payload = {
                 "container_id": container_id,
                 "container_name": container_name,
+                "docker_host": self._host_of(container),
                 "image": container.image.tags[0] if container.image.tags else "unknown",
                 "status": container.status,
                 "metrics": stats,
@@ -423,12 +1666,9 @@ class ContainerMonitor(HemoStatAgent):
                 "restart_count": health_info["restart_count"],
             }
 
-            # Publish event
+            # Publish event (container state is written by the cycle flush, not here)
             self.publish_event("hemostat:health_alert", "container_unhealthy", payload)
 
-            # Update shared state with TTL
-            self.set_shared_state(f"container:{container_id}", stats, ttl=300)
-
             self.logger.warning(
                 f"Health alert published for {container_name}: {len(anomalies)} anomalies detected"
             )
@@ -514,4 +1754,31 @@ class ContainerMonitor(HemoStatAgent):
     def stop(self) -> None:
         """Stop the monitor agent gracefully."""
         self._running = False
+
+        if self.shard is not None:
+            self.shard.stop()
+
+        for name, stream in list(self._events_streams.items()):
+            # Closing the stream unblocks the events listener thread
+            try:
+                stream.close()
+            except Exception as e:
+                self.logger.debug(f"Error closing Docker events stream of {name}: {e}")
+        self._events_streams.clear()
+
+        if self.stats_streams is not None:
+            self.stats_streams.close_all()
+
+        if self._collection_executor is not None:
+            # Don't wait on in-flight Docker calls; they finish on their own
+            self._collection_executor.shutdown(wait=False, cancel_futures=True)
+            self._collection_executor = None
+
+        if self._listing_executor is not None:
+            self._listing_executor.shutdown(wait=False, cancel_futures=True)
+            self._listing_executor = None
+
+        for endpoint in self.endpoints:
+            endpoint.close()
+
         self.logger.info("Monitor agent stopped")
@@ -0,0 +1,197 @@
+"""
+HemoStat Monitor - Adaptive Polling Scheduler
+
+Keeps a priority queue of next-due sampling times per container. Containers close to
+their thresholds or with recent anomalies are sampled at the minimum interval, healthy
+containers back off geometrically up to a ceiling, and a global token bucket caps the
+number of samples per second so Docker daemon load stays bounded as the fleet grows.
+"""
+
+import heapq
+import time
+
+# Pressure (metric / threshold) from which a container is sampled at the minimum interval
+NEAR_THRESHOLD_PRESSURE = 0.8
+# Pressure below which a container is considered stable and allowed to back off
+STABLE_PRESSURE = 0.5
+
+
+class AdaptivePollScheduler:
+    """
+    Per-container adaptive sampling cadence with a global sampling budget.
+
+    The heap holds (due_time, container_id) entries; superseded entries are discarded
+    lazily when popped by comparing against the authoritative due-time map.
+    """
+
+    def __init__(
+        self,
+        base_interval: float,
+        min_interval: float,
+        max_interval: float,
+        sample_budget: float = 0.0,
+        backoff_factor: float = 1.5,
+    ):
+        """
+        Initialize the scheduler.
+
+        Args:
+            base_interval: Interval for containers that are neither stable nor under pressure
+            min_interval: Interval for containers near thresholds or with recent anomalies
+            max_interval: Ceiling for stable containers backing off
+            sample_budget: Maximum samples per second across all containers (0 = unlimited)
+            backoff_factor: Multiplier applied to a stable container's interval per sample
+        """
+        self.base_interval = base_interval
+        self.min_interval = min(min_interval, base_interval)
+        self.max_interval = max(max_interval, base_interval)
+        self.sample_budget = sample_budget
+        self.backoff_factor = backoff_factor
+
+        self._heap: list[tuple[float, str]] = []
+        self._due: dict[str, float] = {}
+        self._intervals: dict[str, float] = {}
+        self._last_anomaly: dict[str, float] = {}
+
+        # Token bucket holds at most one second worth of samples
+        self._tokens = max(1.0, sample_budget)
+        self._last_refill = time.monotonic()
+
+    def sync(self, container_ids: set[str], now: float | None = None) -> None:
+        """
+        Register new containers (due immediately) and forget containers that are gone.
+
+        Args:
+            container_ids: IDs of all currently monitored containers
+            now: Current time.monotonic() value (defaults to now)
+        """
+        now = time.monotonic() if now is None else now
+
+        for container_id in container_ids:
+            if container_id not in self._due:
+                self._schedule(container_id, now, self.base_interval)
+
+        for container_id in list(self._due):
+            if container_id not in container_ids:
+                self._due.pop(container_id, None)
+                self._intervals.pop(container_id, None)
+                self._last_anomaly.pop(container_id, None)
+
+    def pop_due(self, now: float | None = None) -> list[str]:
+        """
+        Pop containers whose sample is due, within the remaining sampling budget.
+
+        Containers that are due but exceed the budget stay queued and are returned by a
+        later call, oldest first.
+
+        Args:
+            now: Current time.monotonic() value (defaults to now)
+
+        Returns:
+            IDs of containers to sample now
+        """
+        now = time.monotonic() if now is None else now
+        self._refill(now)
+
+        due: list[str] = []
+        while self._heap and self._heap[0][0] <= now:
+            if self.sample_budget > 0 and self._tokens < 1.0:
+                break
+
+            due_time, container_id = heapq.heappop(self._heap)
+            if self._due.get(container_id) != due_time:
+                # Superseded or removed entry
+                continue
+
+            del self._due[container_id]
+            due.append(container_id)
+            if self.sample_budget > 0:
+                self._tokens -= 1.0
+
+        return due
+
+    def record(
+        self,
+        container_id: str,
+        pressure: float | None,
+        anomalous: bool,
+        now: float | None = None,
+    ) -> float:
+        """
+        Reschedule a container after a sampling attempt.
+
+        Args:
+            container_id: Container that was sampled
+            pressure: Highest metric/threshold ratio of the sample, or None if sampling failed
+            anomalous: Whether the sample produced anomalies
+            now: Current time.monotonic() value (defaults to now)
+
+        Returns:
+            Interval in seconds until the container's next sample
+        """
+        now = time.monotonic() if now is None else now
+        previous = self._intervals.get(container_id, self.base_interval)
+
+        if anomalous:
+            self._last_anomaly[container_id] = now
+
+        recent_anomaly = now - self._last_anomaly.get(container_id, float("-inf")) < (
+            self.max_interval
+        )
+
+        if pressure is None:
+            interval = self.base_interval
+        elif recent_anomaly or pressure >= NEAR_THRESHOLD_PRESSURE:
+            interval = self.min_interval
+        elif pressure >= STABLE_PRESSURE:
+            interval = self.base_interval
+        else:
+            backed_off = max(previous, self.base_interval) * self.backoff_factor
+            interval = min(self.max_interval, backed_off)
+
+        self._schedule(container_id, now, interval)
+        return interval
+
+    def seconds_until_due(self, now: float | None = None) -> float:
+        """
+        Time until the next container can be sampled.
+
+        Accounts for the sampling budget: when a container is already due but the token
+        bucket is empty, this is the time until the next token arrives.
+
+        Args:
+            now: Current time.monotonic() value (defaults to now)
+
+        Returns:
+            Seconds until the next sample may be taken, or base_interval if nothing is scheduled
+        """
+        now = time.monotonic() if now is None else now
+
+        # Drop superseded entries so the head reflects a real due time
+        while self._heap and self._due.get(self._heap[0][1]) != self._heap[0][0]:
+            heapq.heappop(self._heap)
+
+        if not self._heap:
+            return self.base_interval
+
+        wait = max(0.0, self._heap[0][0] - now)
+        if self.sample_budget > 0:
+            self._refill(now)
+            wait = max(wait, (1.0 - self._tokens) / self.sample_budget)
+        return wait
+
+    def _schedule(self, container_id: str, now: float, interval: float) -> None:
+        """Push a container's next due time onto the heap."""
+        due_time = now + interval if container_id in self._intervals else now
+        self._intervals[container_id] = interval
+        self._due[container_id] = due_time
+        heapq.heappush(self._heap, (due_time, container_id))
+
+    def _refill(self, now: float) -> None:
+        """Add tokens for the time elapsed since the last refill."""
+        if self.sample_budget <= 0:
+            return
+        elapsed = max(0.0, now - self._last_refill)
+        self._last_refill = now
+        capacity = max(1.0, self.sample_budget)
+        self._tokens = min(capacity, self._tokens + elapsed * self.sample_budget)
@@ -0,0 +1,146 @@
+"""
+HemoStat Monitor - Replica Sharding
+
+Splits the monitored container set across several monitor replicas. Each replica
+heartbeats into a Redis sorted set (member = replica ID, score = last heartbeat time);
+replicas whose heartbeat is older than the TTL are dropped from the set. Every replica
+builds the same consistent hash ring from the live members, so each container ID maps to
+exactly one replica and only ~1/N of the containers move when a replica joins or dies.
+"""
+
+import bisect
+import hashlib
+import threading
+
+import redis
+
+from agents.logger import HemoStatLogger
+
+REPLICAS_KEY = "hemostat:monitor:replicas"
+
+
+def _hash(value: str) -> int:
+    """Stable 64-bit hash used for ring positions (identical across processes and hosts)."""
+    return int.from_bytes(hashlib.sha1(value.encode()).digest()[:8], "big")
+
+
+class ShardCoordinator:
+    """
+    Tracks live monitor replicas in Redis and decides which containers this replica owns.
+
+    The ring is rebuilt only when membership changes and is swapped in atomically, so
+    owns() can be called from any thread without locking.
+    """
+
+    def __init__(
+        self,
+        redis_client: redis.Redis,
+        replica_id: str,
+        heartbeat_ttl: float = 15.0,
+        virtual_nodes: int = 64,
+    ):
+        """
+        Initialize the coordinator.
+
+        Args:
+            redis_client: Redis client (decode_responses=True)
+            replica_id: Unique, stable identifier of this replica
+            heartbeat_ttl: Seconds without a heartbeat after which a replica is considered dead
+            virtual_nodes: Ring positions per replica (more = more even split)
+        """
+        self.logger = HemoStatLogger.get_logger("monitor")
+        self.redis = redis_client
+        self.replica_id = replica_id
+        self.heartbeat_ttl = heartbeat_ttl
+        self.virtual_nodes = max(1, virtual_nodes)
+
+        self.members: tuple[str, ...] = ()
+        self._ring: tuple[list[int], list[str]] = ([], [])
+        self._build_ring((replica_id,))
+
+        self._stop_event = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    def start(self) -> None:
+        """Send a first heartbeat and keep heartbeating on a background thread."""
+        self.heartbeat()
+        self._stop_event.clear()
+        self._thread = threading.Thread(
+            target=self._heartbeat_loop, name="monitor-shard-heartbeat", daemon=True
+        )
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Stop heartbeating and leave the ring so other replicas rebalance immediately."""
+        self._stop_event.set()
+        # A heartbeat still in flight would re-add this replica after the ZREM
+        if self._thread is not None:
+            self._thread.join(timeout=5)
+            self._thread = None
+        try:
+            self.redis.zrem(REPLICAS_KEY, self.replica_id)
+        except redis.RedisError as e:
+            self.logger.debug(f"Failed to deregister replica {self.replica_id}: {e}")
+
+    def heartbeat(self) -> None:
+        """
+        Refresh this replica's heartbeat, expire dead replicas and rebuild the ring if needed.
+
+        Uses the Redis server clock so heartbeat ages do not depend on replica clock skew.
+        On Redis errors the previous ring is kept.
+        """
+        try:
+            seconds, microseconds = self.redis.time()
+            now = seconds + microseconds / 1_000_000
+
+            pipe = self.redis.pipeline(transaction=False)
+            pipe.zadd(REPLICAS_KEY, {self.replica_id: now})
+            pipe.zremrangebyscore(REPLICAS_KEY, "-inf", now - self.heartbeat_ttl)
+            pipe.zrange(REPLICAS_KEY, 0, -1)
+            pipe.expire(REPLICAS_KEY, int(self.heartbeat_ttl * 4))
+            members = pipe.execute()[2]
+        except redis.RedisError as e:
+            self.logger.warning(f"Shard heartbeat failed, keeping previous membership: {e}")
+            return
+
+        members = tuple(sorted(set(members) | {self.replica_id}))
+        if members != self.members:
+            self.logger.info(
+                f"Shard membership changed: {len(members)} replicas {list(members)}; rebalancing"
+            )
+            self._build_ring(members)
+
+    def owns(self, container_id: str) -> bool:
+        """
+        Check whether this replica is responsible for a container.
+
+        Args:
+            container_id: Full container ID (the same form must be used on every replica)
+
+        Returns:
+            True if the container maps to this replica on the ring
+        """
+        positions, owners = self._ring
+        index = bisect.bisect(positions, _hash(container_id)) % len(positions)
+        return owners[index] == self.replica_id
+
+    def _build_ring(self, members: tuple[str, ...]) -> None:
+        """
+        Build ring positions for the given members and swap them in.
+
+        Args:
+            members: Sorted tuple of live replica IDs
+        """
+        points = sorted(
+            (_hash(f"{member}#{vnode}"), member)
+            for member in members
+            for vnode in range(self.virtual_nodes)
+        )
+        self._ring = ([point for point, _ in points], [member for _, member in points])
+        self.members = members
+
+    def _heartbeat_loop(self) -> None:
+        """Heartbeat three times per TTL until stopped."""
+        interval = max(1.0, self.heartbeat_ttl / 3)
+        while not self._stop_event.wait(interval):
+            self.heartbeat()
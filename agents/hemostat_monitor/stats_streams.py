@@ -0,0 +1,198 @@
+"""
+HemoStat Monitor - Persistent Stats Streams
+
+Keeps one long-lived streaming stats connection per running container and records the
+most recent sample of each in a shared latest-sample table. The monitor's poll cycle reads
+from the table instead of paying a one-shot stats round trip per container, so sampling
+latency no longer grows with the number of containers.
+"""
+
+import threading
+import time
+from typing import Any
+
+from agents.logger import HemoStatLogger
+
+
+class StatsStreamSupervisor:
+    """
+    Opens, tracks and closes per-container stats streams.
+
+    Each stream runs on its own daemon thread and writes every decoded stats document into
+    the latest-sample table. The supervisor is reconciled against the current container
+    list once per cycle: streams are opened for new running containers (up to a cap),
+    closed for containers that stopped or disappeared, and restarted when they go stale.
+    """
+
+    def __init__(self, max_streams: int = 200, stale_after: float = 15.0):
+        """
+        Initialize the supervisor.
+
+        Args:
+            max_streams: Maximum number of stream threads alive at any time (including
+                streams that are still shutting down)
+            stale_after: Seconds without a sample after which a stream is restarted
+        """
+        self.logger = HemoStatLogger.get_logger("monitor")
+        self.max_streams = max_streams
+        self.stale_after = stale_after
+
+        self._lock = threading.Lock()
+        self._streams: dict[str, dict[str, Any]] = {}
+        self._closing: list[threading.Thread] = []
+        self._samples: dict[str, tuple[float, dict[str, Any]]] = {}
+
+    def sync(self, containers: list) -> None:
+        """
+        Reconcile open streams with the containers currently being monitored.
+
+        Args:
+            containers: Docker container objects monitored this cycle
+        """
+        running = {c.id: c for c in containers if c.status == "running"}
+        now = time.monotonic()
+
+        with self._lock:
+            # Forget threads that have finished shutting down
+            self._closing = [t for t in self._closing if t.is_alive()]
+
+            for container_id, stream in list(self._streams.items()):
+                thread = stream["thread"]
+                last_sample = self._samples.get(container_id, (stream["opened_at"], {}))[0]
+
+                if container_id not in running:
+                    self._close_locked(container_id)
+                elif not thread.is_alive():
+                    # Stream ended on its own (daemon error, container restart)
+                    self._streams.pop(container_id, None)
+                elif now - last_sample > self.stale_after:
+                    self.logger.warning(
+                        f"Stats stream for {stream['name']} stale for "
+                        f"{now - last_sample:.0f}s; reopening"
+                    )
+                    self._close_locked(container_id)
+
+            # Samples of containers that are gone are no longer useful
+            for container_id in list(self._samples):
+                if container_id not in running:
+                    self._samples.pop(container_id, None)
+
+            capacity = self.max_streams - len(self._streams) - len(self._closing)
+            missing = [c for cid, c in running.items() if cid not in self._streams]
+            if len(missing) > capacity:
+                self.logger.warning(
+                    f"Stats stream cap reached ({self.max_streams}); "
+                    f"{len(missing) - max(0, capacity)} containers use one-shot stats"
+                )
+
+            for container in missing[: max(0, capacity)]:
+                self._open_locked(container)
+
+    def latest(self, container_id: str, max_age: float) -> dict[str, Any] | None:
+        """
+        Return the most recent stats document for a container.
+
+        Args:
+            container_id: Full container ID
+            max_age: Maximum acceptable sample age in seconds
+
+        Returns:
+            Docker stats document, or None if no sufficiently fresh sample exists
+        """
+        with self._lock:
+            entry = self._samples.get(container_id)
+        if entry is None:
+            return None
+
+        sampled_at, stats = entry
+        if time.monotonic() - sampled_at > max_age:
+            return None
+        return stats
+
+    @property
+    def open_streams(self) -> int:
+        """
+        Number of streams currently tracked as open.
+
+        Returns:
+            Count of open streams
+        """
+        with self._lock:
+            return len(self._streams)
+
+    def close_all(self) -> None:
+        """Signal every stream to close. Threads exit after their next sample."""
+        with self._lock:
+            for container_id in list(self._streams):
+                self._close_locked(container_id)
+            self._samples.clear()
+
+    def _open_locked(self, container) -> None:
+        """
+        Start a stream thread for a container. Caller must hold the lock.
+
+        Args:
+            container: Docker container object
+        """
+        stop_event = threading.Event()
+        thread = threading.Thread(
+            target=self._run_stream,
+            args=(container, stop_event),
+            name=f"stats-stream-{container.short_id}",
+            daemon=True,
+        )
+        self._streams[container.id] = {
+            "thread": thread,
+            "stop": stop_event,
+            "name": container.name,
+            "opened_at": time.monotonic(),
+        }
+        thread.start()
+        self.logger.debug(f"Opened stats stream for {container.name}")
+
+    def _close_locked(self, container_id: str) -> None:
+        """
+        Signal a stream to close and track its thread until it exits. Caller must hold the lock.
+
+        Args:
+            container_id: Full container ID
+        """
+        stream = self._streams.pop(container_id, None)
+        if stream is None:
+            return
+        stream["stop"].set()
+        if stream["thread"].is_alive():
+            self._closing.append(stream["thread"])
+        self.logger.debug(f"Closing stats stream for {stream['name']}")
+
+    def _run_stream(self, container, stop_event: threading.Event) -> None:
+        """
+        Consume a container's stats stream until stopped or the stream ends.
+
+        The generator is closed on this thread when the loop exits so the underlying HTTP
+        response (and its pooled connection) is released.
+
+        Args:
+            container: Docker container object
+            stop_event: Set by the supervisor to request shutdown
+        """
+        stream = None
+        try:
+            stream = container.stats(stream=True, decode=True)
+            for stats in stream:
+                if stop_event.is_set():
+                    break
+                with self._lock:
+                    # Ignore late samples from a stream that has been replaced
+                    current = self._streams.get(container.id)
+                    if current is not None and current["stop"] is stop_event:
+                        self._samples[container.id] = (time.monotonic(), stats)
+        except Exception as e:
+            if not stop_event.is_set():
+                self.logger.debug(f"Stats stream for {container.name} ended: {e}")
+        finally:
+            if stream is not None:
+                try:
+                    stream.close()
+                except Exception as e:
+                    self.logger.debug(f"Error closing stats stream for {container.name}: {e}")
@@ -59,6 +59,14 @@ class ContainerResponder(HemoStatAgent):
             os.getenv("RESPONDER_ENFORCE_EXEC_ALLOWLIST", "false").lower() == "true"
         )
 
+        # Cache remediation history and circuit breaker reads; a request reads each of
+        # them several times. RESPONDER_STATE_CACHE_SIZE=0 disables the cache
+        state_cache_size = int(os.getenv("RESPONDER_STATE_CACHE_SIZE", "1024"))
+        if state_cache_size > 0:
+            self.enable_state_cache(
+                state_cache_size, float(os.getenv("RESPONDER_STATE_CACHE_TTL", "30"))
+            )
+
         # Subscribe to remediation channel
         self.subscribe_to_channel("hemostat:remediation_needed", self._handle_remediation_request)
 
@@ -0,0 +1,325 @@
+"""
+HemoStat Agent Instrumentation
+
+Per-channel Prometheus metrics for the message path of every agent. They show which stage
+is slow without attaching a profiler:
+
+- hemostat_agent_messages_received_total:   messages read from a channel
+- hemostat_agent_decode_seconds:            time to deserialize a message
+- hemostat_agent_queue_wait_seconds:        time a message waited for a worker (dispatch
+                                            pool or async lane) before its callback ran
+- hemostat_agent_callback_seconds:          callback run time
+- hemostat_agent_callback_errors_total:     callbacks that raised
+- hemostat_agent_publish_seconds:           publish latency, including retries
+- hemostat_agent_publish_retries_total:     publish attempts that failed and were retried
+- hemostat_agent_publish_failures_total:    events that could not be published
+
+Runtime gauges are collected on scrape: Redis pool connections, dispatch queue depth,
+in-flight messages, shared state cache hits, agent-specific queues and cache lookups, and
+transport reconnects.
+
+prometheus_client is optional. Without it, or with AGENT_METRICS_PORT=0 (the default),
+recording is a no-op. All agents in a process share one set of metrics, told apart by the
+'agent' label, and one HTTP server per port.
+"""
+
+import threading
+from collections.abc import Callable
+from typing import Any
+
+from agents.logger import HemoStatLogger
+
+try:
+    from prometheus_client import REGISTRY, Counter, Histogram, start_http_server
+    from prometheus_client.core import CounterMetricFamily, GaugeMetricFamily
+
+    PROMETHEUS_AVAILABLE = True
+except ImportError:
+    PROMETHEUS_AVAILABLE = False
+
+logger = HemoStatLogger.get_logger("instrumentation")
+
+# Buckets from 100us (decode, in-memory publish) up to a minute (LLM calls, remediation)
+LATENCY_BUCKETS = (
+    0.0001,
+    0.00025,
+    0.0005,
+    0.001,
+    0.0025,
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+    30.0,
+    60.0,
+)
+
+_lock = threading.Lock()
+_metrics: dict[str, Any] = {}
+_collector: "_RuntimeCollector | None" = None
+_servers: set[int] = set()
+
+
+def _message_metrics() -> dict[str, Any]:
+    """Create (once per process) the shared message path metrics."""
+    with _lock:
+        if not _metrics:
+            labels = ["agent", "channel"]
+            _metrics.update(
+                received=Counter(
+                    "hemostat_agent_messages_received_total",
+                    "Messages received per channel",
+                    labels,
+                ),
+                decode=Histogram(
+                    "hemostat_agent_decode_seconds",
+                    "Message deserialization time in seconds",
+                    labels,
+                    buckets=LATENCY_BUCKETS,
+                ),
+                queue_wait=Histogram(
+                    "hemostat_agent_queue_wait_seconds",
+                    "Time a message waited for a worker in seconds",
+                    labels,
+                    buckets=LATENCY_BUCKETS,
+                ),
+                callback=Histogram(
+                    "hemostat_agent_callback_seconds",
+                    "Message callback duration in seconds",
+                    labels,
+                    buckets=LATENCY_BUCKETS,
+                ),
+                callback_errors=Counter(
+                    "hemostat_agent_callback_errors_total",
+                    "Message callbacks that raised an exception",
+                    labels,
+                ),
+                publish=Histogram(
+                    "hemostat_agent_publish_seconds",
+                    "Event publish latency in seconds, including retries",
+                    labels,
+                    buckets=LATENCY_BUCKETS,
+                ),
+                publish_retries=Counter(
+                    "hemostat_agent_publish_retries_total",
+                    "Publish attempts that failed and were retried",
+                    labels,
+                ),
+                publish_failures=Counter(
+                    "hemostat_agent_publish_failures_total",
+                    "Events that could not be published",
+                    labels,
+                ),
+            )
+        return _metrics
+
+
+class _RuntimeCollector:
+    """Collects runtime gauges from every instrumented agent at scrape time."""
+
+    def __init__(self):
+        self.sources: dict[str, Callable[[], dict[str, Any]]] = {}
+
+    def collect(self):
+        pools = GaugeMetricFamily(
+            "hemostat_agent_redis_pool_connections",
+            "Redis pool connections by state",
+            labels=["agent", "pool", "state"],
+        )
+        dispatch = GaugeMetricFamily(
+            "hemostat_agent_dispatch_messages",
+            "Messages queued for or running on the dispatch pool",
+            labels=["agent", "state"],
+        )
+        in_flight = GaugeMetricFamily(
+            "hemostat_agent_messages_in_flight",
+            "Messages being handled by an async agent",
+            labels=["agent"],
+        )
+        queues = GaugeMetricFamily(
+            "hemostat_agent_queue_messages",
+            "Work items of agent-specific queues by state",
+            labels=["agent", "queue", "state"],
+        )
+        cache = CounterMetricFamily(
+            "hemostat_agent_state_cache_lookups",
+            "Shared state cache lookups by result",
+            labels=["agent", "result"],
+        )
+        caches = CounterMetricFamily(
+            "hemostat_agent_cache_lookups",
+            "Agent-specific cache lookups by result",
+            labels=["agent", "cache", "result"],
+        )
+        reconnects = CounterMetricFamily(
+            "hemostat_agent_reconnects",
+            "Listener reconnects after Redis connection loss",
+            labels=["agent", "transport"],
+        )
+
+        for agent, source in list(self.sources.items()):
+            try:
+                stats = source()
+            except Exception as e:
+                logger.debug(f"Runtime stats of '{agent}' unavailable: {e!s}")
+                continue
+            for pool, usage in stats.get("pools", {}).items():
+                for state in ("in_use", "idle", "max"):
+                    pools.add_metric([agent, pool, state], usage.get(state, 0))
+            if stats.get("dispatch"):
+                for state in ("queued", "running"):
+                    dispatch.add_metric([agent, state], stats["dispatch"][state])
+            if "in_flight" in stats:
+                in_flight.add_metric([agent], stats["in_flight"])
+            if stats.get("state_cache"):
+                cache.add_metric([agent, "hit"], stats["state_cache"]["hits"])
+                cache.add_metric([agent, "miss"], stats["state_cache"]["misses"])
+            for name, states in stats.get("queues", {}).items():
+                for state, count in states.items():
+                    queues.add_metric([agent, name, state], count)
+            for name, results in stats.get("caches", {}).items():
+                for result, count in results.items():
+                    caches.add_metric([agent, name, result], count)
+            for transport, count in stats.get("reconnects", {}).items():
+                reconnects.add_metric([agent, transport], count)
+
+        yield from (pools, dispatch, in_flight, queues, cache, caches, reconnects)
+
+    def describe(self):
+        # Metric families are created per scrape; nothing to check at registration
+        return []
+
+
+class AgentInstrumentation:
+    """
+    Records message path metrics of one agent.
+
+    Every recording method returns immediately while instrumentation is disabled, so the
+    agent base calls them unconditionally.
+    """
+
+    def __init__(self, agent_name: str):
+        """
+        Initialize disabled instrumentation.
+
+        Args:
+            agent_name: Agent name, used as the 'agent' label
+        """
+        self.agent_name = agent_name
+        self.enabled = False
+        self._children: dict[tuple[str, str], Any] = {}
+
+    def enable(
+        self,
+        port: int = 0,
+        runtime_stats: Callable[[], dict[str, Any]] | None = None,
+    ) -> bool:
+        """
+        Start recording, and serve /metrics on a port unless already served.
+
+        Args:
+            port: HTTP port of the Prometheus endpoint (0 = record only; for agents whose
+                process already serves the default registry, like the Metrics Exporter)
+            runtime_stats: Callable returning the agent's runtime statistics (keys: pools,
+                dispatch, in_flight, state_cache, queues, caches, reconnects), read on every
+                scrape; queues maps a queue name to item counts by state, caches maps a cache
+                name to lookup counts by result
+
+        Returns:
+            True if instrumentation is enabled, False if prometheus_client is missing
+        """
+        global _collector
+        if not PROMETHEUS_AVAILABLE:
+            logger.warning("prometheus_client is not installed; agent metrics disabled")
+            return False
+
+        self._metrics = _message_metrics()
+        with _lock:
+            if runtime_stats is not None:
+                if _collector is None:
+                    _collector = _RuntimeCollector()
+                    REGISTRY.register(_collector)
+                _collector.sources[self.agent_name] = runtime_stats
+            if port and port not in _servers:
+                start_http_server(port)
+                _servers.add(port)
+                logger.info(f"Serving agent metrics on :{port}/metrics")
+        self.enabled = True
+        return True
+
+    def disable(self) -> None:
+        """Stop recording and drop this agent's runtime gauges."""
+        self.enabled = False
+        with _lock:
+            if _collector is not None:
+                _collector.sources.pop(self.agent_name, None)
+
+    def received(self, channel: str, decode_seconds: float) -> None:
+        """
+        Record a received message.
+
+        Args:
+            channel: Channel the message arrived on
+            decode_seconds: Deserialization time
+        """
+        if self.enabled:
+            self._child("received", channel).inc()
+            self._child("decode", channel).observe(decode_seconds)
+
+    def queue_wait(self, channel: str, seconds: float) -> None:
+        """
+        Record how long a message waited before its callback started.
+
+        Args:
+            channel: Channel the message arrived on
+            seconds: Wait time
+        """
+        if self.enabled:
+            self._child("queue_wait", channel).observe(seconds)
+
+    def callback(self, channel: str, seconds: float, failed: bool = False) -> None:
+        """
+        Record a callback run.
+
+        Args:
+            channel: Channel the message arrived on
+            seconds: Callback duration
+            failed: Whether the callback raised
+        """
+        if self.enabled:
+            self._child("callback", channel).observe(seconds)
+            if failed:
+                self._child("callback_errors", channel).inc()
+
+    def published(self, channel: str, seconds: float, retries: int, ok: bool) -> None:
+        """
+        Record a publish.
+
+        Args:
+            channel: Target channel
+            seconds: Latency of the whole publish, including retries and backoff
+            retries: Failed attempts that were retried
+            ok: Whether the event was published
+        """
+        if not self.enabled:
+            return
+        self._child("publish", channel).observe(seconds)
+        if retries:
+            self._child("publish_retries", channel).inc(retries)
+        if not ok:
+            self._child("publish_failures", channel).inc()
+
+    def _child(self, metric: str, channel: str) -> Any:
+        """Labelled metric for this agent and a channel, cached to skip label lookups."""
+        child = self._children.get((metric, channel))
+        if child is None:
+            child = self._metrics[metric].labels(self.agent_name, channel)
+            self._children[(metric, channel)] = child
+        return child
@@ -0,0 +1,141 @@
+"""
+HemoStat Local Event Bus
+
+Lets several agents run in one process (see agents.hemostat_combined) share Redis clients
+and exchange events in memory.
+
+While a bus is installed, every HemoStatAgent created in the process:
+
+- reuses one command pool and one pub/sub pool instead of opening its own
+- registers its pub/sub subscriptions with the bus; events published to those channels by
+  a co-located agent are queued to it directly, without a Redis round trip
+- still publishes every event to Redis, so agents in other processes (and the dashboard)
+  receive it; its envelope carries the process 'origin' so co-located subscribers drop
+  the copy that comes back from Redis
+
+Stream channels (HEMOSTAT_STREAM_CHANNELS) always go through Redis: consumer groups spread
+entries across replicas, and a local shortcut would hand the same entry to two of them.
+"""
+
+import threading
+import uuid
+from typing import Any
+
+import redis
+
+from agents.transport import LocalTransport
+
+# Envelope field naming the process that published an event
+ORIGIN_FIELD = "origin"
+
+_active: "LocalBus | None" = None
+
+
+class LocalBus:
+    """
+    In-process registry of subscriptions and shared Redis clients.
+    """
+
+    def __init__(self, pubsub_pool_size: int):
+        """
+        Initialize an empty bus.
+
+        Args:
+            pubsub_pool_size: Size of the shared pub/sub pool (each co-located agent holds
+                one pub/sub connection and, with streams, one blocking read connection)
+        """
+        self.origin = uuid.uuid4().hex
+        self.pubsub_pool_size = pubsub_pool_size
+        self.redis: redis.Redis | None = None
+        self.pubsub_redis: redis.Redis | None = None
+
+        self._lock = threading.Lock()
+        self._subscribers: dict[str, list[LocalTransport]] = {}
+        self.delivered = 0
+
+    def adopt_clients(self, redis_client: redis.Redis, pubsub_client: redis.Redis) -> None:
+        """
+        Share the clients of the first agent with all later ones.
+
+        Args:
+            redis_client: Client on the command pool
+            pubsub_client: Client on the pub/sub pool
+        """
+        self.redis = redis_client
+        self.pubsub_redis = pubsub_client
+
+    def register(self, channel: str, transport: LocalTransport) -> None:
+        """
+        Deliver events published in this process to channel to a transport.
+
+        Args:
+            channel: Pub/sub channel
+            transport: Local transport of the subscribing agent
+        """
+        with self._lock:
+            subscribers = self._subscribers.setdefault(channel, [])
+            if transport not in subscribers:
+                subscribers.append(transport)
+
+    def deliver(self, channel: str, message: str) -> int:
+        """
+        Queue a serialized event to every co-located subscriber of a channel.
+
+        Args:
+            channel: Channel the event is published to
+            message: Serialized event
+
+        Returns:
+            Number of local subscribers
+        """
+        with self._lock:
+            subscribers = list(self._subscribers.get(channel, ()))
+            self.delivered += len(subscribers)
+        for transport in subscribers:
+            transport.put(channel, message)
+        return len(subscribers)
+
+    def is_echo(self, payload: dict[str, Any]) -> bool:
+        """
+        Check whether an event received from Redis was published in this process.
+
+        Args:
+            payload: Deserialized event envelope
+
+        Returns:
+            True if it was already delivered in memory
+        """
+        return payload.get(ORIGIN_FIELD) == self.origin
+
+    def close(self) -> None:
+        """
+        Disconnect the shared pools.
+
+        Pub/sub connections still in use by a listener are released by that listener.
+        """
+        if self.redis is not None:
+            self.redis.close()
+            self.redis.connection_pool.disconnect()
+        if self.pubsub_redis is not None:
+            self.pubsub_redis.connection_pool.disconnect(inuse_connections=False)
+
+
+def install_bus(bus: LocalBus | None) -> None:
+    """
+    Install (or with None, remove) the bus used by agents created afterwards.
+
+    Args:
+        bus: Bus to install
+    """
+    global _active
+    _active = bus
+
+
+def active_bus() -> LocalBus | None:
+    """
+    Get the installed bus.
+
+    Returns:
+        The bus, or None when agents run one per process
+    """
+    return _active
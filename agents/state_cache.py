@@ -0,0 +1,277 @@
+"""
+HemoStat Shared State Cache
+
+Optional in-process read-through cache for shared state (hemostat:state:*). Entries are
+kept in a size-bounded LRU with a per-entry TTL and are invalidated by Redis server-assisted
+client-side caching: a dedicated connection enables CLIENT TRACKING in broadcast mode for
+the state prefix, so every write to a state key, by any agent, evicts the local copy.
+Invalidations are received on the __redis__:invalidate channel through a second connection
+(RESP2 redirect mode, which works with the agents' existing clients).
+
+While the invalidation connection is down the cache is cleared and bypassed, so reads are
+never served without coherence; the TTL bounds staleness in the window before a broken
+connection is noticed.
+"""
+
+import contextlib
+import threading
+import time
+from collections import OrderedDict
+from typing import Any
+
+import redis
+
+from agents.logger import HemoStatLogger
+
+INVALIDATION_CHANNEL = "__redis__:invalidate"
+
+
+class StateCache:
+    """
+    Thread-safe LRU cache of encoded shared state values with per-entry expiry.
+
+    Values are stored encoded (as read from Redis) and decoded by the caller on every hit,
+    so callers can freely mutate what they get back. Missing keys are cached too (value
+    None), which saves the round trip for containers that have no state yet.
+    """
+
+    def __init__(self, max_entries: int = 1024, ttl: float = 30.0):
+        """
+        Initialize an empty, disabled cache (enabled once invalidations are flowing).
+
+        Args:
+            max_entries: Maximum number of cached keys (least recently used are evicted)
+            ttl: Seconds an entry may be served after it was read from Redis
+        """
+        self.max_entries = max(1, max_entries)
+        self.ttl = ttl
+        self.enabled = False
+
+        self._lock = threading.Lock()
+        self._entries: OrderedDict[str, tuple[float, str | None]] = OrderedDict()
+        self._invalidations = 0
+
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: str) -> tuple[bool, str | None]:
+        """
+        Look up a key.
+
+        Args:
+            key: Full Redis key
+
+        Returns:
+            (hit, encoded value); the value is None on a miss or for a cached missing key
+        """
+        with self._lock:
+            entry = self._entries.get(key) if self.enabled else None
+            if entry is None or entry[0] <= time.monotonic():
+                if entry is not None:
+                    del self._entries[key]
+                self.misses += 1
+                return False, None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return True, entry[1]
+
+    def token(self) -> int:
+        """
+        Take a token before reading from Redis; pass it to put().
+
+        Returns:
+            Current invalidation counter
+        """
+        with self._lock:
+            return self._invalidations
+
+    def put(self, key: str, value: str | None, token: int) -> None:
+        """
+        Cache a value read from Redis.
+
+        The value is dropped if any invalidation arrived since the token was taken, since
+        it may then have been read before a write whose invalidation was already processed.
+
+        Args:
+            key: Full Redis key
+            value: Encoded value, or None if the key does not exist
+            token: Result of token() taken before the read
+        """
+        with self._lock:
+            if not self.enabled or token != self._invalidations:
+                return
+            self._entries[key] = (time.monotonic() + self.ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, keys: list[str] | None) -> None:
+        """
+        Evict keys.
+
+        Args:
+            keys: Full Redis keys, or None to evict everything (e.g. after FLUSHDB)
+        """
+        with self._lock:
+            self._invalidations += 1
+            if keys is None:
+                self._entries.clear()
+                return
+            for key in keys:
+                self._entries.pop(key, None)
+
+    def set_enabled(self, enabled: bool) -> None:
+        """
+        Enable or disable the cache; disabling also clears it.
+
+        Args:
+            enabled: Whether cached entries may be served
+        """
+        with self._lock:
+            self.enabled = enabled
+            self._invalidations += 1
+            if not enabled:
+                self._entries.clear()
+
+    def stats(self) -> dict[str, Any]:
+        """
+        Cache statistics.
+
+        Returns:
+            Dictionary with enabled, size, hits, misses and hit_rate
+        """
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "enabled": self.enabled,
+                "size": len(self._entries),
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / lookups, 3) if lookups else 0.0,
+            }
+
+
+class InvalidationListener:
+    """
+    Background thread feeding Redis key invalidations into a StateCache.
+
+    Opens two dedicated connections: a subscriber on __redis__:invalidate and a tracking
+    connection running CLIENT TRACKING ON REDIRECT <subscriber> BCAST PREFIX <prefix>.
+    On any connection error the cache is disabled and the connections are re-established
+    with exponential backoff; the cache is re-enabled once tracking is active again.
+    """
+
+    def __init__(
+        self,
+        connection_pool: redis.ConnectionPool,
+        cache: StateCache,
+        prefix: str,
+        agent_name: str,
+    ):
+        """
+        Initialize the listener.
+
+        Args:
+            connection_pool: Pool of the agent's client; its connection class and settings
+                are used for the two dedicated connections (they are not taken from the pool)
+            cache: Cache to invalidate
+            prefix: Key prefix to track, e.g. 'hemostat:state:'
+            agent_name: Agent name (used for the logger and thread name)
+        """
+        self.logger = HemoStatLogger.get_logger(agent_name)
+        self.connection_pool = connection_pool
+        self.cache = cache
+        self.prefix = prefix
+        self.agent_name = agent_name
+
+        self._running = False
+        self._thread: threading.Thread | None = None
+        self._subscriber: redis.Connection | None = None
+        self._tracker: redis.Connection | None = None
+
+    def start(self) -> None:
+        """Start the listener thread."""
+        self._running = True
+        self._thread = threading.Thread(
+            target=self._run, name=f"{self.agent_name}-state-invalidation", daemon=True
+        )
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Stop the listener and disable the cache."""
+        self._running = False
+        self.cache.set_enabled(False)
+        if self._thread is not None:
+            self._thread.join(timeout=3)
+        self._disconnect()
+
+    def _run(self) -> None:
+        """Connect, enable tracking and apply invalidations until stopped."""
+        backoff = 1.0
+        while self._running:
+            try:
+                self._connect()
+                self.cache.set_enabled(True)
+                self.logger.info(f"State cache enabled with client tracking on '{self.prefix}'")
+                backoff = 1.0
+                self._consume()
+            except (redis.RedisError, OSError) as e:
+                self.cache.set_enabled(False)
+                self._disconnect()
+                if not self._running:
+                    return
+                if "unknown" in str(e).lower() or "unsupported" in str(e).lower():
+                    self.logger.warning(f"Redis does not support client tracking, cache off: {e}")
+                    return
+                self.logger.warning(
+                    f"State cache invalidation connection lost ({e}); retrying in {backoff:.0f}s"
+                )
+                time.sleep(backoff)
+                backoff = min(backoff * 2, 60.0)
+
+    def _connect(self) -> None:
+        """Open the subscriber and tracking connections."""
+        subscriber = self._new_connection()
+        subscriber.connect()
+        self._subscriber = subscriber
+        subscriber.send_command("CLIENT", "ID")
+        client_id = subscriber.read_response()
+        subscriber.send_command("SUBSCRIBE", INVALIDATION_CHANNEL)
+        subscriber.read_response()
+
+        tracker = self._new_connection()
+        tracker.connect()
+        self._tracker = tracker
+        tracker.send_command(
+            "CLIENT", "TRACKING", "ON", "REDIRECT", client_id, "BCAST", "PREFIX", self.prefix
+        )
+        tracker.read_response()
+
+    def _new_connection(self) -> redis.Connection:
+        """Create a standalone connection with the agent's connection settings."""
+        pool = self.connection_pool
+        return pool.connection_class(**pool.connection_kwargs)
+
+    def _consume(self) -> None:
+        """Read invalidation messages; keep the tracking connection alive."""
+        last_ping = time.monotonic()
+        while self._running:
+            if self._subscriber.can_read(timeout=1.0):
+                message = self._subscriber.read_response()
+                if isinstance(message, list) and len(message) == 3 and message[0] == "message":
+                    keys = message[2]
+                    self.cache.invalidate(list(keys) if keys is not None else None)
+            if time.monotonic() - last_ping >= 30:
+                # A dead tracking connection stops invalidations silently; check it
+                self._tracker.send_command("PING")
+                self._tracker.read_response()
+                last_ping = time.monotonic()
+
+    def _disconnect(self) -> None:
+        """Close both connections."""
+        for connection in (self._subscriber, self._tracker):
+            if connection is not None:
+                with contextlib.suppress(Exception):
+                    connection.disconnect()
+        self._subscriber = None
+        self._tracker = None
@@ -0,0 +1,141 @@
+"""
+HemoStat Event Tracing
+
+Correlates the events of one incident across agents. Every event envelope carries a
+'trace' object:
+
+    {
+        "id": "3f2b9c...",
+        "hops": [
+            {"agent": "monitor", "event_type": "container_unhealthy",
+             "channel": "hemostat:health_alert", "published_at": "..."},
+            {"agent": "analyzer", "event_type": "remediation_needed",
+             "channel": "hemostat:remediation_needed",
+             "received_at": "...", "published_at": "..."},
+            ...
+        ]
+    }
+
+An event published outside a message callback starts a new trace (the Monitor's health
+alerts mint the ID of an incident). An event published while a callback handles a message
+continues that message's trace. The agent base sets the current message around every
+callback, so agents need no code for the common case. Work handed to another thread or
+published later can continue a trace explicitly with `continue_from(message)`.
+
+received_at is when the callback started and published_at when the event was sent. The gap
+to the previous hop's published_at is transit plus queueing; received_at to published_at is
+processing time in the agent.
+"""
+
+import uuid
+from collections.abc import Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+from datetime import UTC, datetime
+from typing import Any
+
+TRACE_FIELD = "trace"
+
+# Bound on hops kept per trace, in case events ever feed back into each other
+MAX_HOPS = 16
+
+# Trace of the message being handled and when its callback started
+_current: ContextVar[tuple[dict[str, Any], str] | None] = ContextVar("hemostat_trace", default=None)
+
+
+def trace_of(message: dict[str, Any]) -> dict[str, Any] | None:
+    """
+    Get the trace of an event envelope.
+
+    Args:
+        message: Deserialized event envelope
+
+    Returns:
+        The trace, or None if the event has none (e.g. from an agent predating tracing)
+    """
+    trace = message.get(TRACE_FIELD)
+    if isinstance(trace, dict) and isinstance(trace.get("id"), str):
+        return trace
+    return None
+
+
+@contextmanager
+def continue_from(message: dict[str, Any]) -> Iterator[None]:
+    """
+    Make events published in this block continue the trace of a received message.
+
+    Args:
+        message: Deserialized event envelope being handled
+    """
+    trace = trace_of(message)
+    token = _current.set((trace, datetime.now(UTC).isoformat()) if trace else None)
+    try:
+        yield
+    finally:
+        _current.reset(token)
+
+
+def next_trace(agent: str, event_type: str, channel: str) -> dict[str, Any]:
+    """
+    Build the trace of an event about to be published.
+
+    Args:
+        agent: Publishing agent
+        event_type: Type of the event
+        channel: Target channel
+
+    Returns:
+        The current message's trace extended by one hop, or a new trace
+    """
+    hop: dict[str, Any] = {"agent": agent, "event_type": event_type, "channel": channel}
+    current = _current.get()
+    if current is None:
+        trace_id, hops = uuid.uuid4().hex, []
+    else:
+        parent, received_at = current
+        trace_id, hops = parent["id"], list(parent.get("hops", []))[-(MAX_HOPS - 1) :]
+        hop["received_at"] = received_at
+    hop["published_at"] = datetime.now(UTC).isoformat()
+    hops.append(hop)
+    return {"id": trace_id, "hops": hops}
+
+
+def hop_time(hop: dict[str, Any], field: str = "published_at") -> float | None:
+    """
+    Read a hop timestamp as epoch seconds.
+
+    Args:
+        hop: Trace hop
+        field: 'published_at' or 'received_at'
+
+    Returns:
+        Epoch seconds, or None if missing or malformed
+    """
+    value = hop.get(field)
+    if not isinstance(value, str):
+        return None
+    try:
+        return datetime.fromisoformat(value).timestamp()
+    except ValueError:
+        return None
+
+
+def pipeline_seconds(trace: dict[str, Any], until: float | None = None) -> float | None:
+    """
+    Time from the first event of a trace (detection) to its last hop, or to a given time.
+
+    Args:
+        trace: Event trace
+        until: Epoch seconds to measure to (default: the last hop's published_at)
+
+    Returns:
+        Elapsed seconds, or None if the trace has no usable timestamps
+    """
+    hops = trace.get("hops") or []
+    if not hops:
+        return None
+    start = hop_time(hops[0])
+    end = until if until is not None else hop_time(hops[-1])
+    if start is None or end is None:
+        return None
+    return max(0.0, end - start)
@@ -0,0 +1,795 @@
+"""
+HemoStat Message Transports
+
+Pluggable transports used by HemoStatAgent to move events between agents. Every channel is
+carried either by Redis pub/sub (fire-and-forget, the default) or by a Redis Stream read
+through a consumer group, which keeps events for agents that are slow, restarting or
+briefly disconnected and spreads them across replicas of the same agent.
+
+Both transports expose the same interface: publish(), subscribe(), listen() and close().
+listen() yields (channel, raw_message, ack) tuples; ack() must be called once the message
+has been handled (it is a no-op for pub/sub). AsyncPubSubTransport and AsyncStreamTransport
+provide the same interface on redis.asyncio for AsyncHemoStatAgent, with awaitable methods
+and acks and an async iterator from listen(). LocalTransport delivers events published by
+agents in the same process (see agents.local_bus) through an in-memory queue.
+"""
+
+import asyncio
+import os
+import queue
+import random
+import socket
+import time
+from collections.abc import AsyncIterator, Awaitable, Callable, Iterator
+from typing import Any
+
+import redis
+import redis.asyncio
+
+from agents.logger import HemoStatLogger
+
+# Stream entry field holding the serialized event
+STREAM_FIELD = "payload"
+
+
+def _no_ack() -> None:
+    """Acknowledgement callback for transports without delivery tracking."""
+
+
+async def _async_no_ack() -> None:
+    """Async acknowledgement callback for transports without delivery tracking."""
+
+
+def reconnect_delay(attempt: int, max_backoff: float, base: float = 0.5) -> float:
+    """
+    Jittered exponential backoff before reconnect attempt number `attempt`.
+
+    Uses "full jitter" (uniform between 0 and the exponential cap), so replicas that lost
+    their connection at the same moment do not reconnect in lockstep.
+
+    Args:
+        attempt: Zero-based attempt number
+        max_backoff: Upper bound in seconds
+        base: Delay cap of the first attempt in seconds
+
+    Returns:
+        Seconds to wait
+    """
+    return random.uniform(0, min(max_backoff, base * 2**attempt))
+
+
+def stream_channels_from_env() -> set[str]:
+    """
+    Read the channels that should use Redis Streams.
+
+    HEMOSTAT_STREAM_CHANNELS is a comma-separated list of channel names, or '*' for all.
+
+    Returns:
+        Set of channel names (may contain '*')
+    """
+    value = os.getenv("HEMOSTAT_STREAM_CHANNELS", "")
+    return {channel.strip() for channel in value.split(",") if channel.strip()}
+
+
+class PubSubTransport:
+    """
+    Redis pub/sub transport. Messages are only delivered to currently connected subscribers.
+    """
+
+    name = "pubsub"
+
+    def __init__(
+        self, redis_client: redis.Redis, pubsub: redis.client.PubSub, max_backoff: float = 30.0
+    ):
+        """
+        Initialize the transport.
+
+        Args:
+            redis_client: Redis client used for PUBLISH
+            pubsub: PubSub object used for subscriptions
+            max_backoff: Maximum seconds between resubscribe attempts after a disconnect
+        """
+        self.logger = HemoStatLogger.get_logger("transport")
+        self.redis = redis_client
+        self.pubsub = pubsub
+        self.max_backoff = max_backoff
+        self.reconnects = 0
+        self._channels: list[str] = []
+        self._listening = False
+        self._closed = False
+
+    def publish(self, channel: str, message: str) -> str:
+        """
+        Publish a serialized message.
+
+        Args:
+            channel: Channel name
+            message: Serialized event
+
+        Returns:
+            Human-readable delivery summary for logging
+        """
+        num_subscribers = self.redis.publish(channel, message)
+        return f"{num_subscribers} subscribers"
+
+    def subscribe(self, channel: str) -> None:
+        """
+        Subscribe to a channel.
+
+        Args:
+            channel: Channel name
+        """
+        self.pubsub.subscribe(channel)
+        if channel not in self._channels:
+            self._channels.append(channel)
+
+    def listen(self, is_running: Callable[[], bool]) -> Iterator[tuple[str, str, Callable]]:
+        """
+        Yield messages until is_running() turns false.
+
+        Reads with a one-second timeout so that stopping is noticed without a message. After
+        a disconnect the transport resubscribes with jittered backoff; messages published
+        while disconnected are lost (use the stream transport where that matters).
+
+        Args:
+            is_running: Checked between reads to decide whether to keep listening
+
+        Yields:
+            (channel, raw_message, ack) tuples
+        """
+        self._listening = True
+        try:
+            while is_running() and not self._closed:
+                try:
+                    message = self.pubsub.get_message(ignore_subscribe_messages=True, timeout=1.0)
+                except (redis.ConnectionError, redis.TimeoutError) as e:
+                    if is_running() and not self._closed:
+                        self._resubscribe(e, is_running)
+                    continue
+                if message and message["type"] == "message":
+                    yield message["channel"], message["data"], _no_ack
+        finally:
+            self._listening = False
+            if self._closed:
+                self.pubsub.reset()
+
+    def close(self) -> None:
+        """
+        Unsubscribe from all channels.
+
+        While listen() is running on another thread the connection is released by that
+        thread once its current read returns (within a second), since PubSub objects must
+        not be used from two threads at once.
+        """
+        self._closed = True
+        self._channels.clear()
+        if not self._listening:
+            self.pubsub.reset()
+
+    def _resubscribe(self, error: Exception, is_running: Callable[[], bool]) -> None:
+        """
+        Re-establish the subscription connection after a disconnect.
+
+        Args:
+            error: Error that ended the previous connection
+            is_running: Stops retrying once it turns false
+        """
+        attempt = 0
+        while is_running() and not self._closed:
+            delay = reconnect_delay(attempt, self.max_backoff)
+            self.logger.warning(
+                f"Pub/sub connection lost ({error}); resubscribing in {delay:.1f}s "
+                f"(attempt {attempt + 1})"
+            )
+            time.sleep(delay)
+            try:
+                self.pubsub.reset()
+                if self._channels:
+                    self.pubsub.subscribe(*self._channels)
+                self.reconnects += 1
+                self.logger.info(f"Resubscribed to {len(self._channels)} channels")
+                return
+            except (redis.ConnectionError, redis.TimeoutError) as e:
+                error = e
+                attempt += 1
+
+
+class StreamTransport:
+    """
+    Redis Streams transport with consumer groups.
+
+    Each channel maps to a stream key. Publishing is an XADD trimmed with MAXLEN ~, so the
+    stream length stays bounded without exact-trim cost. Every agent type reads through its
+    own consumer group (named after the agent), so each agent type sees every event once
+    and replicas of the same agent share the load. Entries are acknowledged with XACK
+    after the handler ran; entries left pending by a consumer that died are reclaimed with
+    XAUTOCLAIM once they have been idle longer than claim_idle_ms.
+    """
+
+    name = "stream"
+
+    def __init__(
+        self,
+        redis_client: redis.Redis,
+        group: str,
+        consumer: str | None = None,
+        maxlen: int = 10000,
+        block_ms: int = 1000,
+        batch_size: int = 50,
+        claim_idle_ms: int = 60000,
+        listen_client: redis.Redis | None = None,
+        max_backoff: float = 30.0,
+    ):
+        """
+        Initialize the transport.
+
+        Args:
+            redis_client: Redis client (decode_responses=True)
+            group: Consumer group name (normally the agent name)
+            consumer: Consumer name, unique per process (default: hostname-pid)
+            maxlen: Approximate maximum stream length kept by XADD
+            block_ms: XREADGROUP block timeout; bounds how long stop() takes to be noticed
+            batch_size: Maximum entries read per XREADGROUP / XAUTOCLAIM call
+            claim_idle_ms: Idle time after which another consumer's pending entries are reclaimed
+            listen_client: Client for the blocking reads, so they do not hold a connection
+                of the command pool (default: redis_client)
+            max_backoff: Maximum seconds between read attempts after a disconnect
+        """
+        self.logger = HemoStatLogger.get_logger(group)
+        self.redis = redis_client
+        self.listen_client = listen_client or redis_client
+        self.max_backoff = max_backoff
+        self.reconnects = 0
+        self.group = group
+        self.consumer = consumer or f"{socket.gethostname()}-{os.getpid()}"
+        self.maxlen = maxlen
+        self.block_ms = block_ms
+        self.batch_size = batch_size
+        self.claim_idle_ms = claim_idle_ms
+
+        self._channels: dict[str, str] = {}
+
+    @staticmethod
+    def stream_key(channel: str) -> str:
+        """
+        Map a channel name to its stream key.
+
+        Args:
+            channel: Channel name, e.g. 'hemostat:health_alert'
+
+        Returns:
+            Stream key, e.g. 'hemostat:stream:health_alert'
+        """
+        return f"hemostat:stream:{channel.removeprefix('hemostat:')}"
+
+    def publish(self, channel: str, message: str) -> str:
+        """
+        Append a serialized message to the channel's stream.
+
+        Args:
+            channel: Channel name
+            message: Serialized event
+
+        Returns:
+            Human-readable delivery summary for logging
+        """
+        entry_id = self.redis.xadd(
+            self.stream_key(channel),
+            {STREAM_FIELD: message},
+            maxlen=self.maxlen,
+            approximate=True,
+        )
+        return f"stream entry {entry_id}"
+
+    def subscribe(self, channel: str) -> None:
+        """
+        Create the consumer group for a channel (and the stream if missing).
+
+        New groups start at the end of the stream; an existing group keeps its position,
+        so events published while the agent was down are still delivered.
+
+        Args:
+            channel: Channel name
+        """
+        key = self.stream_key(channel)
+        try:
+            self.redis.xgroup_create(key, self.group, id="$", mkstream=True)
+            self.logger.info(f"Created consumer group '{self.group}' on stream '{key}'")
+        except redis.ResponseError as e:
+            if "BUSYGROUP" not in str(e):
+                raise
+        self._channels[key] = channel
+
+    def listen(self, is_running: Callable[[], bool]) -> Iterator[tuple[str, str, Callable]]:
+        """
+        Yield entries from all subscribed streams until is_running() turns false.
+
+        Pending entries of dead consumers are reclaimed first and then every
+        claim_idle_ms / 2; new entries are read with a blocking XREADGROUP.
+
+        Args:
+            is_running: Checked between reads to decide whether to keep listening
+
+        Yields:
+            (channel, raw_message, ack) tuples
+        """
+        next_claim = 0.0
+        failures = 0
+        missing_groups = False
+
+        while is_running() and self._channels:
+            try:
+                if missing_groups:
+                    # Redis restarted without persistence: recreate streams and groups
+                    # (inside the try, so a failed attempt is retried with backoff)
+                    for channel in list(self._channels.values()):
+                        self.subscribe(channel)
+                    missing_groups = False
+
+                if time.monotonic() >= next_claim:
+                    for key in list(self._channels):
+                        yield from self._reclaim(key)
+                    next_claim = time.monotonic() + self.claim_idle_ms / 2000
+
+                response = self.listen_client.xreadgroup(
+                    self.group,
+                    self.consumer,
+                    {key: ">" for key in self._channels},
+                    count=self.batch_size,
+                    block=self.block_ms,
+                )
+            except (redis.ConnectionError, redis.TimeoutError) as e:
+                delay = reconnect_delay(failures, self.max_backoff)
+                failures += 1
+                self.logger.warning(
+                    f"Stream read failed ({e}); retrying in {delay:.1f}s (attempt {failures})"
+                )
+                time.sleep(delay)
+                continue
+            except redis.ResponseError as e:
+                if "NOGROUP" not in str(e):
+                    raise
+                self.logger.warning(f"Consumer group missing ({e}); recreating")
+                missing_groups = True
+                continue
+
+            if failures:
+                self.reconnects += 1
+                self.logger.info(f"Stream reads resumed after {failures} failed attempts")
+                failures = 0
+            for key, entries in response or []:
+                for entry_id, fields in entries:
+                    yield from self._entry(key, entry_id, fields)
+
+    def close(self) -> None:
+        """Forget subscriptions; the listen loop ends after its current block timeout."""
+        self._channels.clear()
+
+    def pending(self) -> dict[str, int]:
+        """
+        Report the number of pending (delivered, unacknowledged) entries per channel.
+
+        Returns:
+            Mapping of channel name to pending count
+        """
+        counts = {}
+        for key, channel in self._channels.items():
+            summary = self.redis.xpending(key, self.group)
+            counts[channel] = summary.get("pending", 0) if summary else 0
+        return counts
+
+    def _reclaim(self, key: str) -> Iterator[tuple[str, str, Callable]]:
+        """
+        Claim entries another consumer left pending for longer than claim_idle_ms.
+
+        Args:
+            key: Stream key
+
+        Yields:
+            (channel, raw_message, ack) tuples for the reclaimed entries
+        """
+        start_id = "0-0"
+        while True:
+            result = self.listen_client.xautoclaim(
+                key,
+                self.group,
+                self.consumer,
+                min_idle_time=self.claim_idle_ms,
+                start_id=start_id,
+                count=self.batch_size,
+            )
+            start_id, entries = result[0], result[1]
+            if entries:
+                self.logger.warning(
+                    f"Reclaimed {len(entries)} pending entries from '{key}' for {self.consumer}"
+                )
+            for entry_id, fields in entries:
+                yield from self._entry(key, entry_id, fields)
+            if start_id in ("0-0", b"0-0") or not entries:
+                return
+
+    def _entry(
+        self, key: str, entry_id: str, fields: dict[str, Any] | None
+    ) -> Iterator[tuple[str, str, Callable]]:
+        """
+        Convert a stream entry into a (channel, message, ack) tuple.
+
+        Entries that were trimmed away while pending come back without fields; they are
+        acknowledged and skipped.
+
+        Args:
+            key: Stream key
+            entry_id: Entry ID
+            fields: Entry fields, or None if the entry no longer exists
+
+        Yields:
+            Zero or one (channel, raw_message, ack) tuple
+        """
+        if not fields or STREAM_FIELD not in fields:
+            self.redis.xack(key, self.group, entry_id)
+            return
+
+        def ack() -> None:
+            self.redis.xack(key, self.group, entry_id)
+
+        yield self._channels.get(key, key), fields[STREAM_FIELD], ack
+
+
+class LocalTransport:
+    """
+    In-process transport fed by the LocalBus of a combined runner.
+
+    Only listen() and close() are used by the agent; the bus puts events directly.
+    """
+
+    name = "local"
+
+    def __init__(self):
+        """Initialize an empty queue."""
+        self._queue: queue.SimpleQueue[tuple[str, str]] = queue.SimpleQueue()
+        self.reconnects = 0
+
+    def put(self, channel: str, message: str) -> None:
+        """
+        Queue a serialized event for this agent.
+
+        Args:
+            channel: Channel the event was published to
+            message: Serialized event
+        """
+        self._queue.put((channel, message))
+
+    def listen(
+        self, is_running: Callable[[], bool]
+    ) -> Iterator[tuple[str, str, Callable[[], None]]]:
+        """
+        Yield queued events until is_running() returns False.
+
+        Args:
+            is_running: Callable checked at least once per second
+
+        Yields:
+            (channel, raw_message, ack) tuples
+        """
+        while is_running():
+            try:
+                channel, message = self._queue.get(timeout=1.0)
+            except queue.Empty:
+                continue
+            yield channel, message, _no_ack
+
+    def close(self) -> None:
+        """Nothing to release; queued events are dropped with the agent."""
+
+
+class AsyncPubSubTransport:
+    """
+    Redis pub/sub transport on redis.asyncio.
+    """
+
+    name = "pubsub"
+
+    def __init__(
+        self,
+        redis_client: redis.asyncio.Redis,
+        pubsub: redis.asyncio.client.PubSub,
+        max_backoff: float = 30.0,
+    ):
+        """
+        Initialize the transport.
+
+        Args:
+            redis_client: Async Redis client used for PUBLISH
+            pubsub: Async PubSub object used for subscriptions
+            max_backoff: Maximum seconds between resubscribe attempts after a disconnect
+        """
+        self.logger = HemoStatLogger.get_logger("transport")
+        self.redis = redis_client
+        self.pubsub = pubsub
+        self.max_backoff = max_backoff
+        self.reconnects = 0
+        self._channels: list[str] = []
+        self._closed = False
+
+    async def publish(self, channel: str, message: str) -> str:
+        """
+        Publish a serialized message.
+
+        Args:
+            channel: Channel name
+            message: Serialized event
+
+        Returns:
+            Human-readable delivery summary for logging
+        """
+        num_subscribers = await self.redis.publish(channel, message)
+        return f"{num_subscribers} subscribers"
+
+    async def subscribe(self, channel: str) -> None:
+        """
+        Subscribe to a channel.
+
+        Args:
+            channel: Channel name
+        """
+        await self.pubsub.subscribe(channel)
+        if channel not in self._channels:
+            self._channels.append(channel)
+
+    async def listen(
+        self, is_running: Callable[[], bool]
+    ) -> AsyncIterator[tuple[str, str, Callable[[], Awaitable[None]]]]:
+        """
+        Yield messages until is_running() turns false.
+
+        Polls with a one-second timeout so that stopping is noticed without a message. After
+        a disconnect the transport resubscribes with jittered backoff; messages published
+        while disconnected are lost (use the stream transport where that matters).
+
+        Args:
+            is_running: Checked between reads to decide whether to keep listening
+
+        Yields:
+            (channel, raw_message, ack) tuples
+        """
+        while is_running() and not self._closed:
+            if not self.pubsub.subscribed:
+                await asyncio.sleep(1.0)
+                continue
+            try:
+                message = await self.pubsub.get_message(ignore_subscribe_messages=True, timeout=1.0)
+            except (redis.ConnectionError, redis.TimeoutError) as e:
+                if is_running() and not self._closed:
+                    await self._resubscribe(e, is_running)
+                continue
+            if message and message["type"] == "message":
+                yield message["channel"], message["data"], _async_no_ack
+
+    async def close(self) -> None:
+        """Unsubscribe from all channels and release the connection."""
+        self._closed = True
+        self._channels.clear()
+        await self.pubsub.unsubscribe()
+        await self.pubsub.aclose()
+
+    async def _resubscribe(self, error: Exception, is_running: Callable[[], bool]) -> None:
+        """
+        Re-establish the subscription connection after a disconnect.
+
+        Args:
+            error: Error that ended the previous connection
+            is_running: Stops retrying once it turns false
+        """
+        attempt = 0
+        while is_running() and not self._closed:
+            delay = reconnect_delay(attempt, self.max_backoff)
+            self.logger.warning(
+                f"Pub/sub connection lost ({error}); resubscribing in {delay:.1f}s "
+                f"(attempt {attempt + 1})"
+            )
+            await asyncio.sleep(delay)
+            try:
+                await self.pubsub.aclose()
+                if self._channels:
+                    await self.pubsub.subscribe(*self._channels)
+                self.reconnects += 1
+                self.logger.info(f"Resubscribed to {len(self._channels)} channels")
+                return
+            except (redis.ConnectionError, redis.TimeoutError) as e:
+                error = e
+                attempt += 1
+
+
+class AsyncStreamTransport(StreamTransport):
+    """
+    Redis Streams transport with consumer groups on redis.asyncio.
+
+    Uses the same stream keys, consumer groups and trimming as StreamTransport, so sync and
+    async agents can be mixed on one channel.
+    """
+
+    def __init__(self, redis_client: redis.asyncio.Redis, group: str, **kwargs: Any):
+        """
+        Initialize the transport.
+
+        Args:
+            redis_client: Async Redis client (decode_responses=True)
+            group: Consumer group name (normally the agent name)
+            **kwargs: consumer, maxlen, block_ms, batch_size, claim_idle_ms and max_backoff
+                as for StreamTransport
+        """
+        super().__init__(redis_client, group, **kwargs)  # type: ignore[arg-type]
+
+    async def publish(self, channel: str, message: str) -> str:  # type: ignore[override]
+        """
+        Append a serialized message to the channel's stream.
+
+        Args:
+            channel: Channel name
+            message: Serialized event
+
+        Returns:
+            Human-readable delivery summary for logging
+        """
+        entry_id = await self.redis.xadd(
+            self.stream_key(channel),
+            {STREAM_FIELD: message},
+            maxlen=self.maxlen,
+            approximate=True,
+        )
+        return f"stream entry {entry_id}"
+
+    async def subscribe(self, channel: str) -> None:  # type: ignore[override]
+        """
+        Create the consumer group for a channel (and the stream if missing).
+
+        Args:
+            channel: Channel name
+        """
+        key = self.stream_key(channel)
+        try:
+            await self.redis.xgroup_create(key, self.group, id="$", mkstream=True)
+            self.logger.info(f"Created consumer group '{self.group}' on stream '{key}'")
+        except redis.ResponseError as e:
+            if "BUSYGROUP" not in str(e):
+                raise
+        self._channels[key] = channel
+
+    async def listen(  # type: ignore[override]
+        self, is_running: Callable[[], bool]
+    ) -> AsyncIterator[tuple[str, str, Callable[[], Awaitable[None]]]]:
+        """
+        Yield entries from all subscribed streams until is_running() turns false.
+
+        Reconnects and recreates missing consumer groups like StreamTransport.listen().
+
+        Args:
+            is_running: Checked between reads to decide whether to keep listening
+
+        Yields:
+            (channel, raw_message, ack) tuples
+        """
+        next_claim = 0.0
+        failures = 0
+        missing_groups = False
+
+        while is_running() and self._channels:
+            try:
+                if missing_groups:
+                    # Redis restarted without persistence: recreate streams and groups
+                    # (inside the try, so a failed attempt is retried with backoff)
+                    for channel in list(self._channels.values()):
+                        await self.subscribe(channel)
+                    missing_groups = False
+
+                if time.monotonic() >= next_claim:
+                    for key in list(self._channels):
+                        async for item in self._reclaim_async(key):
+                            yield item
+                    next_claim = time.monotonic() + self.claim_idle_ms / 2000
+
+                response = await self.redis.xreadgroup(
+                    self.group,
+                    self.consumer,
+                    {key: ">" for key in self._channels},
+                    count=self.batch_size,
+                    block=self.block_ms,
+                )
+            except (redis.ConnectionError, redis.TimeoutError) as e:
+                delay = reconnect_delay(failures, self.max_backoff)
+                failures += 1
+                self.logger.warning(
+                    f"Stream read failed ({e}); retrying in {delay:.1f}s (attempt {failures})"
+                )
+                await asyncio.sleep(delay)
+                continue
+            except redis.ResponseError as e:
+                if "NOGROUP" not in str(e):
+                    raise
+                self.logger.warning(f"Consumer group missing ({e}); recreating")
+                missing_groups = True
+                continue
+
+            if failures:
+                self.reconnects += 1
+                self.logger.info(f"Stream reads resumed after {failures} failed attempts")
+                failures = 0
+            for key, entries in response or []:
+                for entry_id, fields in entries:
+                    item = await self._entry_async(key, entry_id, fields)
+                    if item is not None:
+                        yield item
+
+    async def close(self) -> None:  # type: ignore[override]
+        """Forget subscriptions; the listen loop ends after its current block timeout."""
+        self._channels.clear()
+
+    async def pending(self) -> dict[str, int]:  # type: ignore[override]
+        """
+        Report the number of pending (delivered, unacknowledged) entries per channel.
+
+        Returns:
+            Mapping of channel name to pending count
+        """
+        counts = {}
+        for key, channel in self._channels.items():
+            summary = await self.redis.xpending(key, self.group)
+            counts[channel] = summary.get("pending", 0) if summary else 0
+        return counts
+
+    async def _reclaim_async(
+        self, key: str
+    ) -> AsyncIterator[tuple[str, str, Callable[[], Awaitable[None]]]]:
+        """
+        Claim entries another consumer left pending for longer than claim_idle_ms.
+
+        Args:
+            key: Stream key
+
+        Yields:
+            (channel, raw_message, ack) tuples for the reclaimed entries
+        """
+        start_id = "0-0"
+        while True:
+            result = await self.redis.xautoclaim(
+                key,
+                self.group,
+                self.consumer,
+                min_idle_time=self.claim_idle_ms,
+                start_id=start_id,
+                count=self.batch_size,
+            )
+            start_id, entries = result[0], result[1]
+            if entries:
+                self.logger.warning(
+                    f"Reclaimed {len(entries)} pending entries from '{key}' for {self.consumer}"
+                )
+            for entry_id, fields in entries:
+                item = await self._entry_async(key, entry_id, fields)
+                if item is not None:
+                    yield item
+            if start_id in ("0-0", b"0-0") or not entries:
+                return
+
+    async def _entry_async(
+        self, key: str, entry_id: str, fields: dict[str, Any] | None
+    ) -> tuple[str, str, Callable[[], Awaitable[None]]] | None:
+        """
+        Convert a stream entry into a (channel, message, ack) tuple.
+
+        Args:
+            key: Stream key
+            entry_id: Entry ID
+            fields: Entry fields, or None if the entry no longer exists
+
+        Returns:
+            The tuple, or None for entries trimmed away while pending (acknowledged here)
+        """
+        if not fields or STREAM_FIELD not in fields:
+            await self.redis.xack(key, self.group, entry_id)
+            return None
+
+        async def ack() -> None:
+            await self.redis.xack(key, self.group, entry_id)
+
+        return self._channels.get(key, key), fields[STREAM_FIELD], ack
@@ -5,13 +5,13 @@ Provides Redis data access layer with efficient caching for dashboard operations
 Uses Streamlit caching decorators to minimize Redis polling and improve performance.
 """
 
-import json
 import os
 from typing import Any
 
 import redis
 import streamlit as st
 
+from agents.codec import ENCODING_ERRORS, CodecError, decode
 from agents.logger import HemoStatLogger
 
 
@@ -44,6 +44,7 @@ def get_redis_client() -> redis.Redis:
             db=redis_db,
             password=redis_password,
             decode_responses=True,
+            encoding_errors=ENCODING_ERRORS,
             socket_connect_timeout=5,
             socket_keepalive=True,
         )
@@ -79,9 +80,9 @@ def get_all_events(limit: int = 1000) -> list[dict]:
         events: list[dict] = []
         for event_str in events_raw:  # type: ignore[union-attr]
             try:
-                event = json.loads(event_str)
+                event = decode(event_str)
                 events.append(event)
-            except json.JSONDecodeError as e:
+            except CodecError as e:
                 logger.warning(f"Skipping malformed event JSON: {e}")
                 continue
 
@@ -118,9 +119,9 @@ def get_events_by_type(event_type: str, limit: int = 1000) -> list[dict]:
         events: list[dict] = []
         for event_str in events_raw:  # type: ignore[union-attr]
             try:
-                event = json.loads(event_str)
+                event = decode(event_str)
                 events.append(event)
-            except json.JSONDecodeError as e:
+            except CodecError as e:
                 logger.warning(f"Skipping malformed event JSON in {key}: {e}")
                 continue
 
@@ -156,8 +157,8 @@ def get_container_stats(container_id: str) -> dict[str, Any] | None:
             return None
 
         try:
-            return json.loads(stats_str)
-        except json.JSONDecodeError as e:
+            return decode(stats_str)
+        except CodecError as e:
             logger.warning(f"Malformed stats JSON for {container_id}: {e}")
             return None
     except Exception as e:
@@ -274,8 +275,8 @@ def get_all_container_stats() -> dict[str, dict[str, Any]]:
 
                     if stats_str:
                         try:
-                            stats_map[container_id] = json.loads(stats_str)
-                        except json.JSONDecodeError as e:
+                            stats_map[container_id] = decode(stats_str)
+                        except CodecError as e:
                             logger.warning(f"Malformed stats JSON for {container_id}: {e}")
                 except Exception as e:
                     logger.warning(f"Error processing stats key {key}: {e}")
@@ -0,0 +1,155 @@
+#!/usr/bin/env python3
+"""
+Codec Benchmark
+
+Measures encode/decode time and encoded size of representative HemoStat payloads for every
+installed codec (json, orjson, msgpack): a health alert envelope as published by the
+Monitor, and an analyzer alert history blob holding ANALYZER_HISTORY_SIZE full alerts.
+With --redis-url the encoded values are also stored in Redis and their MEMORY USAGE is
+reported.
+
+    python scripts/benchmark_codecs.py
+    python scripts/benchmark_codecs.py --history 50 --redis-url redis://localhost:6379/0
+"""
+
+import argparse
+import os
+import sys
+import timeit
+from datetime import UTC, datetime
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from agents.codec import ENCODING_ERRORS, available_codecs, decode, encode, get_codec
+
+
+def health_alert(index: int) -> dict:
+    """Build a health alert envelope like the Monitor publishes."""
+    return {
+        "event_type": "container_unhealthy",
+        "timestamp": datetime.now(UTC).isoformat(),
+        "agent": "monitor",
+        "data": {
+            "container_id": f"{index:012x}",
+            "container_name": f"web-app-{index}",
+            "docker_host": "local",
+            "image": "registry.example.com/team/web-app:1.42.0",
+            "status": "running",
+            "metrics": {
+                "cpu_percent": 91.37,
+                "memory_percent": 78.12,
+                "memory_usage": 838860800,
+                "memory_limit": 1073741824,
+                "network_rx_bytes": 123456789,
+                "network_tx_bytes": 98765432,
+                "network_rx_packets": 456789,
+                "network_tx_packets": 345678,
+                "blkio_read_bytes": 2147483648,
+                "blkio_write_bytes": 1073741824,
+                "blkio_read_ops": 12345,
+                "blkio_write_ops": 6789,
+                "network_rx_bytes_per_sec": 1048576.5,
+                "network_tx_bytes_per_sec": 524288.25,
+                "network_bytes_per_sec": 1572864.75,
+                "blkio_read_bytes_per_sec": 4096.0,
+                "blkio_write_bytes_per_sec": 8192.0,
+                "blkio_bytes_per_sec": 12288.0,
+                "blkio_ops_per_sec": 12.5,
+            },
+            "anomalies": [
+                {
+                    "type": "high_cpu",
+                    "severity": "high",
+                    "threshold": 85,
+                    "actual": 91.37,
+                    "sustained_samples": 3,
+                },
+                {
+                    "type": "high_memory",
+                    "severity": "medium",
+                    "threshold": 80,
+                    "actual": 78.12,
+                    "zscore": 3.4,
+                },
+            ],
+            "health_status": "healthy",
+            "exit_code": 0,
+            "restart_count": 2,
+        },
+    }
+
+
+def history_blob(size: int) -> dict:
+    """Build an analyzer alert history holding `size` full alerts."""
+    return {"alerts": [health_alert(i)["data"] for i in range(size)]}
+
+
+def measure(codec_name: str, payload: dict, repeat: int) -> dict:
+    """Time encode and decode of one payload and report its encoded size."""
+    codec = get_codec(codec_name)
+    encoded = encode(payload, codec)
+    size = len(encoded.encode("utf-8", ENCODING_ERRORS))
+    encode_s = min(timeit.repeat(lambda: encode(payload, codec), number=repeat, repeat=3))
+    decode_s = min(timeit.repeat(lambda: decode(encoded), number=repeat, repeat=3))
+    if decode(encoded) != payload:
+        msg = f"{codec_name} round trip changed the payload"
+        raise AssertionError(msg)
+    return {
+        "encoded": encoded,
+        "size": size,
+        "encode_us": encode_s / repeat * 1e6,
+        "decode_us": decode_s / repeat * 1e6,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark HemoStat serialization codecs")
+    parser.add_argument(
+        "--history",
+        type=int,
+        default=int(os.getenv("ANALYZER_HISTORY_SIZE", 10)),
+        help="Alerts per history blob",
+    )
+    parser.add_argument("--repeat", type=int, default=2000, help="Iterations per measurement")
+    parser.add_argument("--redis-url", help="Also report Redis MEMORY USAGE per value")
+    args = parser.parse_args()
+
+    client = None
+    if args.redis_url:
+        import redis
+
+        client = redis.Redis.from_url(
+            args.redis_url, decode_responses=True, encoding_errors=ENCODING_ERRORS
+        )
+
+    payloads = {
+        "health_alert": health_alert(1),
+        f"history[{args.history}]": history_blob(args.history),
+    }
+    codecs = available_codecs()
+    print(f"Codecs: {', '.join(codecs)}\n")
+
+    header = f"{'payload':<16}{'codec':<10}{'bytes':>9}{'encode us':>12}{'decode us':>12}"
+    if client is not None:
+        header += f"{'redis bytes':>13}"
+    print(header)
+    print("-" * len(header))
+
+    for label, payload in payloads.items():
+        for codec_name in codecs:
+            result = measure(codec_name, payload, args.repeat)
+            line = (
+                f"{label:<16}{codec_name:<10}{result['size']:>9}"
+                f"{result['encode_us']:>12.2f}{result['decode_us']:>12.2f}"
+            )
+            if client is not None:
+                key = f"hemostat:benchmark:{codec_name}"
+                client.set(key, result["encoded"])
+                line += f"{client.memory_usage(key, samples=0):>13}"
+                client.delete(key)
+            print(line)
+        print()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,210 @@
+#!/usr/bin/env python3
+"""
+Fake Docker Daemon
+
+Serves the small subset of the Docker Engine API the Monitor Agent uses (version, container
+list/inspect/stats, image inspect, events) over TCP with a configurable number of synthetic
+containers and response latency. Run several instances on different ports to exercise
+multi-daemon monitoring locally without real Docker hosts:
+
+    python scripts/fake_docker_daemon.py --port 23751 --containers 50 --prefix web1
+    python scripts/fake_docker_daemon.py --port 23752 --containers 50 --prefix web2 --latency 0.2
+    MONITOR_DOCKER_HOSTS=web1=tcp://127.0.0.1:23751,web2=tcp://127.0.0.1:23752 \\
+        python -m agents.hemostat_monitor.main
+"""
+
+import argparse
+import hashlib
+import json
+import random
+import re
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import ClassVar
+from urllib.parse import parse_qs, urlparse
+
+API_VERSION = "1.43"
+IMAGE_ID = "sha256:" + "0" * 64
+
+
+def build_containers(count: int, prefix: str) -> dict[str, dict]:
+    """Create synthetic container records keyed by full container ID."""
+    containers = {}
+    for index in range(count):
+        name = f"{prefix}-app-{index}"
+        container_id = hashlib.sha256(name.encode()).hexdigest()
+        containers[container_id] = {
+            "name": name,
+            # A few containers sit near the default CPU threshold
+            "cpu_share": 0.8 if index % 10 == 0 else random.uniform(0.01, 0.3),
+            "memory_limit": 512 * 1024 * 1024,
+            "cpu_total": 0,
+        }
+    return containers
+
+
+class FakeDockerHandler(BaseHTTPRequestHandler):
+    """Request handler for the fake Docker API."""
+
+    protocol_version = "HTTP/1.1"
+    containers: ClassVar[dict[str, dict]] = {}
+    latency = 0.0
+
+    def log_message(self, format, *args):
+        pass
+
+    def do_GET(self):  # noqa: N802 - name defined by BaseHTTPRequestHandler
+        time.sleep(self.latency)
+        parsed = urlparse(self.path)
+        # Strip the optional /v1.xx API version prefix
+        path = re.sub(r"^/v[0-9.]+", "", parsed.path)
+        query = parse_qs(parsed.query)
+
+        if path == "/_ping":
+            return self._send_text("OK")
+        if path == "/version":
+            return self._send_json(
+                {"ApiVersion": API_VERSION, "MinAPIVersion": "1.12", "Version": "fake"}
+            )
+        if path == "/containers/json":
+            return self._send_json([self._summary(cid) for cid in self.containers])
+        if path.startswith("/images/") and path.endswith("/json"):
+            return self._send_json({"Id": IMAGE_ID, "RepoTags": ["fake/app:latest"]})
+        if path == "/events":
+            return self._stream_events()
+
+        match = re.fullmatch(r"/containers/([0-9a-f]+)/(json|stats)", path)
+        if match:
+            container_id = self._resolve(match.group(1))
+            if container_id is None:
+                return self._send_json({"message": "No such container"}, status=404)
+            if match.group(2) == "json":
+                return self._send_json(self._inspect(container_id))
+            if query.get("stream", ["1"])[0] in ("0", "false"):
+                return self._send_json(self._stats(container_id))
+            return self._stream_stats(container_id)
+
+        self._send_json({"message": f"not implemented: {path}"}, status=404)
+
+    def _resolve(self, prefix: str) -> str | None:
+        return next((cid for cid in self.containers if cid.startswith(prefix)), None)
+
+    def _summary(self, container_id: str) -> dict:
+        record = self.containers[container_id]
+        return {
+            "Id": container_id,
+            "Names": [f"/{record['name']}"],
+            "Image": "fake/app:latest",
+            "ImageID": IMAGE_ID,
+            "State": "running",
+            "Status": "Up",
+            "Labels": {},
+        }
+
+    def _inspect(self, container_id: str) -> dict:
+        record = self.containers[container_id]
+        return {
+            "Id": container_id,
+            "Name": f"/{record['name']}",
+            "Image": IMAGE_ID,
+            "RestartCount": 0,
+            "State": {"Status": "running", "Running": True, "ExitCode": 0, "Pid": 0},
+            "Config": {"Image": "fake/app:latest", "Labels": {}},
+        }
+
+    def _stats(self, container_id: str) -> dict:
+        record = self.containers[container_id]
+        now = time.monotonic_ns()
+        previous_total, previous_system = record["cpu_total"], now - 1_000_000_000
+        record["cpu_total"] = previous_total + int(1_000_000_000 * record["cpu_share"])
+        usage = int(record["memory_limit"] * random.uniform(0.2, 0.5))
+        return {
+            "cpu_stats": {
+                "cpu_usage": {"total_usage": record["cpu_total"]},
+                "system_cpu_usage": now,
+                "online_cpus": 1,
+            },
+            "precpu_stats": {
+                "cpu_usage": {"total_usage": previous_total},
+                "system_cpu_usage": previous_system,
+            },
+            "memory_stats": {
+                "usage": usage,
+                "limit": record["memory_limit"],
+                "stats": {"inactive_file": 0},
+            },
+            "networks": {"eth0": {"rx_bytes": 1000, "tx_bytes": 1000}},
+            "blkio_stats": {"io_service_bytes_recursive": []},
+        }
+
+    def _send_json(self, body, status: int = 200) -> None:
+        data = json.dumps(body).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def _send_text(self, body: str) -> None:
+        data = body.encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "text/plain")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def _start_chunked(self) -> None:
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Transfer-Encoding", "chunked")
+        self.end_headers()
+
+    def _write_chunk(self, body: dict) -> None:
+        data = json.dumps(body).encode() + b"\n"
+        self.wfile.write(f"{len(data):x}\r\n".encode() + data + b"\r\n")
+        self.wfile.flush()
+
+    def _stream_stats(self, container_id: str) -> None:
+        self._start_chunked()
+        try:
+            while True:
+                self._write_chunk(self._stats(container_id))
+                time.sleep(1)
+        except (BrokenPipeError, ConnectionResetError):
+            pass
+
+    def _stream_events(self) -> None:
+        # No lifecycle changes happen in the fake daemon; keep the stream open
+        self._start_chunked()
+        while True:
+            time.sleep(5)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Serve a fake Docker Engine API")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=23750)
+    parser.add_argument("--containers", type=int, default=20, help="Synthetic containers")
+    parser.add_argument("--prefix", default="fake", help="Container name prefix")
+    parser.add_argument("--latency", type=float, default=0.0, help="Seconds added per request")
+    args = parser.parse_args()
+
+    FakeDockerHandler.containers = build_containers(args.containers, args.prefix)
+    FakeDockerHandler.latency = args.latency
+
+    server = ThreadingHTTPServer((args.host, args.port), FakeDockerHandler)
+    server.daemon_threads = True
+    print(
+        f"Fake Docker daemon '{args.prefix}' with {args.containers} containers on "
+        f"tcp://{args.host}:{args.port}"
+    )
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,129 @@
+#!/usr/bin/env python3
+"""
+Pipeline Latency Report
+
+Reads the events stored by the Alert agent and reports latency percentiles of traced
+incidents: detection (the Monitor's health alert) to remediation completion, and per hop
+the transit time (previous event published -> callback started) and processing time
+(callback started -> event published).
+
+    python scripts/pipeline_latency.py
+    python scripts/pipeline_latency.py --event-type false_alarm --redis-url redis://localhost:6379/0
+"""
+
+import argparse
+import math
+import os
+import sys
+from itertools import pairwise
+
+import redis
+from dotenv import load_dotenv
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from agents.codec import ENCODING_ERRORS, CodecError, decode
+from agents.tracing import hop_time, pipeline_seconds, trace_of
+
+load_dotenv()
+
+PERCENTILES = (50, 90, 99)
+
+
+def percentile(values: list[float], pct: float) -> float:
+    """Nearest-rank percentile of a non-empty list."""
+    ordered = sorted(values)
+    rank = max(1, math.ceil(pct / 100 * len(ordered)))
+    return ordered[rank - 1]
+
+
+def load_traces(client: redis.Redis, event_type: str, limit: int) -> list[dict]:
+    """Traces of the newest stored events of a type."""
+    traces = []
+    for raw in client.lrange(f"hemostat:events:{event_type}", 0, limit - 1):
+        try:
+            event = decode(raw)
+        except CodecError:
+            continue
+        trace = trace_of(event) if isinstance(event, dict) else None
+        if trace is not None and len(trace.get("hops", [])) > 1:
+            traces.append(trace)
+    return traces
+
+
+def collect(traces: list[dict]) -> dict[str, list[float]]:
+    """Group latencies by series name."""
+    series: dict[str, list[float]] = {}
+
+    def add(name: str, value: float | None) -> None:
+        if value is not None:
+            series.setdefault(name, []).append(max(0.0, value))
+
+    for trace in traces:
+        hops = trace["hops"]
+        # The last hop is the store itself; the one before is the event being reported
+        reported = hops[-2] if len(hops) > 2 else hops[-1]
+        add(
+            f"detection -> {reported.get('event_type', 'unknown')}",
+            pipeline_seconds(trace, until=hop_time(reported)),
+        )
+        add("detection -> stored", pipeline_seconds(trace))
+        for previous, hop in pairwise(hops):
+            sent, received, published = (
+                hop_time(previous),
+                hop_time(hop, "received_at"),
+                hop_time(hop),
+            )
+            label = f"{hop.get('agent', '?')}:{hop.get('event_type', '?')}"
+            if sent is not None and received is not None:
+                add(f"  {label} transit", received - sent)
+            if received is not None and published is not None:
+                add(f"  {label} processing", published - received)
+    return series
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Report HemoStat pipeline latency percentiles")
+    parser.add_argument(
+        "--event-type",
+        default="remediation_complete",
+        help="Stored event type to report on (remediation_complete, false_alarm)",
+    )
+    parser.add_argument("--limit", type=int, default=1000, help="Newest events to read")
+    parser.add_argument(
+        "--redis-url",
+        default=None,
+        help="Redis URL (default: built from REDIS_HOST, REDIS_PORT, REDIS_DB)",
+    )
+    args = parser.parse_args()
+
+    url = args.redis_url or (
+        f"redis://{os.getenv('REDIS_HOST', 'localhost')}:{os.getenv('REDIS_PORT', 6379)}"
+        f"/{os.getenv('REDIS_DB', 0)}"
+    )
+    client = redis.Redis.from_url(
+        url,
+        decode_responses=True,
+        encoding_errors=ENCODING_ERRORS,
+        password=os.getenv("REDIS_PASSWORD") or None,
+    )
+
+    traces = load_traces(client, args.event_type, args.limit)
+    if not traces:
+        print(f"No traced '{args.event_type}' events found")
+        return
+
+    print(f"{len(traces)} traced '{args.event_type}' incidents\n")
+    header = f"{'series':<44}{'n':>6}" + "".join(f"{f'p{p} s':>10}" for p in PERCENTILES)
+    header += f"{'max s':>10}"
+    print(header)
+    print("-" * len(header))
+    for name, values in collect(traces).items():
+        line = f"{name:<44}{len(values):>6}"
+        line += "".join(f"{percentile(values, p):>10.3f}" for p in PERCENTILES)
+        line += f"{max(values):>10.3f}"
+        print(line)
+
+
+if __name__ == "__main__":
+    main()
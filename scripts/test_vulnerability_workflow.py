@@ -13,10 +13,16 @@ Usage:
 """
 
 import json
+import os
+import sys
 import time
 import redis
 from datetime import datetime, UTC
 
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from agents.codec import ENCODING_ERRORS, decode
+
 
 def test_vulnerability_alert_workflow():
     """Test the complete vulnerability alert workflow."""
@@ -25,7 +31,9 @@ def test_vulnerability_alert_workflow():
     
     # Connect to Redis
     try:
-        r = redis.Redis(host='localhost', port=6379, decode_responses=True)
+        r = redis.Redis(
+            host='localhost', port=6379, decode_responses=True, encoding_errors=ENCODING_ERRORS
+        )
         r.ping()
         print("✅ Connected to Redis")
     except Exception as e:
@@ -92,7 +100,7 @@ def test_vulnerability_alert_workflow():
             print(f"✅ Alert Agent processed the event ({len(alert_events)} events stored)")
             
             # Show the stored event
-            latest_event = json.loads(alert_events[0])
+            latest_event = decode(alert_events[0])
             print(f"   Event Type: {latest_event.get('event_type')}")
             print(f"   Timestamp: {latest_event.get('timestamp')}")
             print(f"   Target: {latest_event.get('data', {}).get('target_url')}")
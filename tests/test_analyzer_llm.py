@@ -0,0 +1,326 @@
+"""Tests for the analyzer's rate-limited, concurrent LLM calls, using fake chat models."""
+
+import json
+import queue
+import threading
+from datetime import datetime
+from typing import Any
+
+import pytest
+from langchain_core.language_models import FakeListChatModel
+
+from agents.agent_base import HemoStatAgent
+from agents.hemostat_analyzer import rate_limit
+from agents.hemostat_analyzer.analyzer import HealthAnalyzer
+from agents.hemostat_analyzer.coalescer import alert_signature
+from agents.hemostat_analyzer.rate_limit import TokenBucketLimiter
+from agents.logger import HemoStatLogger
+
+VERDICT = json.dumps(
+    {
+        "root_cause": "Memory leak",
+        "action": "restart",
+        "reason": "Memory keeps growing",
+        "confidence": 0.9,
+        "is_false_alarm": False,
+    }
+)
+
+
+class FakeClock:
+    """Stands in for the time module of rate_limit, advanced by hand."""
+
+    def __init__(self):
+        self.now = 1000.0
+
+    def monotonic(self) -> float:
+        return self.now
+
+
+class GatedChatModel(FakeListChatModel):
+    """Fake chat model whose calls wait at a barrier and/or a gate before answering."""
+
+    barrier: Any = None
+    gate: Any = None
+
+    def _call(self, *args: Any, **kwargs: Any) -> str:
+        if self.barrier is not None:
+            self.barrier.wait(timeout=5)
+        if self.gate is not None:
+            self.gate.wait(timeout=5)
+        return super()._call(*args, **kwargs)
+
+
+def alert(container: str, cpu: float = 95.0) -> dict[str, Any]:
+    """Build a health alert envelope as published by the Monitor."""
+    return {
+        "event_type": "container_unhealthy",
+        "data": {
+            "container_name": container,
+            "health_status": "unhealthy",
+            "metrics": {"cpu_percent": cpu, "memory_percent": 50.0},
+            "anomalies": [{"type": "high_cpu", "severity": "high"}],
+        },
+    }
+
+
+@pytest.fixture
+def make_analyzer(monkeypatch):
+    """Build HealthAnalyzers around a given chat model, without Redis."""
+    analyzers: list[HealthAnalyzer] = []
+
+    def agent_init(self, agent_name: str, **kwargs: Any) -> None:
+        self.agent_name = agent_name
+        self.logger = HemoStatLogger.get_logger(agent_name)
+        self.redis = None
+
+    def no_subscription(self, channel: str, callback: Any, **kwargs: Any) -> None:
+        """Alerts are handed to _handle_health_alert directly."""
+
+    def make(llm, **env: str) -> HealthAnalyzer:
+        settings = {
+            "AI_MODEL": "gpt-4",
+            "ANALYZER_CACHE_TTL": "0",
+            "ANALYZER_BATCH_WINDOW": "0",
+            "ANALYZER_REPEAT_WINDOW": "0",
+            "OPENAI_RPM_LIMIT": "0",
+            "OPENAI_TPM_LIMIT": "0",
+            **env,
+        }
+        for name, value in settings.items():
+            monkeypatch.setenv(name, value)
+        monkeypatch.setattr(HemoStatAgent, "__init__", agent_init)
+        monkeypatch.setattr(HemoStatAgent, "subscribe_to_channel", no_subscription)
+        monkeypatch.setattr(HealthAnalyzer, "_initialize_llm", lambda _self: llm)
+
+        analyzer = HealthAnalyzer()
+        analyzer.routed = queue.Queue()
+        analyzer.alert_times = []
+
+        def route(
+            alert_data: dict[str, Any],
+            _history: list,
+            analysis: dict | None,
+            alert_time: str | None = None,
+        ) -> None:
+            analyzer.alert_times.append(alert_time)
+            analyzer.routed.put((alert_data["container_name"], analysis))
+
+        analyzer._load_alert_history = lambda _container_name: []
+        analyzer._route_analysis = route
+        analyzers.append(analyzer)
+        return analyzer
+
+    yield make
+
+    for analyzer in analyzers:
+        analyzer.rate_limiter.close()
+        if analyzer.llm_pool is not None:
+            analyzer.llm_pool.shutdown(timeout=1.0)
+
+
+def routed(analyzer: HealthAnalyzer, count: int) -> list[tuple[str, dict | None]]:
+    """Wait for count verdicts to be routed."""
+    return [analyzer.routed.get(timeout=5) for _ in range(count)]
+
+
+class TestTokenBucketLimiter:
+    @pytest.fixture
+    def clock(self, monkeypatch):
+        clock = FakeClock()
+        monkeypatch.setattr(rate_limit, "time", clock)
+        return clock
+
+    def test_requests_per_minute(self, clock):
+        limiter = TokenBucketLimiter(rpm=60, tpm=0)
+
+        for _ in range(60):
+            assert limiter.acquire(10, timeout=0)
+        assert not limiter.acquire(10, timeout=0)
+
+        clock.now += 0.5
+        assert not limiter.acquire(10, timeout=0)
+        clock.now += 0.5
+        assert limiter.acquire(10, timeout=0)
+        assert limiter.stats()["acquired"] == 61
+
+    def test_tokens_per_minute(self, clock):
+        limiter = TokenBucketLimiter(rpm=0, tpm=600)
+
+        assert limiter.acquire(500, timeout=0)
+        assert not limiter.acquire(200, timeout=0)
+
+        # 10 tokens per second refill
+        clock.now += 10
+        assert limiter.acquire(200, timeout=0)
+
+    def test_oversized_call_is_capped_at_the_limit(self, clock):
+        limiter = TokenBucketLimiter(rpm=0, tpm=600)
+
+        assert limiter.acquire(5000, timeout=0)
+        assert not limiter.acquire(1, timeout=0)
+
+    def test_unlimited(self, clock):
+        limiter = TokenBucketLimiter(rpm=0, tpm=0)
+
+        assert all(limiter.acquire(10**6, timeout=0) for _ in range(1000))
+
+    def test_close_releases_waiting_callers(self):
+        limiter = TokenBucketLimiter(rpm=1, tpm=0)
+        assert limiter.acquire(1)
+        results = []
+        waiter = threading.Thread(target=lambda: results.append(limiter.acquire(1)))
+        waiter.start()
+
+        limiter.close()
+        waiter.join(timeout=5)
+
+        assert results == [False]
+
+
+class TestLLMCalls:
+    def test_analyses_run_concurrently_through_the_pool(self, make_analyzer):
+        llm = GatedChatModel(responses=[VERDICT], barrier=threading.Barrier(4))
+        analyzer = make_analyzer(llm, ANALYZER_LLM_CONCURRENCY="4")
+
+        for index in range(4):
+            analyzer._handle_health_alert(alert(f"web-{index}"))
+
+        # The barrier only opens when all four calls are in flight at once
+        results = routed(analyzer, 4)
+        assert sorted(name for name, _ in results) == [f"web-{i}" for i in range(4)]
+        assert all(analysis["analysis_method"] == "ai" for _, analysis in results)
+        assert analyzer.rate_limiter.stats()["acquired"] == 4
+
+    def test_calls_are_charged_to_the_rate_limiter(self, make_analyzer):
+        llm = FakeListChatModel(responses=[VERDICT])
+        analyzer = make_analyzer(llm, ANALYZER_LLM_CONCURRENCY="0", OPENAI_RPM_LIMIT="1")
+
+        analyzer._handle_health_alert(alert("web"))
+
+        assert routed(analyzer, 1)[0][1]["action"] == "restart"
+        assert analyzer.rate_limiter.stats()["acquired"] == 1
+        assert not analyzer.rate_limiter.acquire(1, timeout=0)
+
+    def test_retry_is_paced_by_the_limiter_without_sleeping(self, make_analyzer, monkeypatch):
+        llm = FakeListChatModel(responses=["not json", '{"action": "restart"}', VERDICT])
+        analyzer = make_analyzer(llm, ANALYZER_LLM_CONCURRENCY="0")
+
+        def no_sleep(seconds: float) -> None:
+            raise AssertionError(f"time.sleep({seconds}) called during LLM retries")
+
+        monkeypatch.setattr("time.sleep", no_sleep)
+        analysis = analyzer._ai_analyze(alert("web")["data"], [])
+
+        assert analysis is not None
+        assert analysis["confidence"] == 0.9
+        assert analyzer.rate_limiter.stats()["acquired"] == 3
+
+    def test_retries_give_up_after_three_attempts(self, make_analyzer):
+        llm = FakeListChatModel(responses=["not json"])
+        analyzer = make_analyzer(llm, ANALYZER_LLM_CONCURRENCY="0")
+
+        assert analyzer._ai_analyze(alert("web")["data"], []) is None
+        assert analyzer.rate_limiter.stats()["acquired"] == 3
+
+    def test_follow_up_analysis_does_not_block_on_a_full_pool(self, make_analyzer):
+        gate = threading.Event()
+        llm = GatedChatModel(responses=[VERDICT], gate=gate)
+        analyzer = make_analyzer(llm, ANALYZER_LLM_CONCURRENCY="1", ANALYZER_LLM_QUEUE_SIZE="1")
+
+        analyzer._handle_health_alert(alert("web", cpu=95.0))
+        # Arrives while web is analyzed: waits in the coalescer
+        analyzer._handle_health_alert(alert("web", cpu=97.0))
+        # Fills the pool's only queue slot
+        analyzer._handle_health_alert(alert("db"))
+        assert analyzer.llm_pool.stats()["queued"] == 1
+
+        gate.set()
+
+        # The follow-up for web runs on the worker that finished the first analysis
+        results = routed(analyzer, 3)
+        assert sorted(name for name, _ in results) == ["db", "web", "web"]
+        assert analyzer.coalescer.stats()["in_flight"] == 0
+
+
+class TestRepeatedAlerts:
+    def test_polls_with_drifting_metrics_are_one_alert(self, make_analyzer):
+        analyzer = make_analyzer(
+            FakeListChatModel(responses=[VERDICT]), ANALYZER_REPEAT_WINDOW="60"
+        )
+
+        analyzer._handle_health_alert(alert("web", cpu=95.0))
+        analyzer._handle_health_alert(alert("web", cpu=96.4))
+
+        assert [name for name, _ in routed(analyzer, 1)] == ["web"]
+        assert analyzer.routed.empty()
+        assert analyzer.coalescer.stats()["repeats"] == 1
+
+    def test_new_anomaly_is_a_new_alert(self):
+        first = alert("web")["data"]
+        second = alert("web")["data"]
+        second["anomalies"] = [*second["anomalies"], {"type": "high_memory", "severity": "high"}]
+
+        assert alert_signature(first) != alert_signature(second)
+
+
+class FakePipeline:
+    """Records the commands of a Redis pipeline."""
+
+    def __init__(self, commands: list[tuple]):
+        self.commands = commands
+
+    def lpush(self, *args: Any) -> None:
+        self.commands.append(("lpush", *args))
+
+    def ltrim(self, *args: Any) -> None:
+        self.commands.append(("ltrim", *args))
+
+    def expire(self, *args: Any) -> None:
+        self.commands.append(("expire", *args))
+
+    def execute(self) -> list:
+        return []
+
+
+class FakeRedis:
+    def __init__(self):
+        self.commands: list[tuple] = []
+
+    def pipeline(self, transaction: bool = True) -> FakePipeline:
+        return FakePipeline(self.commands)
+
+
+class TestAlertHistory:
+    def history_entries(self, analyzer: HealthAnalyzer) -> list[dict[str, Any]]:
+        return [json.loads(cmd[2]) for cmd in analyzer.redis.commands if cmd[0] == "lpush"]
+
+    def test_envelope_timestamp_reaches_the_analysis(self, make_analyzer):
+        analyzer = make_analyzer(FakeListChatModel(responses=[VERDICT]))
+        message = alert("web")
+        message["timestamp"] = "2025-01-01T12:00:00+00:00"
+
+        analyzer._handle_health_alert(message)
+
+        routed(analyzer, 1)
+        assert analyzer.alert_times == ["2025-01-01T12:00:00+00:00"]
+
+    def test_entry_records_the_alert_time(self, make_analyzer):
+        analyzer = make_analyzer(FakeListChatModel(responses=[VERDICT]))
+        analyzer.redis = FakeRedis()
+
+        analyzer._update_alert_history("web", alert("web")["data"], "2025-01-01T12:00:00+00:00")
+
+        [entry] = self.history_entries(analyzer)
+        assert entry["timestamp"] == "2025-01-01T12:00:00+00:00"
+        assert entry["metrics"] == {"cpu_percent": 95.0, "memory_percent": 50.0}
+
+    def test_entry_without_alert_time_is_stamped_now(self, make_analyzer):
+        analyzer = make_analyzer(FakeListChatModel(responses=[VERDICT]))
+        analyzer.redis = FakeRedis()
+
+        analyzer._update_alert_history("web", alert("web")["data"])
+
+        [entry] = self.history_entries(analyzer)
+        assert entry["timestamp"] is not None
+        assert datetime.fromisoformat(entry["timestamp"]).tzinfo is not None
@@ -0,0 +1,309 @@
+"""Tests for the direct cgroup stats reader, against fake cgroup and proc trees."""
+
+import threading
+from pathlib import Path
+from types import SimpleNamespace
+
+import pytest
+
+from agents.hemostat_monitor.cgroup_stats import CgroupStatsReader
+from agents.hemostat_monitor.monitor import ContainerMonitor
+from agents.logger import HemoStatLogger
+
+CONTAINER_ID = "a" * 64
+PID = 4242
+
+NET_DEV = """Inter-|   Receive                                                |  Transmit
+ face |bytes    packets errs drop fifo frame compressed multicast|bytes    packets errs drop fifo colls carrier compressed
+    lo:     500       5    0    0    0     0          0         0      500       5    0    0    0     0       0          0
+  eth0:    1000      10    0    0    0     0          0         0     2000      20    0    0    0     0       0          0
+  eth1:     300       3    0    0    0     0          0         0      400       4    0    0    0     0       0          0
+"""
+
+
+def write(path: Path, content: str) -> None:
+    """Create a file and its parent directories."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(content)
+
+
+def make_proc(root: Path, cgroup_lines: str) -> Path:
+    """Build a fake procfs with meminfo and the container's cgroup and net/dev files."""
+    proc = root / "proc"
+    write(proc / "meminfo", "MemTotal:        8000000 kB\nMemFree:         1000 kB\n")
+    write(proc / str(PID) / "cgroup", cgroup_lines)
+    write(proc / str(PID) / "net" / "dev", NET_DEV)
+    return proc
+
+
+def make_v2_tree(root: Path, usage_usec: int = 1000, memory_max: str = "max") -> Path:
+    """Build a fake cgroup v2 hierarchy with one container under the systemd driver layout."""
+    cgroup = root / "cgroup"
+    write(cgroup / "cgroup.controllers", "cpu io memory\n")
+    directory = cgroup / "system.slice" / f"docker-{CONTAINER_ID}.scope"
+    write(directory / "cpu.stat", f"usage_usec {usage_usec}\nuser_usec 600\nsystem_usec 400\n")
+    write(directory / "memory.current", "104857600\n")
+    write(directory / "memory.max", f"{memory_max}\n")
+    write(directory / "memory.stat", "anon 1000\ninactive_file 4096\n")
+    write(
+        directory / "io.stat",
+        "8:0 rbytes=100 wbytes=200 rios=1 wios=2 dbytes=0 dios=0\n"
+        "8:16 rbytes=50 wbytes=25 rios=3 wios=4 dbytes=0 dios=0\n",
+    )
+    return cgroup
+
+
+def make_v1_tree(root: Path, usage_ns: int = 5000) -> Path:
+    """Build a fake cgroup v1 hierarchy with one container under the cgroupfs driver layout."""
+    cgroup = root / "cgroup"
+    cpu = cgroup / "cpu,cpuacct" / "docker" / CONTAINER_ID
+    write(cpu / "cpuacct.usage", f"{usage_ns}\n")
+    memory = cgroup / "memory" / "docker" / CONTAINER_ID
+    write(memory / "memory.usage_in_bytes", "2048\n")
+    write(memory / "memory.limit_in_bytes", "9223372036854771712\n")
+    write(memory / "memory.stat", "cache 10\ntotal_inactive_file 512\n")
+    blkio = cgroup / "blkio" / "docker" / CONTAINER_ID
+    write(
+        blkio / "blkio.throttle.io_service_bytes_recursive",
+        "8:0 Read 4096\n8:0 Write 8192\nTotal 12288\n",
+    )
+    write(blkio / "blkio.throttle.io_serviced_recursive", "8:0 Read 2\n8:0 Write 3\nTotal 5\n")
+    return cgroup
+
+
+def set_usage_v2(cgroup: Path, usage_usec: int) -> None:
+    """Advance the container's cumulative CPU usage in a v2 tree."""
+    directory = cgroup / "system.slice" / f"docker-{CONTAINER_ID}.scope"
+    (directory / "cpu.stat").write_text(f"usage_usec {usage_usec}\n")
+
+
+class TestCgroupV2:
+    def test_detects_version_and_host_memory(self, tmp_path):
+        reader = CgroupStatsReader(str(make_v2_tree(tmp_path)), str(make_proc(tmp_path, "")))
+
+        assert reader.version == 2
+        assert reader.available
+        assert reader.host_memory == 8000000 * 1024
+
+    def test_first_read_has_no_cpu_value(self, tmp_path):
+        cgroup = make_v2_tree(tmp_path)
+        reader = CgroupStatsReader(str(cgroup), str(make_proc(tmp_path, "")))
+
+        assert reader.read(CONTAINER_ID) is None
+        assert reader.read(CONTAINER_ID) is not None
+
+    def test_cpu_delta_between_reads(self, tmp_path):
+        cgroup = make_v2_tree(tmp_path, usage_usec=1000)
+        reader = CgroupStatsReader(str(cgroup), str(make_proc(tmp_path, "")))
+
+        reader.read(CONTAINER_ID)
+        set_usage_v2(cgroup, 3500)
+        stats = reader.read(CONTAINER_ID)
+
+        assert stats["precpu_stats"]["cpu_usage"]["total_usage"] == 1_000_000
+        assert stats["cpu_stats"]["cpu_usage"]["total_usage"] == 3_500_000
+        assert stats["cpu_stats"]["online_cpus"] == reader.online_cpus
+        assert stats["cpu_stats"]["system_cpu_usage"] > stats["precpu_stats"]["system_cpu_usage"]
+
+    def test_memory_without_limit_uses_host_memory(self, tmp_path):
+        cgroup = make_v2_tree(tmp_path)
+        reader = CgroupStatsReader(str(cgroup), str(make_proc(tmp_path, "")))
+
+        reader.read(CONTAINER_ID)
+        memory = reader.read(CONTAINER_ID)["memory_stats"]
+
+        assert memory == {
+            "usage": 104857600,
+            "limit": reader.host_memory,
+            "stats": {"inactive_file": 4096},
+        }
+
+    def test_memory_with_limit(self, tmp_path):
+        cgroup = make_v2_tree(tmp_path, memory_max="536870912")
+        reader = CgroupStatsReader(str(cgroup), str(make_proc(tmp_path, "")))
+
+        reader.read(CONTAINER_ID)
+
+        assert reader.read(CONTAINER_ID)["memory_stats"]["limit"] == 536870912
+
+    def test_io_stat_is_summed_across_devices(self, tmp_path):
+        cgroup = make_v2_tree(tmp_path)
+        reader = CgroupStatsReader(str(cgroup), str(make_proc(tmp_path, "")))
+
+        reader.read(CONTAINER_ID)
+        blkio = reader.read(CONTAINER_ID)["blkio_stats"]
+
+        assert blkio["io_service_bytes_recursive"] == [
+            {"op": "read", "value": 150},
+            {"op": "write", "value": 225},
+        ]
+        assert blkio["io_serviced_recursive"] == [
+            {"op": "read", "value": 4},
+            {"op": "write", "value": 6},
+        ]
+
+    def test_resolves_path_from_proc_and_reads_networks(self, tmp_path):
+        cgroup = tmp_path / "cgroup"
+        write(cgroup / "cgroup.controllers", "cpu io memory\n")
+        directory = cgroup / "custom" / "parent" / CONTAINER_ID
+        write(directory / "cpu.stat", "usage_usec 10\n")
+        write(directory / "memory.current", "1\n")
+        write(directory / "memory.max", "max\n")
+        proc = make_proc(tmp_path, f"0::/custom/parent/{CONTAINER_ID}\n")
+        reader = CgroupStatsReader(str(cgroup), str(proc))
+
+        reader.read(CONTAINER_ID, PID)
+        stats = reader.read(CONTAINER_ID, PID)
+
+        assert stats["networks"] == {
+            "eth0": {"rx_bytes": 1000, "rx_packets": 10, "tx_bytes": 2000, "tx_packets": 20},
+            "eth1": {"rx_bytes": 300, "rx_packets": 3, "tx_bytes": 400, "tx_packets": 4},
+        }
+        assert stats["blkio_stats"]["io_service_bytes_recursive"][0]["value"] == 0
+
+    def test_missing_container_returns_none(self, tmp_path):
+        reader = CgroupStatsReader(str(make_v2_tree(tmp_path)), str(make_proc(tmp_path, "")))
+
+        assert reader.read("b" * 64) is None
+
+    def test_removed_cgroup_returns_none(self, tmp_path):
+        cgroup = make_v2_tree(tmp_path)
+        reader = CgroupStatsReader(str(cgroup), str(make_proc(tmp_path, "")))
+        reader.read(CONTAINER_ID)
+
+        directory = cgroup / "system.slice" / f"docker-{CONTAINER_ID}.scope"
+        (directory / "memory.current").unlink()
+
+        assert reader.read(CONTAINER_ID) is None
+
+    def test_prune_forgets_previous_sample(self, tmp_path):
+        reader = CgroupStatsReader(str(make_v2_tree(tmp_path)), str(make_proc(tmp_path, "")))
+        reader.read(CONTAINER_ID)
+
+        reader.prune(set())
+
+        assert reader.read(CONTAINER_ID) is None
+
+    def test_prune_while_workers_read(self, tmp_path):
+        reader = CgroupStatsReader(str(make_v2_tree(tmp_path)), str(make_proc(tmp_path, "")))
+        errors: list[BaseException] = []
+
+        def read_repeatedly() -> None:
+            try:
+                for _ in range(200):
+                    reader.read(CONTAINER_ID)
+            except BaseException as e:
+                errors.append(e)
+
+        workers = [threading.Thread(target=read_repeatedly) for _ in range(4)]
+        for worker in workers:
+            worker.start()
+        while any(worker.is_alive() for worker in workers):
+            reader.prune(set())
+        for worker in workers:
+            worker.join()
+
+        assert errors == []
+
+
+class TestCgroupV1:
+    def test_reads_controllers(self, tmp_path):
+        cgroup = make_v1_tree(tmp_path, usage_ns=5000)
+        reader = CgroupStatsReader(str(cgroup), str(make_proc(tmp_path, "")))
+
+        assert reader.version == 1
+        assert reader.available
+        assert reader.read(CONTAINER_ID) is None
+
+        cpu_file = cgroup / "cpu,cpuacct" / "docker" / CONTAINER_ID / "cpuacct.usage"
+        cpu_file.write_text("9000\n")
+        stats = reader.read(CONTAINER_ID)
+
+        assert stats["precpu_stats"]["cpu_usage"]["total_usage"] == 5000
+        assert stats["cpu_stats"]["cpu_usage"]["total_usage"] == 9000
+        assert stats["memory_stats"] == {
+            "usage": 2048,
+            "limit": reader.host_memory,
+            "stats": {"total_inactive_file": 512},
+        }
+        assert stats["blkio_stats"] == {
+            "io_service_bytes_recursive": [
+                {"op": "Read", "value": 4096},
+                {"op": "Write", "value": 8192},
+            ],
+            "io_serviced_recursive": [
+                {"op": "Read", "value": 2},
+                {"op": "Write", "value": 3},
+            ],
+        }
+
+    def test_unavailable_without_memory_controller(self, tmp_path):
+        (tmp_path / "cgroup").mkdir()
+        reader = CgroupStatsReader(str(tmp_path / "cgroup"), str(make_proc(tmp_path, "")))
+
+        assert not reader.available
+
+
+class TestDockerFallback:
+    @pytest.fixture
+    def monitor(self, tmp_path):
+        """A monitor with only the attributes used to collect one container's stats."""
+        monitor = ContainerMonitor.__new__(ContainerMonitor)
+        monitor.logger = HemoStatLogger.get_logger("monitor")
+        monitor.stats_streams = None
+        monitor.cgroup_reader = CgroupStatsReader(
+            str(make_v2_tree(tmp_path, usage_usec=1000)), str(make_proc(tmp_path, ""))
+        )
+        local = SimpleNamespace(name="local", is_local=True)
+        monitor.endpoints = [local]
+        monitor._endpoints_by_name = {"local": local}
+        monitor._container_hosts = {}
+        monitor._io_counters = {}
+        monitor._io_lock = threading.Lock()
+        return monitor
+
+    @staticmethod
+    def container(docker_stats: dict) -> SimpleNamespace:
+        calls = []
+
+        def stats(stream: bool) -> dict:
+            calls.append(stream)
+            return docker_stats
+
+        return SimpleNamespace(
+            id=CONTAINER_ID,
+            name="web",
+            attrs={"State": {"Pid": 0}},
+            stats=stats,
+            stats_calls=calls,
+        )
+
+    def test_first_sample_falls_back_to_docker_api(self, monitor):
+        docker_stats = {
+            "cpu_stats": {
+                "cpu_usage": {"total_usage": 300},
+                "system_cpu_usage": 2000,
+                "online_cpus": 2,
+            },
+            "precpu_stats": {"cpu_usage": {"total_usage": 100}, "system_cpu_usage": 1000},
+            "memory_stats": {"usage": 50, "limit": 100},
+        }
+        container = self.container(docker_stats)
+
+        metrics = monitor._get_container_stats(container)
+
+        assert container.stats_calls == [False]
+        assert metrics["cpu_percent"] == pytest.approx(40.0)
+
+        monitor._get_container_stats(container)
+
+        assert container.stats_calls == [False]
+
+    def test_unreadable_cgroup_falls_back_to_docker_api(self, monitor):
+        container = self.container({"memory_stats": {"usage": 50, "limit": 100}})
+        container.id = "b" * 64
+
+        metrics = monitor._get_container_stats(container)
+
+        assert container.stats_calls == [False]
+        assert metrics["memory_percent"] == pytest.approx(50.0)